@@ -0,0 +1,155 @@
+# Импорты из стандартных библиотек
+import json
+
+# Импорты сторонних библиотек
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Импорты модулей этого проекта
+import metrics
+from decoders import decode
+from exceptions import ApiError
+from streaming import CHUNK_SIZE, HomeworkStream
+
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(pool_size=POOL_SIZE, retries=RETRIES,
+                 backoff_factor=BACKOFF_FACTOR):
+    """Сессия requests с пулом соединений и повторами запросов."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def make_async_session(pool_size=POOL_SIZE):
+    """Асинхронная HTTP-сессия с пулом keep-alive соединений."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=pool_size),
+        timeout=aiohttp.ClientTimeout(
+            sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        ),
+    )
+
+
+class PracticumClient:
+    """Клиент API домашки с долгоживущей сессией."""
+
+    def __init__(self, endpoint, headers, session=None,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), decoder=decode):
+        """Адрес API, заголовки, таймауты и декодер JSON из байтов."""
+        self.endpoint = endpoint
+        self.headers = headers
+        self.session = make_session() if session is None else session
+        self.timeout = timeout
+        self.decode = decoder
+        self._validators = {}
+
+    def get_api_answer(self, timestamp, headers=None):
+        """Получение апи ответа; None, если ответ не изменился (304)."""
+        headers = self.headers if headers is None else headers
+        key = headers.get("Authorization")
+        try:
+            response = self.session.get(
+                self.endpoint,
+                headers={**headers, **self._conditional(key, timestamp)},
+                params={"from_date": timestamp},
+                timeout=self.timeout,
+            )
+            if response.status_code == 304:
+                return None
+            if response.status_code != 200:
+                raise ApiError(
+                    f"Неуспешный код состояния: {response.status_code}"
+                )
+            with metrics.DECODE_TIME.time():
+                answer = self.decode(response.content)
+            self._remember(key, timestamp, response.headers)
+            return answer
+        except json.JSONDecodeError as value_error:
+            raise ValueError(f"Ошибка парсинга JSON: {value_error}")
+        except requests.RequestException as request_exception:
+            raise ApiError(f"Ошибка запроса к API: {request_exception}")
+
+    def stream_api_answer(self, timestamp, headers=None):
+        """Потоковый ответ: HomeworkStream или None, если ответ не изменился.
+
+        Работы читаются из сети по мере итерации. ETag запоминается,
+        только когда ответ дочитан и проверен, иначе следующий опрос
+        получил бы 304 на необработанные данные.
+        """
+        headers = self.headers if headers is None else headers
+        key = headers.get("Authorization")
+        try:
+            response = self.session.get(
+                self.endpoint,
+                headers={**headers, **self._conditional(key, timestamp)},
+                params={"from_date": timestamp},
+                timeout=self.timeout,
+                stream=True,
+            )
+        except requests.RequestException as request_exception:
+            raise ApiError(f"Ошибка запроса к API: {request_exception}")
+        if response.status_code == 304:
+            response.close()
+            return None
+        if response.status_code != 200:
+            response.close()
+            raise ApiError(f"Неуспешный код состояния: {response.status_code}")
+        return HomeworkStream(
+            self._iter_content(response),
+            on_complete=lambda: self._remember(
+                key, timestamp, response.headers
+            ),
+            on_close=response.close,
+        )
+
+    @staticmethod
+    def _iter_content(response):
+        """Чанки тела ответа; сетевые ошибки чтения — ApiError."""
+        try:
+            yield from response.iter_content(CHUNK_SIZE)
+        except requests.RequestException as request_exception:
+            raise ApiError(f"Ошибка запроса к API: {request_exception}")
+
+    def _conditional(self, key, timestamp):
+        """Валидаторы прошлого ответа на запрос с тем же from_date."""
+        saved = self._validators.get(key)
+        if saved is None or saved[0] != timestamp:
+            return {}
+        return saved[1]
+
+    def _remember(self, key, timestamp, response_headers):
+        """Запоминает ETag и Last-Modified ответа для следующего опроса."""
+        validators = {}
+        if "ETag" in response_headers:
+            validators["If-None-Match"] = response_headers["ETag"]
+        if "Last-Modified" in response_headers:
+            validators["If-Modified-Since"] = response_headers["Last-Modified"]
+        if validators:
+            self._validators[key] = (timestamp, validators)
+        else:
+            self._validators.pop(key, None)
+
+    def close(self):
+        """Закрывает соединения пула."""
+        self.session.close()
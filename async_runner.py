@@ -0,0 +1,245 @@
+# Импорты из стандартных библиотек
+import asyncio
+import json
+import logging
+import signal
+import sqlite3
+import sys
+import time
+
+# Импорты сторонних библиотек
+import aiohttp
+import telegram
+
+# Импорты модулей этого проекта
+import homework
+import metrics
+from api_client import make_async_session
+from breaker import CircuitBreaker
+from decoders import decode
+from error_reporter import ErrorReporter
+from exceptions import ApiError
+from outbound import OutboundQueue
+from outbox import Outbox
+from scheduler import AdaptiveInterval, Scheduler
+from state import PollState, StateCheckpoint, open_state_store
+from telegram_client import AsyncBot
+from tenants import current_tenant
+from tracing import STAGES, Tracer
+
+CONCURRENCY = 100
+# Сколько ждать отправки очереди при остановке; остальное в outbox.
+OUTBOUND_STOP_TIMEOUT = 5
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """Конкурентный опрос API домашки для многих тенантов.
+
+    Опросы идут раундами по расписанию, как в синхронном воркере:
+    тенанты с наступившим дедлайном опрашиваются конкурентно, затем
+    их состояния сохраняются одной записью.
+    """
+
+    def __init__(self, bot, tenants, state_store, session=None,
+                 endpoint=homework.ENDPOINT, concurrency=CONCURRENCY):
+        """Бот, тенанты, хранилище состояния и ограничение конкурентности."""
+        self.bot = bot
+        self.tenants = tenants
+        self.state_store = state_store
+        self.session = session
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        started = int(time.time())
+        self.poll_states = {
+            tenant.name: state_store.load(tenant.name) or PollState(started)
+            for tenant in tenants
+        }
+        self.checkpoint = StateCheckpoint(state_store)
+        self.error_reporter = ErrorReporter()
+        self.breakers = {
+            tenant.name: CircuitBreaker(tenant.name) for tenant in tenants
+        }
+
+    def get_session(self):
+        """Сессия создаётся внутри работающего цикла событий.
+
+        AsyncBot подключается к той же сессии: запросы к Bot API идут
+        через общий с API домашки пул соединений.
+        """
+        if self.session is None:
+            self.session = make_async_session(self.concurrency)
+        if isinstance(self.bot, AsyncBot) and self.bot.session is None:
+            self.bot.attach(self.session)
+        return self.session
+
+    async def close(self):
+        """Закрывает соединения сессии."""
+        if self.session is not None:
+            await self.session.close()
+
+    async def get_api_answer(self, tenant, timestamp):
+        """Получение апи ответа."""
+        try:
+            with metrics.API_LATENCY.time():
+                async with self.get_session().get(
+                    self.endpoint,
+                    headers=tenant.headers,
+                    params={"from_date": timestamp},
+                ) as response:
+                    if response.status != 200:
+                        raise ApiError(
+                            f"Неуспешный код состояния: {response.status}"
+                        )
+                    content = await response.read()
+            with metrics.DECODE_TIME.time():
+                return decode(content)
+        except json.JSONDecodeError as value_error:
+            raise ValueError(f"Ошибка парсинга JSON: {value_error}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as request_error:
+            raise ApiError(f"Ошибка запроса к API: {request_error}")
+
+    async def poll_updates(self, tenant, poll_state):
+        """Один цикл опроса тенанта: запрос, проверка и отправка статусов."""
+        response = await self.get_api_answer(tenant, poll_state.timestamp)
+        return await asyncio.to_thread(
+            homework.handle_response, self.bot, poll_state, response
+        )
+
+    async def poll_tenant(self, tenant):
+        """Цикл опроса одного тенанта; при ошибке возвращает None."""
+        poll_state = self.poll_states[tenant.name]
+        breaker = self.breakers[tenant.name]
+        if not homework.poll_allowed(tenant, breaker):
+            return None
+        context_token = current_tenant.set(tenant)
+        activity = None
+        try:
+            try:
+                async with self.semaphore:
+                    updates = await self.poll_updates(tenant, poll_state)
+                self.checkpoint.save(tenant.name, poll_state)
+                message = homework.poll_succeeded(tenant, poll_state, breaker)
+                activity = updates
+            except Exception as error:
+                message = homework.poll_failed(
+                    error, tenant, breaker, self.error_reporter
+                )
+            if message:
+                await self.send_message(message)
+            return activity
+        finally:
+            current_tenant.reset(context_token)
+
+    async def flush(self):
+        """Сохраняет состояния раунда, не блокируя цикл событий."""
+        try:
+            await asyncio.to_thread(self.checkpoint.flush)
+        except (OSError, sqlite3.Error) as error:
+            logger.error(f"Не удалось сохранить состояние опроса: {error}")
+
+    async def send_message(self, message):
+        """Отправляет сообщение тенанту, не блокируя цикл событий."""
+        if not isinstance(self.bot, AsyncBot):
+            await asyncio.to_thread(homework.send_message, self.bot, message)
+            return
+        self.get_session()
+        try:
+            with metrics.SEND_LATENCY.time():
+                await self.bot.send(homework.current_chat_id(), message)
+        except telegram.error.TelegramError as error:
+            logger.error(f"Ошибка при отправке сообщения в Telegram: {error}")
+            metrics.MESSAGES_FAILED.inc()
+        else:
+            logger.debug("Сообщение успешно отправлено в Telegram")
+            metrics.MESSAGES_SENT.inc()
+
+    async def poll_round(self, tenants):
+        """Конкурентный опрос тенантов и одно сохранение их состояний."""
+        activities = await asyncio.gather(
+            *(self.poll_tenant(tenant) for tenant in tenants)
+        )
+        await self.flush()
+        return activities
+
+    async def poll_all(self):
+        """Один опрос всех тенантов."""
+        await self.poll_round(self.tenants)
+
+    async def run(self):
+        """Опрашивает тенантов по расписанию до отмены задачи."""
+        tenants = {tenant.name: tenant for tenant in self.tenants}
+        intervals = {}
+        scheduler = Scheduler(jitter=homework.SCHEDULE_JITTER)
+        for tenant in self.tenants:
+            intervals[tenant.name] = AdaptiveInterval(tenant.poll_interval)
+            scheduler.add(tenant.name, tenant.poll_interval)
+        # Бот подключается к циклу событий до запуска очереди отправки:
+        # её поток отправляет сообщения через этот цикл.
+        self.get_session()
+        if homework.outbound is not None:
+            homework.outbound.start(self.bot)
+        try:
+            while True:
+                due = [tenants[name] for name in scheduler.pop_due()]
+                activities = await self.poll_round(due)
+                for tenant, activity in zip(due, activities):
+                    scheduler.set_interval(
+                        tenant.name, intervals[tenant.name].update(
+                            activity, self.poll_states[tenant.name].reviewing
+                        ),
+                    )
+                await asyncio.sleep(scheduler.delay())
+        except asyncio.CancelledError:
+            logger.info("Опрос остановлен.")
+        finally:
+            if homework.outbound is not None:
+                await asyncio.to_thread(
+                    homework.outbound.stop, OUTBOUND_STOP_TIMEOUT
+                )
+            await self.close()
+
+
+async def serve(runner):
+    """Запускает опрос и останавливает его по SIGTERM и SIGINT."""
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        await runner.run()
+    finally:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(signum)
+
+
+def main():
+    """Асинхронный режим работы бота."""
+    bot = AsyncBot(homework.TELEGRAM_TOKEN)
+    if homework.check_tokens():
+        sys.exit(1)
+    if homework.METRICS_PORT:
+        metrics.start_server(homework.METRICS_PORT)
+    if homework.TRACE_FILE:
+        tracer = Tracer(homework.TRACE_BUFFER)
+        tracer.install(homework)
+        tracer.install(AsyncRunner, STAGES)
+        tracer.dump_on_signal(homework.TRACE_FILE)
+    # Статусы записываются в outbox до отправки: сбой Bot API после
+    # сдвига курсора не теряет уведомление.
+    outbox = Outbox(homework.OUTBOX_FILE or homework.DEFAULT_OUTBOX_FILE)
+    outbox.purge()
+    homework.outbound = OutboundQueue(outbox=outbox)
+    runner = AsyncRunner(
+        bot,
+        homework.get_tenants(),
+        open_state_store(homework.STATE_FILE or homework.DEFAULT_STATE_FILE),
+    )
+    asyncio.run(serve(runner))
+
+
+if __name__ == "__main__":
+    homework.configure_logging()
+    main()
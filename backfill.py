@@ -0,0 +1,248 @@
+# Импорты из стандартных библиотек
+import argparse
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+# Импорты сторонних библиотек
+import telegram
+
+# Импорты модулей этого проекта
+import homework
+from api_client import PracticumClient, make_session
+from exceptions import ApiError
+from outbound import TokenBucket
+from state import PollState, open_state_store
+from tenants import current_tenant
+
+DAY = 24 * 3600
+WINDOW = 7 * DAY
+WORKERS = 4
+RATE_LIMIT = 5
+DATE_FORMATS = ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+logger = logging.getLogger(__name__)
+
+
+def parse_time(value):
+    """Unix-время из числа секунд или даты ISO в UTC."""
+    if value.isdigit():
+        return int(value)
+    for date_format in DATE_FORMATS:
+        try:
+            moment = datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        return int(moment.replace(tzinfo=timezone.utc).timestamp())
+    raise ValueError(f"Неизвестный формат даты: {value}")
+
+
+def updated_at(record):
+    """Время изменения статуса работы или None, если его нет в ответе."""
+    try:
+        return parse_time(record.updated)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def split_range(start, end, window=WINDOW):
+    """Окна [начало, конец) шириной window, покрывающие [start, end)."""
+    return [
+        (window_start, min(window_start + window, end))
+        for window_start in range(start, end, window)
+    ]
+
+
+def window_counts(records, start, end, window=WINDOW):
+    """Окна периода и число статусов, изменённых в каждом из них."""
+    counts = Counter(
+        (moment - start) // window
+        for moment in map(updated_at, records) if moment is not None
+    )
+    return [
+        (bounds, counts[index])
+        for index, bounds in enumerate(split_range(start, end, window))
+    ]
+
+
+class RateLimiter:
+    """Общий для потоков лимит запросов в секунду, без всплесков."""
+
+    def __init__(self, rate):
+        """Скорость в запросах в секунду."""
+        self.bucket = TokenBucket(rate, capacity=1)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Ждёт разрешения на очередной запрос."""
+        while True:
+            with self._lock:
+                delay = self.bucket.delay()
+                if not delay:
+                    self.bucket.take()
+                    return
+            time.sleep(delay)
+
+
+class Backfill:
+    """Загрузка истории статусов за период одним запросом.
+
+    API принимает только from_date и отдаёт всё, что изменилось с этой
+    даты до текущего момента. Поэтому период запрашивается один раз с
+    начала, а на окна делится уже полученная история: запрос на каждое
+    окно заново скачивал бы всю историю после него. Ответ читается
+    потоково, в памяти остаются только работы периода.
+    """
+
+    def __init__(self, client, headers, window=WINDOW):
+        """Клиент API, заголовки тенанта и ширина окна для отчёта."""
+        self.client = client
+        self.headers = headers
+        self.window = window
+
+    def fetch(self, start, end):
+        """Уникальные пары (работа, статус) за период по времени изменения.
+
+        Работы без date_updated попадают в историю один раз.
+        """
+        stream = self.client.stream_api_answer(start, self.headers)
+        if stream is None:
+            return []
+        merged = {}
+        for item in stream:
+            try:
+                record = homework.parse_homework(item)
+            except ValueError as error:
+                logger.error(f"Пропущена работа {item}: {error}")
+                continue
+            moment = updated_at(record)
+            if moment is not None and not start <= moment < end:
+                continue
+            merged.setdefault((record.key, record.status), record)
+        records = sorted(
+            merged.values(), key=lambda record: updated_at(record) or 0
+        )
+        for (window_start, window_end), count in window_counts(
+                records, start, end, self.window):
+            logger.info(
+                f"Окно {window_start}-{window_end}: статусов {count}"
+            )
+        return records
+
+
+def fetch_tenants(client, tenants, start, end, workers=WORKERS,
+                  rate_limit=RATE_LIMIT, window=WINDOW):
+    """История тенантов из пула потоков: пары (тенант, работы) по готовности.
+
+    Тенанту нужен один запрос, поэтому параллельно загружаются тенанты.
+    Общий лимит rate_limit запросов в секунду не даёт пулу нагрузить API
+    всплеском. Тенант, чей запрос не удался, пропускается с ошибкой в логе.
+    """
+    limiter = RateLimiter(rate_limit)
+
+    def fetch(tenant):
+        context_token = current_tenant.set(tenant)
+        try:
+            limiter.acquire()
+            return Backfill(client, tenant.headers, window).fetch(start, end)
+        finally:
+            current_tenant.reset(context_token)
+
+    with ThreadPoolExecutor(workers) as executor:
+        futures = {
+            executor.submit(fetch, tenant): tenant for tenant in tenants
+        }
+        for future in as_completed(futures):
+            tenant = futures[future]
+            try:
+                yield tenant, future.result()
+            except ApiError as error:
+                logger.error(f"Тенант {tenant.name}: история не загружена: "
+                             f"{error}")
+
+
+def latest_statuses(records):
+    """Последний статус каждой работы из упорядоченной истории."""
+    return list({record.key: record for record in records}.values())
+
+
+def backfill_tenant(bot, tenant, state_store, records, end, notify=True):
+    """Записывает историю в состояние тенанта и, если нужно, уведомляет."""
+    poll_state = state_store.load(tenant.name) or PollState(end)
+    latest = latest_statuses(records)
+    if notify:
+        context_token = current_tenant.set(tenant)
+        try:
+            homework.notify_statuses(bot, poll_state, latest)
+        finally:
+            current_tenant.reset(context_token)
+    else:
+        # Как и при уведомлениях, запись старше сохранённой не затирает
+        # более новый статус.
+        for record in poll_state.statuses.diff(latest):
+            poll_state.statuses.record(
+                record.key, record.status, record.updated
+            )
+    poll_state.timestamp = max(poll_state.timestamp, end)
+    state_store.save(tenant.name, poll_state)
+    return len(latest)
+
+
+def parse_args(argv):
+    """Аргументы командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Загрузка истории статусов домашних работ."
+    )
+    parser.add_argument("--from", dest="start", type=parse_time,
+                        required=True, help="начало: unix-время или дата")
+    parser.add_argument("--to", dest="end", type=parse_time,
+                        default=int(time.time()),
+                        help="конец: unix-время или дата, по умолчанию сейчас")
+    parser.add_argument("--window-days", type=float, default=WINDOW / DAY,
+                        help="ширина окна в днях для отчёта в логе")
+    parser.add_argument("--workers", type=int, default=WORKERS,
+                        help="сколько тенантов загружать параллельно")
+    parser.add_argument("--rate-limit", type=float, default=RATE_LIMIT,
+                        help="общий лимит запросов к API в секунду")
+    parser.add_argument("--tenant", action="append",
+                        help="тенант; по умолчанию все")
+    parser.add_argument("--no-notify", dest="notify", action="store_false",
+                        help="только записать состояние, без уведомлений")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Загрузка истории статусов в хранилище состояния."""
+    args = parse_args(argv)
+    if homework.check_tokens():
+        sys.exit(1)
+    bot = telegram.Bot(token=homework.TELEGRAM_TOKEN)
+    state_store = open_state_store(
+        homework.STATE_FILE or homework.DEFAULT_STATE_FILE
+    )
+    session = make_session(pool_size=args.workers)
+    client = PracticumClient(homework.ENDPOINT, homework.HEADERS, session)
+    tenants = [
+        tenant for tenant in homework.get_tenants()
+        if not args.tenant or tenant.name in args.tenant
+    ]
+    # Запросы идут в пуле, а состояние и уведомления пишутся из одного
+    # потока по мере готовности тенантов.
+    for tenant, records in fetch_tenants(
+            client, tenants, args.start, args.end, workers=args.workers,
+            rate_limit=args.rate_limit,
+            window=max(1, int(args.window_days * DAY))):
+        saved = backfill_tenant(
+            bot, tenant, state_store, records, args.end, args.notify
+        )
+        logger.info(f"Тенант {tenant.name}: загружено статусов {saved}")
+    client.close()
+
+
+if __name__ == "__main__":
+    homework.configure_logging(level=logging.INFO)
+    main()
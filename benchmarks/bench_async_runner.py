@@ -0,0 +1,53 @@
+"""Пропускная способность асинхронного опроса в зависимости от конкурентности.
+
+Запуск: python -m benchmarks.bench_async_runner [тенантов] [задержка, с]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.common import ROOT_DIR  # noqa: F401
+
+from async_runner import AsyncRunner
+from state import MemoryStateStore
+from stub_server import PracticumStub
+from tenants import Tenant
+
+LEVELS = (1, 10, 50, 100, 200)
+
+
+class NullBot:
+    def send_message(self, chat_id=None, text=None):
+        pass
+
+
+async def poll_once(runner):
+    try:
+        await runner.poll_all()
+    finally:
+        await runner.close()
+
+
+def main(tenants_qty=400, latency=0.05):
+    tenants = [
+        Tenant(f't{i}', f'token-{i}', str(i), 600)
+        for i in range(tenants_qty)
+    ]
+    with PracticumStub(latency=latency) as stub:
+        for concurrency in LEVELS:
+            runner = AsyncRunner(
+                NullBot(), tenants, MemoryStateStore(),
+                endpoint=stub.url, concurrency=concurrency,
+            )
+            started = time.perf_counter()
+            asyncio.run(poll_once(runner))
+            elapsed = time.perf_counter() - started
+            print(
+                f'concurrency={concurrency:<4} '
+                f'{tenants_qty / elapsed:9.1f} polls/s  ({elapsed:.2f} s)'
+            )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 400,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.05)
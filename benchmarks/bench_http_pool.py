@@ -0,0 +1,30 @@
+"""Задержка опроса API с пулом соединений и без него.
+
+Запуск: python -m benchmarks.bench_http_pool [число запросов]
+"""
+import sys
+
+from benchmarks.common import measure, report
+
+import homework
+from api_client import PracticumClient, make_session
+from stub_server import PracticumStub
+
+
+def main(repeat=500):
+    with PracticumStub() as stub:
+        homework.ENDPOINT = stub.url
+        homework.api_client = None
+        unpooled = measure(lambda: homework.get_api_answer(0), repeat)
+
+        homework.api_client = PracticumClient(
+            stub.url, homework.HEADERS, session=make_session()
+        )
+        pooled = measure(lambda: homework.get_api_answer(0), repeat)
+        homework.api_client.close()
+    report('requests.get', unpooled)
+    report('PracticumClient (pool)', pooled)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
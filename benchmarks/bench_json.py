@@ -0,0 +1,74 @@
+"""Разбор больших ответов API: response.json() против декодеров из байтов.
+
+Запуск: python -m benchmarks.bench_json [файл с записанным ответом ...]
+Без аргументов используются синтетические ответы на 1, 8 и 32 МБ.
+"""
+import json
+import sys
+
+from benchmarks.common import measure, report
+
+from requests.models import Response
+
+from decoders import DECODERS, make_decoder
+
+SIZES_MB = (1, 8, 32)
+REPEAT = 10
+
+
+def make_payload(size_mb):
+    homework = {
+        'id': 0,
+        'status': 'approved',
+        'homework_name': 'student__hw05_final.zip',
+        'reviewer_comment': 'Всё отлично, но можно лучше. ' * 4,
+        'date_updated': '2020-02-13T14:40:57Z',
+        'lesson_name': 'Итоговый проект',
+    }
+    item_size = len(json.dumps(homework, ensure_ascii=False).encode())
+    homeworks = [
+        {**homework, 'id': i}
+        for i in range(size_mb * 1024 * 1024 // item_size)
+    ]
+    return json.dumps(
+        {'homeworks': homeworks, 'current_date': 1581604970},
+        ensure_ascii=False,
+    ).encode()
+
+
+def make_response(payload):
+    response = Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = payload
+    return response
+
+
+def run(title, payload):
+    print(f'{title}: {len(payload) / 1024 / 1024:.1f} МБ')
+    report('response.json()', measure(
+        lambda: make_response(payload).json(), REPEAT
+    ))
+    for name in DECODERS:
+        try:
+            decode = make_decoder(name)
+        except ImportError:
+            print(f'{name:<28} не установлен')
+            continue
+        report(f'{name}(content)', measure(
+            lambda: decode(make_response(payload).content), REPEAT
+        ))
+
+
+def main(paths):
+    if paths:
+        for path in paths:
+            with open(path, 'rb') as recorded:
+                run(path, recorded.read())
+        return
+    for size_mb in SIZES_MB:
+        run('синтетический ответ', make_payload(size_mb))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""Сборка текстов уведомлений: f-строка против готовых шаблонов.
+
+Повторяющиеся названия работ попадают в LRU; уникальные показывают
+цену промаха.
+
+Запуск: python -m benchmarks.bench_messages [число работ] [повторы]
+"""
+import sys
+
+from benchmarks.common import measure, report
+
+from messages import VERDICTS_EN, MessageRenderer
+
+VERDICTS = {
+    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+    'reviewing': 'Работа взята на проверку ревьюером.',
+    'rejected': 'Работа проверена: у ревьюера есть замечания.',
+}
+
+
+def legacy_render(name, status):
+    verdict = VERDICTS[status]
+    return f'Изменился статус проверки работы "{name}". {verdict}'
+
+
+def make_changes(qty, names=500):
+    statuses = list(VERDICTS)
+    return [
+        (f'student__hw{i % names:06}_final.zip', statuses[i % len(statuses)])
+        for i in range(qty)
+    ]
+
+
+def main(qty=100000, repeat=20):
+    verdicts = {'ru': VERDICTS, 'en': VERDICTS_EN}
+    for workload, changes in (
+        ('repeat', make_changes(qty)),
+        ('unique', make_changes(qty, names=qty)),
+    ):
+        renderers = (
+            ('f-string', lambda: legacy_render),
+            ('precompiled', lambda: MessageRenderer(
+                verdicts, cache_size=0
+            ).render),
+            ('precompiled+LRU', lambda: MessageRenderer(verdicts).render),
+        )
+        for name, make_render in renderers:
+            render = make_render()
+            assert [render(*change) for change in changes] == [
+                legacy_render(*change) for change in changes
+            ]
+            # Кэш заполнен проверкой выше: на повторах меряются попадания,
+            # на уникальных названиях — промахи и вытеснение.
+            samples = measure(
+                lambda: [render(*change) for change in changes], repeat
+            )
+            report(f'{workload} {name}', samples)
+            print(f'{"":<28} {qty / min(samples):,.0f} сообщений/с')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20)
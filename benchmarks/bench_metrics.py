@@ -0,0 +1,96 @@
+"""Накладные расходы метрик: стоимость операции и доля в цикле опроса.
+
+Запуск: python -m benchmarks.bench_metrics [циклов опроса]
+"""
+import contextlib
+import sys
+import time
+
+from benchmarks.common import measure, report
+
+import homework
+import metrics
+import utils
+from api_client import PracticumClient
+from breaker import CircuitBreaker
+from state import MemoryStateStore, PollState
+from stub_server import PracticumStub
+from tenants import Tenant
+
+OPERATIONS = 200000
+HOT_PATH = (
+    'POLLS', 'API_ERRORS', 'HOMEWORKS_PARSED', 'MESSAGES_SENT',
+    'MESSAGES_FAILED', 'API_LATENCY', 'DECODE_TIME', 'SEND_LATENCY',
+    'CURSOR_LAG',
+)
+
+
+class NoMetric:
+    def inc(self, *args, **kwargs):
+        pass
+
+    def set(self, *args):
+        pass
+
+    def observe(self, *args):
+        pass
+
+    def time(self, *args):
+        return contextlib.nullcontext()
+
+
+def per_operation():
+    counter = metrics.Counter('bench_total', 'Бенчмарк.', ('tenant',))
+    histogram = metrics.Histogram('bench_seconds', 'Бенчмарк.')
+
+    def timed():
+        with histogram.time():
+            pass
+
+    for name, func in (
+        ('Counter.inc', lambda: counter.inc('t')),
+        ('Histogram.observe', lambda: histogram.observe(0.01)),
+        ('Histogram.time', timed),
+    ):
+        started = time.perf_counter()
+        for _ in range(OPERATIONS):
+            func()
+        elapsed = time.perf_counter() - started
+        print(f'{name:<28} {elapsed / OPERATIONS * 1e9:8.0f} нс')
+    del metrics.metrics['bench_total'], metrics.metrics['bench_seconds']
+
+
+def main(repeat=500):
+    per_operation()
+    homeworks = [
+        {'id': i, 'homework_name': f'hw{i}', 'status': 'approved'}
+        for i in range(20)
+    ]
+    tenant = Tenant('bench', 'token', '1', 600)
+    with PracticumStub(homeworks=homeworks) as stub:
+        homework.api_client = PracticumClient(stub.url, {})
+        bot = utils.MockTelegramBot()
+        poll_state, store = PollState(0), MemoryStateStore()
+        breaker = CircuitBreaker('bench')
+
+        def cycle():
+            homework.poll_tenant(bot, tenant, poll_state, store, breaker)
+
+        enabled = {name: getattr(metrics, name) for name in HOT_PATH}
+        disabled = dict.fromkeys(HOT_PATH, NoMetric())
+        samples = {'с метриками': [], 'без метрик': []}
+        for _ in range(repeat):
+            for title, values in (('с метриками', enabled),
+                                  ('без метрик', disabled)):
+                for name, value in values.items():
+                    setattr(metrics, name, value)
+                samples[title].extend(measure(cycle, 1))
+        for name, value in enabled.items():
+            setattr(metrics, name, value)
+        homework.api_client.close()
+    for title, values in samples.items():
+        report(f'poll_tenant, {title}', values)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
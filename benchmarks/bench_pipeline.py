@@ -0,0 +1,242 @@
+"""Сквозной бенчмарк цикла опроса main() на локальных заглушках API.
+
+Воркер запускается отдельным процессом, как в продакшене: пул соединений
+к API домашки, outbox и очередь отправки в Telegram. Заглушки API домашки
+и Bot API работают в этом процессе с заданными задержкой, размером ответа
+и долей ошибок. Измеряются p99 времени от смены статуса до уведомления,
+CPU на опрос, опросы в секунду и RSS на тенанта — разница пиковой RSS
+прогонов с N и 2N тенантами, без постоянной части процесса.
+
+Запуск:
+    python -m benchmarks.bench_pipeline [--scenario steady] [--duration 10]
+    python -m benchmarks.bench_pipeline --update-baseline
+
+Результаты сравниваются с benchmarks/baselines/pipeline.json: если
+задержка или CPU на опрос хуже базы больше чем на --tolerance, процесс
+завершается с кодом 1. На шумной машине можно увеличить --tolerance
+или только напечатать отклонения флагом --report-only. Опросы в секунду
+задаёт расписание, а не скорость кода, поэтому с базой они не
+сравниваются. Базовые значения зависят от машины: после смены окружения
+их перезаписывают флагом --update-baseline.
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import ROOT_DIR, percentile
+
+from stub_server import BotApiStub, LoadPracticumStub
+
+BASELINE_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'baselines',
+                             'pipeline.json')
+SCENARIOS = {
+    'steady': {
+        'tenants': 20, 'api_latency': 0.02, 'bot_latency': 0.01,
+        'change_interval': 2.0, 'history': 50, 'comment_size': 200,
+        'api_error_rate': 0.0, 'bot_error_rate': 0.0,
+    },
+    'errors': {
+        'tenants': 20, 'api_latency': 0.02, 'bot_latency': 0.01,
+        'change_interval': 2.0, 'history': 50, 'comment_size': 200,
+        'api_error_rate': 0.1, 'bot_error_rate': 0.05,
+    },
+}
+# Метрики, которые сравниваются с базой; больше значит хуже.
+COMPARED = ('p99_notify_sec', 'cpu_ms_per_poll')
+NAME_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def run_worker(practicum_url, bot_url, tenants_file, outbox_file):
+    """Процесс воркера: main() с продакшен-обвязкой, но на заглушках."""
+    import functools
+
+    import telegram
+
+    import homework
+    from api_client import PracticumClient, make_session
+    from outbound import OutboundQueue
+    from outbox import Outbox
+
+    telegram.Bot = functools.partial(telegram.Bot, base_url=f'{bot_url}bot')
+    homework.TENANTS_FILE = tenants_file
+    homework.api_client = PracticumClient(
+        practicum_url, homework.HEADERS,
+        session=make_session(pool_size=homework.HTTP_POOL_SIZE),
+    )
+    homework.outbound = OutboundQueue(outbox=Outbox(outbox_file))
+    homework.main()
+
+
+def cpu_seconds(pid):
+    """Процессорное время процесса из /proc или None вне Linux."""
+    try:
+        with open(f'/proc/{pid}/stat') as stat_file:
+            fields = stat_file.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def time_to_notify(practicum, bot, since):
+    """Задержки уведомлений о сменах статуса после разогрева."""
+    delays = []
+    with bot._lock:
+        messages = list(zip(bot.received, bot.messages))
+    for received, (_, text) in messages:
+        for name in NAME_PATTERN.findall(text or ''):
+            changed = practicum.changed_at.get(name)
+            if changed is not None and changed >= since:
+                delays.append(received - changed)
+    return delays
+
+
+def run_worker_process(config, duration, warmup):
+    """Опросы, задержки уведомлений, CPU и пиковая RSS одного прогона."""
+    tenants = config['tenants']
+    workdir = tempfile.mkdtemp(prefix='bench-pipeline-')
+    tenants_file = os.path.join(workdir, 'tenants.json')
+    with open(tenants_file, 'w', encoding='utf-8') as registry:
+        json.dump([
+            {'name': f't{i}', 'practicum_token': f't{i}', 'chat_id': i + 1,
+             'poll_interval': 1}
+            for i in range(tenants)
+        ], registry)
+    practicum = LoadPracticumStub(
+        latency=config['api_latency'],
+        change_interval=config['change_interval'],
+        history=config['history'],
+        comment_size=config['comment_size'],
+        error_rate=config['api_error_rate'],
+    )
+    bot = BotApiStub(
+        latency=config['bot_latency'], error_rate=config['bot_error_rate']
+    )
+    stderr = open(os.path.join(workdir, 'worker.log'), 'w+')
+    with practicum, bot:
+        worker = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.bench_pipeline', '--worker',
+             practicum.url, bot.url, tenants_file,
+             os.path.join(workdir, 'outbox.sqlite')],
+            cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=stderr,
+        )
+        time.sleep(warmup)
+        started, cpu_started = time.time(), cpu_seconds(worker.pid)
+        requests_started = len(practicum.requests)
+        time.sleep(duration)
+        polls = len(practicum.requests) - requests_started
+        worker.send_signal(signal.SIGTERM)
+        _, status, usage = os.wait4(worker.pid, 0)
+        worker.returncode = os.waitstatus_to_exitcode(status)
+        delays = time_to_notify(practicum, bot, started)
+    if not polls or not delays:
+        stderr.seek(0)
+        raise RuntimeError(f'Воркер не работает:\n{stderr.read()[-2000:]}')
+    stderr.close()
+    cpu = usage.ru_utime + usage.ru_stime - (cpu_started or 0)
+    return polls, delays, cpu, usage.ru_maxrss
+
+
+def run_scenario(config, duration, warmup):
+    """Метрики одного сценария.
+
+    Второй прогон с удвоенным числом тенантов нужен только для RSS:
+    пиковая RSS процесса — в основном интерпретатор и библиотеки, и
+    делить её на число тенантов бессмысленно.
+    """
+    tenants = config['tenants']
+    polls, delays, cpu, rss = run_worker_process(config, duration, warmup)
+    *_, doubled_rss = run_worker_process(
+        {**config, 'tenants': 2 * tenants}, duration, warmup
+    )
+    return {
+        'p99_notify_sec': percentile(delays, 0.99),
+        'cpu_ms_per_poll': 1000 * cpu / polls,
+        'polls_per_sec': polls / duration,
+        'rss_kb_per_tenant': (doubled_rss - rss) / tenants,
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Сравниваемые метрики, которые хуже базовых больше чем на tolerance."""
+    found = []
+    for metric in COMPARED:
+        expected = baseline.get(metric)
+        if not expected:
+            continue
+        change = results[metric] / expected - 1
+        if change > tolerance:
+            found.append(
+                f'{metric}: {results[metric]:.3f} против {expected:.3f} '
+                f'({change:+.0%})'
+            )
+    return found
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', action='append',
+                        choices=sorted(SCENARIOS),
+                        help='сценарий; по умолчанию все')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--report-only', action='store_true',
+                        help='печатать регрессии, но не завершаться с кодом 1')
+    parser.add_argument('--update-baseline', action='store_true')
+    for name, value in SCENARIOS['steady'].items():
+        parser.add_argument(f'--{name.replace("_", "-")}', dest=name,
+                            type=type(value), default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        with open(BASELINE_FILE, encoding='utf-8') as baseline_file:
+            baselines = json.load(baseline_file)
+    except FileNotFoundError:
+        baselines = {}
+    overrides = {
+        name: getattr(args, name) for name in SCENARIOS['steady']
+        if getattr(args, name) is not None
+    }
+    failed = []
+    for scenario in args.scenario or sorted(SCENARIOS):
+        results = run_scenario(
+            {**SCENARIOS[scenario], **overrides}, args.duration, args.warmup
+        )
+        print(scenario, ' '.join(
+            f'{metric}={value:.3f}' for metric, value in results.items()
+        ))
+        if args.update_baseline:
+            baselines[scenario] = {
+                metric: round(value, 3) for metric, value in results.items()
+            }
+        elif overrides:
+            print('  параметры изменены, сравнение с базой пропущено')
+        else:
+            for problem in regressions(
+                    results, baselines.get(scenario, {}), args.tolerance):
+                failed.append(f'{scenario} {problem}')
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_FILE), exist_ok=True)
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as baseline_file:
+            json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+        print(f'Базовые значения записаны в {BASELINE_FILE}')
+    for problem in failed:
+        print(f'РЕГРЕССИЯ {problem}')
+    return 1 if failed and not args.report_only else 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        run_worker(*sys.argv[2:6])
+    else:
+        sys.exit(main())
@@ -0,0 +1,98 @@
+"""Офлайн-прогон записанных ответов API через проверку и разбор.
+
+Ответы из архива (RECORD_FILE воркера) проходят тот же путь, что в цикле
+опроса: get_api_answer, check_response и parse_status, без сети.
+Без архива он записывается с заглушки под нагрузкой.
+
+Запуск:
+    python -m benchmarks.bench_replay [архив.jsonl.gz] [--speed 0]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import report
+
+import homework
+from api_client import PracticumClient, make_session
+from exceptions import ApiError
+from recording import RecordingSession, ReplaySession
+from stub_server import LoadPracticumStub
+from tenants import Tenant, current_tenant
+
+
+def record_sample(path, requests_qty, history):
+    """Архив ответов заглушки для десяти тенантов."""
+    with LoadPracticumStub(change_interval=0.01, history=history,
+                           comment_size=200, error_rate=0.05) as stub:
+        session = RecordingSession(make_session(retries=0), path)
+        client = PracticumClient(stub.url, {}, session=session)
+        for i in range(requests_qty):
+            tenant = Tenant(f't{i % 10}', f't{i % 10}', i % 10, 600)
+            token = current_tenant.set(tenant)
+            try:
+                client.get_api_answer(0, tenant.headers)
+            except ApiError:
+                pass
+            finally:
+                current_tenant.reset(token)
+        client.close()
+
+
+def replay(path, speed):
+    """Время стадий на каждом записанном ответе."""
+    session = ReplaySession(path, speed, by_tenant=False)
+    homework.api_client = PracticumClient(
+        homework.ENDPOINT, homework.HEADERS, session=session
+    )
+    stages = {'get_api_answer': [], 'check_response': [], 'parse_status': []}
+    errors = parsed = 0
+    started = time.perf_counter()
+    while len(session):
+        moment = time.perf_counter()
+        try:
+            answer = homework.get_api_answer(0)
+        except ApiError:
+            errors += 1
+            continue
+        stages['get_api_answer'].append(time.perf_counter() - moment)
+        if answer is None:
+            continue
+        moment = time.perf_counter()
+        homework.check_response(answer)
+        stages['check_response'].append(time.perf_counter() - moment)
+        for homework_data in answer['homeworks']:
+            moment = time.perf_counter()
+            homework.parse_status(homework_data)
+            stages['parse_status'].append(time.perf_counter() - moment)
+            parsed += 1
+    return stages, errors, parsed, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('archive', nargs='?')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='ускорение относительно записи; 0 — без пауз')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--history', type=int, default=200)
+    args = parser.parse_args()
+    path = args.archive
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), 'api.jsonl.gz')
+        record_sample(path, args.requests, args.history)
+    print(f'Архив {path}: {os.path.getsize(path) / 1024:.1f} КБ')
+    stages, errors, parsed, total = replay(path, args.speed)
+    answers = len(stages['get_api_answer'])
+    print(
+        f'Ответов {answers}, ошибок {errors}, работ {parsed}, '
+        f'{answers / total:.0f} ответов/с, {parsed / total:.0f} работ/с'
+    )
+    for stage, samples in stages.items():
+        if samples:
+            report(stage, samples)
+
+
+if __name__ == '__main__':
+    main()
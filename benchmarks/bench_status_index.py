@@ -0,0 +1,81 @@
+"""Индекс последних статусов: память на запись и время сравнения ответа.
+
+Запуск: python -m benchmarks.bench_status_index [работ в индексе] [повторы]
+"""
+import sys
+import tracemalloc
+
+from benchmarks.common import measure, report
+
+from status_index import StatusIndex
+from validation import Homework
+
+STATUSES = ('approved', 'reviewing', 'rejected')
+UPDATED = '2020-02-13T14:40:57Z'
+
+
+def make_keys(qty):
+    return [str(100000 + i) for i in range(qty)]
+
+
+def allocated(build):
+    """Байты, занятые структурой, построенной build()."""
+    tracemalloc.start()
+    try:
+        structure = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del structure
+    return size
+
+
+def legacy_diff(homeworks, known_statuses):
+    seen = dict(known_statuses)
+    for homework in homeworks:
+        key, _, status, _ = homework
+        if seen.get(key) == status:
+            continue
+        seen[key] = status
+        yield homework
+
+
+def main(qty=100000, repeat=50):
+    keys = make_keys(qty)
+    statuses = {key: STATUSES[i % 3] for i, key in enumerate(keys)}
+    # Ключи работ живут в ответе API и считаются отдельно от индекса.
+    per_entry = {
+        'dict статусов': lambda: dict(statuses),
+        'dict (статус, время)': lambda: {
+            key: (status, 1581604857 + i)
+            for i, (key, status) in enumerate(statuses.items())
+        },
+        'StatusIndex': lambda: StatusIndex(
+            statuses, dict.fromkeys(keys, UPDATED), max_size=qty
+        ),
+    }
+    for name, build in per_entry.items():
+        print(f'{name:<28} {allocated(build) / qty:6.1f} байт на работу')
+
+    index = StatusIndex(statuses, dict.fromkeys(keys, UPDATED), max_size=qty)
+    response = [
+        Homework(key, key, statuses[key], UPDATED) for key in keys[:10000]
+    ]
+    for i in range(0, len(response), 1000):
+        key = response[i].key
+        status = 'rejected' if statuses[key] == 'approved' else 'approved'
+        response[i] = Homework(key, key, status, UPDATED)
+    assert [h.key for h in legacy_diff(response, statuses)] == [
+        h.key for h in index.diff(response)
+    ]
+    report('dict: копия и сравнение', measure(
+        lambda: list(legacy_diff(response, statuses)), repeat
+    ))
+    report('StatusIndex.diff', measure(
+        lambda: list(index.diff(response)), repeat
+    ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50)
@@ -0,0 +1,74 @@
+"""Пропускная способность отправки в Telegram: telegram.Bot против AsyncBot.
+
+Запуск: python -m benchmarks.bench_telegram [сообщений] [задержка, с]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.common import ROOT_DIR  # noqa: F401
+
+import telegram
+
+from api_client import make_async_session
+from stub_server import BotApiStub
+from telegram_client import AsyncBot
+
+TOKEN = '123:abc'
+CONCURRENCY = 50
+
+
+def run_sync(bot, messages_qty):
+    for i in range(messages_qty):
+        bot.send_message(chat_id=i, text='Изменился статус')
+
+
+def run_sync_async_bot(url, messages_qty):
+    bot = AsyncBot(TOKEN, api_url=url)
+    try:
+        run_sync(bot, messages_qty)
+    finally:
+        bot.stop()
+
+
+async def run_async(url, messages_qty):
+    session = make_async_session(CONCURRENCY)
+    bot = AsyncBot(TOKEN, session=session, api_url=url)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def send(chat_id):
+        async with semaphore:
+            await bot.send(chat_id, 'Изменился статус')
+
+    try:
+        await asyncio.gather(*(send(i) for i in range(messages_qty)))
+    finally:
+        await session.close()
+
+
+def report_rate(name, messages_qty, elapsed):
+    print(f'{name:<28} {messages_qty / elapsed:9.1f} msg/s  ({elapsed:.2f} s)')
+
+
+def main(messages_qty=500, latency=0.01):
+    with BotApiStub(latency=latency) as stub:
+        cases = (
+            ('telegram.Bot', lambda: run_sync(
+                telegram.Bot(TOKEN, base_url=f'{stub.url}bot'), messages_qty
+            )),
+            ('AsyncBot.send_message', lambda: run_sync_async_bot(
+                stub.url, messages_qty
+            )),
+            (f'AsyncBot.send x{CONCURRENCY}', lambda: asyncio.run(
+                run_async(stub.url, messages_qty)
+            )),
+        )
+        for name, func in cases:
+            started = time.perf_counter()
+            func()
+            report_rate(name, messages_qty, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 0.01)
@@ -0,0 +1,62 @@
+"""Стоимость трассировки: цикл опроса без трассировки и с ней.
+
+Запуск: python -m benchmarks.bench_tracing [циклов опроса]
+"""
+import sys
+import time
+
+from benchmarks.common import measure, report
+
+import homework
+import utils
+from state import PollState
+from tracing import STAGES, Tracer
+
+SPANS = 200000
+
+
+def make_response(qty=100):
+    return {
+        'homeworks': [
+            {'id': i, 'homework_name': f'hw{i}', 'status': 'approved'}
+            for i in range(qty)
+        ],
+        'current_date': 1000,
+    }
+
+
+def main(repeat=2000):
+    tracer = Tracer()
+    started = time.perf_counter()
+    for _ in range(SPANS):
+        with tracer.span('stage'):
+            pass
+    elapsed = time.perf_counter() - started
+    print(f'{"Tracer.span":<28} {elapsed / SPANS * 1e9:8.0f} нс')
+
+    response = make_response()
+    homework.get_api_answer = lambda timestamp: response
+    originals = {name: getattr(homework, name) for name in STAGES}
+    bot = utils.MockTelegramBot()
+    poll_state = PollState(0)
+    homework.poll_updates(bot, poll_state)
+
+    def cycle():
+        homework.poll_updates(bot, poll_state)
+
+    samples = {'трассировка выключена': [], 'трассировка включена': []}
+    for _ in range(repeat):
+        assert all(
+            getattr(homework, name) is func
+            for name, func in originals.items()
+        ), 'Выключенная трассировка не должна подменять функции.'
+        samples['трассировка выключена'].extend(measure(cycle, 1))
+        tracer.install(homework)
+        samples['трассировка включена'].extend(measure(cycle, 1))
+        tracer.uninstall()
+    for title, values in samples.items():
+        report(title, values)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,112 @@
+"""Проверка большого ответа API: прежние функции против компилированной.
+
+Запуск: python -m benchmarks.bench_validation [работ] [повторов]
+"""
+import sys
+from collections import namedtuple
+
+from benchmarks.common import measure, report
+
+import homework
+from exceptions import VarTypeError
+from status_index import StatusIndex
+
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+
+StatusChange = namedtuple(
+    'StatusChange', ('key', 'status', 'message', 'updated')
+)
+
+
+def make_response(homeworks_qty):
+    return {
+        'homeworks': [
+            {
+                'id': i,
+                'homework_name': f'student__hw{i:05d}.zip',
+                'status': STATUSES[i % len(STATUSES)],
+                'date_updated': '2020-02-13T14:40:57Z',
+            }
+            for i in range(homeworks_qty)
+        ],
+        'current_date': 1581604970,
+    }
+
+
+def legacy_check_response(response):
+    """check_response до компилированного валидатора."""
+    if not isinstance(response, dict):
+        raise TypeError('response должен быть типа dict')
+    if 'homeworks' not in response:
+        raise KeyError('Нет такого ключа как homeworks')
+    if not isinstance(response.get('homeworks'), list):
+        raise TypeError('Данные homeworks должны быть типа list')
+    if 'current_date' not in response:
+        raise VarTypeError("Отсутствует ключ 'current_date'")
+    if not isinstance(response.get('current_date'), int):
+        raise VarTypeError('Данные current_date должны быть типа int')
+
+
+def legacy_parse_status(homework_data):
+    status = homework_data.get('status')
+    homework_name = homework_data.get('homework_name')
+    if status in homework.HOMEWORK_VERDICTS and homework_name:
+        verdict = homework.HOMEWORK_VERDICTS[status]
+        return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    raise ValueError("Проблема со значением переменной 'status'")
+
+
+def legacy_parse_statuses(homeworks, known_statuses):
+    """parse_statuses до компилированного валидатора."""
+    seen = dict(known_statuses)
+    for homework_data in homeworks:
+        try:
+            message = legacy_parse_status(homework_data)
+        except ValueError:
+            continue
+        key = str(homework_data.get('id', homework_data.get('homework_name')))
+        status = homework_data['status']
+        if seen.get(key) == status:
+            continue
+        seen[key] = status
+        yield StatusChange(
+            key, status, message, homework_data.get('date_updated')
+        )
+
+
+def legacy(response, known_statuses):
+    legacy_check_response(response)
+    return list(legacy_parse_statuses(response['homeworks'], known_statuses))
+
+
+def compiled(response, known_statuses):
+    checked = homework.check_response(response)
+    return list(homework.parse_statuses(checked.homeworks, known_statuses))
+
+
+def main(homeworks_qty=10000, repeat=50):
+    response = make_response(homeworks_qty)
+    known = {
+        str(item['id']): item['status'] for item in response['homeworks']
+    }
+    assert [change[:3] for change in legacy(response, {})] == [
+        (change.key, change.status, homework.render_message(change))
+        for change in compiled(response, {})
+    ]
+    # Воркер сравнивает ответ со StatusIndex из состояния опроса.
+    cases = (
+        ('new', {}, StatusIndex()),
+        ('known', known, StatusIndex(known)),
+    )
+    for title, known_statuses, index in cases:
+        report(f'legacy, {title} statuses', measure(
+            lambda: legacy(response, known_statuses), repeat
+        ))
+        report(f'compiled, {title} statuses', measure(
+            lambda: compiled(response, index), repeat
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50)
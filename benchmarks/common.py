@@ -0,0 +1,40 @@
+"""Общие помощники бенчмарков."""
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, 'tests')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault('PRACTICUM_TOKEN', 'sometoken')
+os.environ.setdefault('TELEGRAM_TOKEN', '1234:abcdefg')
+os.environ.setdefault('TELEGRAM_CHAT_ID', '12345')
+
+
+def percentile(samples, fraction):
+    """Перцентиль выборки методом ближайшего ранга."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func, repeat):
+    """Время каждого из `repeat` вызовов функции в секундах."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def report(name, samples):
+    """Печатает p50/p99 и среднее значение выборки в миллисекундах."""
+    print(
+        f'{name:<28} p50={percentile(samples, 0.5) * 1000:8.3f} ms  '
+        f'p99={percentile(samples, 0.99) * 1000:8.3f} ms  '
+        f'mean={statistics.mean(samples) * 1000:8.3f} ms'
+    )
@@ -0,0 +1,109 @@
+"""Симуляция опроса с фиксированным и адаптивным периодом.
+
+Проигрывает синтетические истории статусов работ на фиктивных часах и
+сравнивает число запросов к API с задержкой уведомлений.
+
+Запуск: python -m benchmarks.simulate_adaptive [аккаунтов] [дней] [seed]
+"""
+import random
+import sys
+
+from benchmarks.common import percentile
+
+from scheduler import AdaptiveInterval, Scheduler
+
+RETRY_PERIOD = 600
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_timeline(rng, horizon, active):
+    """События (время, статус) одного аккаунта."""
+    if not active:
+        return []
+    events = []
+    now = rng.uniform(0, DAY)
+    while now < horizon:
+        events.append((now, 'reviewing'))
+        now += rng.expovariate(1 / (6 * HOUR))
+        events.append((now, rng.choice(('approved', 'rejected'))))
+        now += rng.expovariate(1 / (2 * DAY))
+    return [event for event in events if event[0] < horizon]
+
+
+def simulate(timelines, horizon, make_interval):
+    """Число запросов и задержки уведомлений для политики периода."""
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock, jitter=1.0, rng=random.Random(0).random)
+    cursors, positions, intervals, statuses = {}, {}, {}, {}
+    for account in range(len(timelines)):
+        scheduler.add(account, RETRY_PERIOD)
+        cursors[account] = 0.0
+        positions[account] = 0
+        intervals[account] = make_interval()
+        statuses[account] = None
+    calls, latencies = 0, {'reviewing': [], 'verdict': []}
+    while clock.now < horizon:
+        for account in scheduler.pop_due():
+            calls += 1
+            events = timelines[account]
+            position = positions[account]
+            seen = 0
+            while position < len(events) and events[position][0] <= clock.now:
+                event_time, status = events[position]
+                kind = 'reviewing' if status == 'reviewing' else 'verdict'
+                latencies[kind].append(clock.now - event_time)
+                statuses[account] = status
+                position += 1
+                seen += 1
+            positions[account] = position
+            scheduler.set_interval(
+                account,
+                intervals[account].update(
+                    seen, statuses[account] == 'reviewing'
+                ),
+            )
+        clock.now += max(scheduler.delay(), 1)
+    return calls, latencies
+
+
+class FixedInterval:
+    def update(self, activity, reviewing):
+        return RETRY_PERIOD
+
+
+def main(accounts=500, days=7, seed=1):
+    rng = random.Random(seed)
+    horizon = days * DAY
+    timelines = [
+        make_timeline(rng, horizon, active=rng.random() < 0.3)
+        for _ in range(accounts)
+    ]
+    policies = {
+        'fixed': FixedInterval,
+        'adaptive': lambda: AdaptiveInterval(RETRY_PERIOD),
+    }
+    print(f'{accounts} аккаунтов, {days} дн., '
+          f'{sum(map(len, timelines))} событий')
+    for name, make_interval in policies.items():
+        calls, latencies = simulate(timelines, horizon, make_interval)
+        print(f'{name:<9} calls={calls}')
+        for kind, samples in latencies.items():
+            print(
+                f'  {kind:<10} latency '
+                f'p50={percentile(samples, 0.5) / 60:6.1f} мин  '
+                f'p99={percentile(samples, 0.99) / 60:6.1f} мин  '
+                f'max={max(samples) / 60:6.1f} мин'
+            )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,100 @@
+# Импорты из стандартных библиотек
+import logging
+import time
+from collections import Counter
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 600
+MAX_RESET_TIMEOUT = 6 * 3600
+
+logger = logging.getLogger(__name__)
+
+# Переходы состояний всех автоматов процесса: (имя, из, в) -> количество.
+transitions = Counter()
+# Автоматы процесса по именам.
+breakers = {}
+
+
+def state_counts():
+    """Количество автоматов в каждом состоянии."""
+    return Counter(breaker.state for breaker in breakers.values())
+
+
+class CircuitBreaker:
+    """Автомат защиты от повторных запросов к недоступному API.
+
+    После FAILURE_THRESHOLD ошибок подряд автомат размыкается и не
+    пропускает запросы reset_timeout секунд. Затем пропускает один
+    пробный запрос: успех замыкает автомат, любая ошибка снова размыкает
+    его с удвоенным таймаутом, но не дольше max_reset_timeout.
+    """
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD,
+                 reset_timeout=RESET_TIMEOUT,
+                 max_reset_timeout=MAX_RESET_TIMEOUT, clock=time.monotonic):
+        """Имя для метрик, порог ошибок и таймауты в секундах."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        breakers[name] = self
+
+    def _switch(self, state):
+        transitions[(self.name, self.state, state)] += 1
+        logger.warning(
+            f"Автомат {self.name}: {self.state} -> {state}, "
+            f"таймаут {self.reset_timeout} с"
+        )
+        self.state = state
+
+    def allow(self):
+        """Можно ли сейчас обращаться к API."""
+        if self.state == OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                return False
+            self._switch(HALF_OPEN)
+        return True
+
+    def record_success(self):
+        """Учитывает успешный запрос; True, если API восстановилось."""
+        self.failures = 0
+        if self.state == CLOSED:
+            return False
+        self.reset_timeout = self.base_reset_timeout
+        self._switch(CLOSED)
+        return True
+
+    def record_failure(self):
+        """Учитывает ошибку; True, если автомат только что разомкнулся."""
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.reset_timeout = min(
+                self.reset_timeout * 2, self.max_reset_timeout
+            )
+            self.opened_at = self.clock()
+            self._switch(OPEN)
+            return False
+        if self.state == CLOSED and self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self._switch(OPEN)
+            return True
+        return False
+
+    def release_probe(self):
+        """Завершает пробный запрос, прерванный не ошибкой API.
+
+        Полуоткрытый автомат размыкается, как после ошибки: иначе он
+        пропускал бы все следующие запросы, не считая их пробными.
+        Уведомления при этом не нужно — о недоступности уже сообщено.
+        """
+        if self.state == HALF_OPEN:
+            self.record_failure()
@@ -0,0 +1,41 @@
+# Импорты из стандартных библиотек
+import importlib
+import json
+import os
+
+# Библиотеки в порядке предпочтения; json есть всегда.
+DECODERS = ("orjson", "ujson", "json")
+
+
+def _strict(loads):
+    """Приводит ошибки разбора к json.JSONDecodeError."""
+    def decode(data):
+        try:
+            return loads(data)
+        except json.JSONDecodeError:
+            raise
+        except ValueError as error:
+            raise json.JSONDecodeError(str(error), "", 0) from error
+
+    return decode
+
+
+def make_decoder(name=None):
+    """Функция decode(bytes) на первой доступной библиотеке JSON.
+
+    orjson и ujson разбирают байты ответа напрямую, без промежуточной
+    строки; stdlib json определяет кодировку сам. Ошибки разбора всегда
+    json.JSONDecodeError, поэтому их можно ловить как раньше.
+    """
+    for candidate in DECODERS if name is None else (name,):
+        try:
+            module = importlib.import_module(candidate)
+        except ImportError:
+            continue
+        decode = _strict(module.loads)
+        decode.backend = candidate
+        return decode
+    raise ImportError(f"Библиотека JSON {name} не установлена")
+
+
+decode = make_decoder(os.getenv("JSON_DECODER"))
@@ -0,0 +1,54 @@
+# Импорты из стандартных библиотек
+import re
+import time
+from collections import OrderedDict
+
+REPEAT_WINDOW = 3600
+MAX_FINGERPRINTS = 1024
+ERROR_MESSAGE = "Сбой в работе программы: {error}"
+SUMMARY_MESSAGE = "Сбой всё ещё повторяется ({count} раз): {error}"
+
+VARIABLE_PARTS = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def fingerprint(error):
+    """Тип исключения и сообщение без изменчивых чисел и адресов."""
+    return type(error).__name__, VARIABLE_PARTS.sub("N", str(error))
+
+
+class ErrorReporter:
+    """Решает, какие ошибки стоит отправлять в Telegram.
+
+    Первая ошибка с новым отпечатком отправляется сразу. Повторы
+    в пределах окна подавляются, а раз в окно уходит сводка с числом
+    повторов. Отпечатки хранятся в LRU ограниченного размера.
+    """
+
+    def __init__(self, window=REPEAT_WINDOW, max_fingerprints=MAX_FINGERPRINTS,
+                 clock=time.monotonic):
+        """Окно подавления в секундах и размер LRU отпечатков."""
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.clock = clock
+        self._seen = OrderedDict()
+
+    def __len__(self):
+        """Количество запомненных отпечатков."""
+        return len(self._seen)
+
+    def report(self, error, scope=None):
+        """Текст уведомления об ошибке или None, если его надо подавить."""
+        key = (scope, fingerprint(error))
+        now = self.clock()
+        entry = self._seen.get(key)
+        if entry is None:
+            self._seen[key] = [now, 1]
+            if len(self._seen) > self.max_fingerprints:
+                self._seen.popitem(last=False)
+            return ERROR_MESSAGE.format(error=error)
+        self._seen.move_to_end(key)
+        entry[1] += 1
+        if now - entry[0] < self.window:
+            return None
+        entry[0] = now
+        return SUMMARY_MESSAGE.format(count=entry[1], error=error)
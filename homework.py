@@ -2,6 +2,7 @@
 import json
 import logging
 import os
+import sqlite3
 import sys
 import time
 
@@ -10,8 +11,30 @@ import requests
 import telegram
 
 # Импорты модулей этого проекта
+import metrics
+from api_client import (
+    CONNECT_TIMEOUT, READ_TIMEOUT, PracticumClient, make_session
+)
+from breaker import CircuitBreaker
 from dotenv import load_dotenv
+from error_reporter import ErrorReporter
 from exceptions import ApiError, VarTypeError
+from logging_setup import BACKUP_COUNT, MAX_BYTES, SAMPLE_EVERY, setup_logging
+from messages import VERDICTS_EN, MessageRenderer
+from outbound import OutboundQueue
+from outbox import Outbox
+from recording import RecordingSession, ReplaySession
+from scheduler import AdaptiveInterval, Scheduler
+from state import PollState, StateCheckpoint, open_state_store
+from status_index import StatusIndex
+from tenants import (
+    DEFAULT_TENANT, Tenant, current_tenant, load_tenants, missing_fields
+)
+from tracing import BUFFER_SIZE, Tracer
+from validation import (
+    Homework, HomeworkColumns, compile_homework_parser,
+    compile_response_validator
+)
 
 
 load_dotenv()
@@ -19,29 +42,104 @@ load_dotenv()
 PRACTICUM_TOKEN = os.getenv("PRACTICUM_TOKEN")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+STATE_FILE = os.getenv("STATE_FILE")
+TENANTS_FILE = os.getenv("TENANTS_FILE")
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+SCHEDULE_JITTER = float(os.getenv("SCHEDULE_JITTER", "0"))
+OUTBOX_FILE = os.getenv("OUTBOX_FILE")
+STREAM_RESPONSES = bool(os.getenv("STREAM_RESPONSES"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+TRACE_FILE = os.getenv("TRACE_FILE")
+TRACE_BUFFER = int(os.getenv("TRACE_BUFFER", BUFFER_SIZE))
+LOG_FILE = os.getenv("LOG_FILE")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+LOG_JSON = bool(os.getenv("LOG_JSON"))
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", MAX_BYTES))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", BACKUP_COUNT))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN")
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", SAMPLE_EVERY))
+MESSAGE_LOCALE = os.getenv("MESSAGE_LOCALE", "ru")
+ALLOW_UNKNOWN_STATUSES = bool(os.getenv("ALLOW_UNKNOWN_STATUSES"))
+RECORD_FILE = os.getenv("RECORD_FILE")
+REPLAY_FILE = os.getenv("REPLAY_FILE")
+REPLAY_SPEED = float(os.getenv("REPLAY_SPEED", "1"))
+DEFAULT_STATE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "poll_state.json"
+)
+DEFAULT_OUTBOX_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "outbox.sqlite"
+)
 
 RETRY_PERIOD = 600
 ENDPOINT = "https://practicum.yandex.ru/api/user_api/homework_statuses/"
 HEADERS = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
+API_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+MESSAGE_LIMIT = 4096
+API_DEGRADED_MESSAGE = "API домашки недоступно, опрос приостановлен: {error}"
+API_RECOVERED_MESSAGE = "API домашки снова доступно, опрос возобновлён."
 HOMEWORK_VERDICTS = {
     "approved": "Работа проверена: ревьюеру всё понравилось. Ура!",
     "reviewing": "Работа взята на проверку ревьюером.",
     "rejected": "Работа проверена: у ревьюера есть замечания.",
 }
 
+# Без ALLOW_UNKNOWN_STATUSES работа с новым статусом отклоняется,
+# с ним — принимается и получает общий текст «Новый статус».
+KNOWN_STATUSES = None if ALLOW_UNKNOWN_STATUSES else HOMEWORK_VERDICTS
+parse_homework = compile_homework_parser(KNOWN_STATUSES)
+validate_response = compile_response_validator(KNOWN_STATUSES)
+renderer = MessageRenderer(
+    {"ru": HOMEWORK_VERDICTS, "en": VERDICTS_EN},
+    allow_unknown=ALLOW_UNKNOWN_STATUSES,
+)
+
+
+# Клиент с пулом соединений; подключается при запуске воркера.
+api_client = None
+error_reporter = ErrorReporter()
+# Очередь отправки в Telegram; подключается при запуске воркера.
+outbound = None
 
 logger = logging.getLogger(__name__)
-logger.addHandler(logging.StreamHandler(sys.stdout))
+
+
+def configure_logging(path=LOG_FILE, level=None):
+    """Логирование в фоновом потоке по настройкам окружения."""
+    return setup_logging(
+        path,
+        level or LOG_LEVEL,
+        json_lines=LOG_JSON,
+        max_bytes=LOG_MAX_BYTES,
+        backup_count=LOG_BACKUP_COUNT,
+        when=LOG_ROTATE_WHEN,
+        sample_every=LOG_SAMPLE_EVERY,
+    )
+
+
+def get_tenants():
+    """Тенанты из реестра или единственный тенант из окружения."""
+    if TENANTS_FILE:
+        return load_tenants(TENANTS_FILE, RETRY_PERIOD)
+    return [
+        Tenant(DEFAULT_TENANT, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID, RETRY_PERIOD)
+    ]
 
 
 def check_tokens():
     """Проверка наличия переменных."""
-    required_variables = [
-        "PRACTICUM_TOKEN", "TELEGRAM_TOKEN", "TELEGRAM_CHAT_ID"
-    ]
+    required_variables = ["TELEGRAM_TOKEN"]
+    if not TENANTS_FILE:
+        required_variables += ["PRACTICUM_TOKEN", "TELEGRAM_CHAT_ID"]
     missing_variables = [
         var_name for var_name in required_variables if not globals()[var_name]
     ]
+    if TENANTS_FILE:
+        try:
+            for tenant in get_tenants():
+                missing_variables += missing_fields(tenant)
+        except (OSError, ValueError) as error:
+            logger.critical(f"Не удалось загрузить реестр тенантов: {error}")
+            return ["TENANTS_FILE"]
     if missing_variables:
         logger.critical(
             f"Отсутствуют переменные окружения: {', '.join(missing_variables)}"
@@ -49,92 +147,392 @@ def check_tokens():
     return missing_variables
 
 
+def current_chat_id():
+    """Чат текущего тенанта."""
+    tenant = current_tenant.get()
+    return TELEGRAM_CHAT_ID if tenant is None else tenant.chat_id
+
+
 def send_message(bot, message):
     """Отправляет сообщение в Telegram."""
+    chat_id = current_chat_id()
+    if outbound is not None:
+        outbound.put(chat_id, message)
+        return True
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        with metrics.SEND_LATENCY.time():
+            bot.send_message(chat_id=chat_id, text=message)
     except telegram.error.TelegramError as e:
         logger.error(f"Ошибка при отправке сообщения в Telegram: {e}")
-    else:
-        logger.debug("Сообщение успешно отправлено в Telegram")
+        metrics.MESSAGES_FAILED.inc()
+        return False
+    logger.debug("Сообщение успешно отправлено в Telegram")
+    metrics.MESSAGES_SENT.inc()
+    return True
+
+
+def current_locale():
+    """Язык уведомлений текущего тенанта."""
+    tenant = current_tenant.get()
+    if tenant is None or not tenant.locale:
+        return MESSAGE_LOCALE
+    return tenant.locale
+
+
+def render_message(change):
+    """Текст уведомления об изменении статуса работы."""
+    return renderer.render(change.name, change.status, current_locale())
+
+
+def current_headers():
+    """Заголовки запроса к API домашки для текущего тенанта."""
+    tenant = current_tenant.get()
+    return HEADERS if tenant is None else tenant.headers
 
 
 def get_api_answer(timestamp):
     """Получение апи ответа."""
-    try:
-        response = requests.get(
-            ENDPOINT, headers=HEADERS, params={"from_date": timestamp}
-        )
-        if response.status_code != 200:
-            raise ApiError(f"Неуспешный код состояния: {response.status_code}")
-        return response.json()
-    except json.JSONDecodeError as value_error:
-        raise ValueError(f"Ошибка парсинга JSON: {value_error}")
-    except requests.RequestException as request_exception:
-        raise ApiError(f"Ошибка запроса к API: {request_exception}")
+    headers = current_headers()
+    with metrics.API_LATENCY.time():
+        if api_client is not None:
+            return api_client.get_api_answer(timestamp, headers)
+        try:
+            response = requests.get(
+                ENDPOINT,
+                headers=headers,
+                params={"from_date": timestamp},
+                timeout=API_TIMEOUT,
+            )
+            if response.status_code != 200:
+                raise ApiError(
+                    f"Неуспешный код состояния: {response.status_code}"
+                )
+            with metrics.DECODE_TIME.time():
+                return response.json()
+        except json.JSONDecodeError as value_error:
+            raise ValueError(f"Ошибка парсинга JSON: {value_error}")
+        except requests.RequestException as request_exception:
+            raise ApiError(f"Ошибка запроса к API: {request_exception}")
 
 
 def check_response(response):
-    """Проверка ответа."""
-    if not isinstance(response, dict):
-        raise TypeError("response должен быть типа dict")
+    """Проверка ответа.
 
-    if "homeworks" not in response:
-        raise KeyError("Нет такого ключа как homeworks")
+    Возвращает CheckedResponse с работами, разобранными в Homework.
+    """
+    return validate_response(response)
 
-    if not isinstance(response.get("homeworks"), list):
-        raise TypeError("Данные homeworks должны быть типа list")
 
-    if "current_date" not in response:
-        raise VarTypeError("Отсутствует ключ 'current_date'")
+def parse_status(homework):
+    """Парсинг статусов работ."""
+    return render_message(parse_homework(homework))
 
-    if not isinstance(response.get("current_date"), int):
-        raise VarTypeError("Данные current_date должны быть типа int")
 
+def parse_records(homeworks):
+    """Записи Homework; некорректные работы пропускаются с ошибкой в логе.
 
-def parse_status(homework):
-    """Парсинг статусов работ."""
-    status = homework.get("status")
-    homework_name = homework.get("homework_name")
+    Работы — записи из check_response или словари ответа API.
+    """
+    for homework in homeworks:
+        if type(homework) is not Homework:
+            try:
+                homework = parse_homework(homework)
+            except ValueError as error:
+                logger.error(f"Пропущена работа {homework}: {error}")
+                continue
+        yield homework
+
+
+def parse_statuses(homeworks, known_statuses=None):
+    """Работы, статус которых изменился, в виде записей Homework.
+
+    known_statuses — StatusIndex из состояния опроса или словарь статусов.
+    """
+    if not isinstance(known_statuses, StatusIndex):
+        known_statuses = StatusIndex(known_statuses)
+    if isinstance(homeworks, HomeworkColumns) and homeworks.distinct():
+        # Работы с прежним статусом отсеиваются до создания записей.
+        homeworks = homeworks.select(
+            known_statuses.changed(homeworks.keys, homeworks.statuses)
+        )
+    return known_statuses.diff(parse_records(homeworks))
+
+
+def delivery_key(chat_id, change):
+    """Ключ идемпотентности уведомления об изменении статуса.
+
+    Не зависит от курсора, поэтому повторный опрос после сбоя
+    не создаёт второго уведомления о том же изменении. Без date_updated
+    ключа нет: иначе все возвраты работы к тому же статусу считались бы
+    одним изменением, и уведомления о них терялись бы.
+    """
+    if change.updated is None:
+        return None
+    return f"{chat_id}:{change.key}:{change.status}:{change.updated}"
+
+
+def batch_changes(changes, limit=MESSAGE_LIMIT):
+    """Группирует изменения в сообщения не длиннее лимита Telegram.
 
-    if status in HOMEWORK_VERDICTS and homework_name:
-        verdict = HOMEWORK_VERDICTS[status]
-        return f'Изменился статус проверки работы "{homework_name}". {verdict}'
-    raise ValueError("Проблема со значением переменной 'status'")
+    Пачка — список пар (изменение, текст уведомления).
+    """
+    batch, length = [], 0
+    for change in changes:
+        message = render_message(change)
+        size = len(message) + 2
+        if batch and length + size > limit:
+            yield batch
+            batch, length = [], 0
+        batch.append((change, message))
+        length += size
+    if batch:
+        yield batch
+
+
+def log_change(change):
+    """Запись об отправленном статусе с ключом работы для JSON-лога."""
+    logger.debug(
+        f"Отправлен статус работы {change.name}: {change.status}",
+        extra={"homework": change.key},
+    )
+
+
+def notify_statuses(bot, poll_state, homeworks):
+    """Отправляет изменившиеся статусы работ одним сообщением.
+
+    Работы обрабатываются по мере поступления, поэтому сюда можно
+    передать и потоковый ответ API.
+    """
+    changes = parse_statuses(homeworks, poll_state.statuses)
+    notified = dropped = 0
+    if outbound is not None:
+        # Очередь сама склеивает сообщения чата, а outbox отсеивает
+        # повторы по ключу.
+        chat_id = current_chat_id()
+        for change in changes:
+            outbound.put(
+                chat_id, render_message(change),
+                key=delivery_key(chat_id, change),
+            )
+            poll_state.statuses.record(
+                change.key, change.status, change.updated
+            )
+            log_change(change)
+            notified += 1
+    else:
+        for batch in batch_changes(changes):
+            message = "\n\n".join(message for _, message in batch)
+            if not send_message(bot, message):
+                # Статусы не записываются: при повторном ответе API
+                # с этими работами они будут отправлены снова.
+                dropped += len(batch)
+                keys = ", ".join(change.key for change, _ in batch)
+                logger.error(
+                    f"Не отправлены статусы работ ({len(batch)}): {keys}"
+                )
+                continue
+            for change, _ in batch:
+                poll_state.statuses.record(
+                    change.key, change.status, change.updated
+                )
+                log_change(change)
+            notified += len(batch)
+    if not notified and not dropped:
+        logger.debug("Статусы работ в ответе API уже были отправлены.")
+
+
+def poll_updates(bot, poll_state):
+    """Один цикл опроса: запрос к API, проверка и отправка статусов.
+
+    Возвращает число работ в ответе API.
+    """
+    if STREAM_RESPONSES and api_client is not None:
+        return poll_stream(bot, poll_state)
+    return handle_response(bot, poll_state, get_api_answer(
+        poll_state.timestamp
+    ))
+
+
+def handle_response(bot, poll_state, response):
+    """Проверка ответа API и отправка изменившихся статусов.
+
+    Общая для синхронного и асинхронного воркеров часть опроса;
+    response None — ответ 304. Возвращает число работ в ответе API.
+    """
+    if response is None:
+        # 304: прежний ответ актуален на момент запроса.
+        poll_state.current_date = int(time.time())
+        logger.debug("Ответ API не изменился с прошлого опроса.")
+        return 0
+    checked = check_response(response)
+    poll_state.current_date = checked.current_date
+    metrics.HOMEWORKS_PARSED.inc(amount=len(checked.homeworks))
+    poll_state.advance(response)
+    updates = response["homeworks"]
+    if not updates:
+        logger.debug("Нет новых статусов в ответе API.")
+        return 0
+    for homework, error in checked.rejected:
+        logger.error(f"Пропущена работа {homework}: {error}")
+    notify_statuses(bot, poll_state, checked.homeworks)
+    return len(updates)
+
+
+def poll_stream(bot, poll_state):
+    """Цикл опроса с потоковым разбором ответа API.
+
+    Работы уходят в рассылку по мере чтения ответа, не накапливаясь
+    в памяти; курсор сдвигается, только когда ответ дочитан и
+    current_date проверен.
+    """
+    stream = api_client.stream_api_answer(
+        poll_state.timestamp, current_headers()
+    )
+    if stream is None:
+        poll_state.current_date = int(time.time())
+        logger.debug("Ответ API не изменился с прошлого опроса.")
+        return 0
+    notify_statuses(bot, poll_state, stream)
+    poll_state.current_date = stream.current_date
+    metrics.HOMEWORKS_PARSED.inc(amount=stream.count)
+    if stream.count:
+        poll_state.timestamp = stream.current_date
+    else:
+        logger.debug("Нет новых статусов в ответе API.")
+    return stream.count
+
+
+def poll_allowed(tenant, breaker):
+    """Пропускает ли автомат защиты опрос тенанта; считает опросы."""
+    if not breaker.allow():
+        logger.debug(f"API недоступно, опрос {tenant.name} пропущен.")
+        return False
+    metrics.POLLS.inc(tenant.name)
+    return True
+
+
+def poll_succeeded(tenant, poll_state, breaker):
+    """Учитывает успешный опрос; сообщение о восстановлении API или None."""
+    if poll_state.current_date is not None:
+        metrics.CURSOR_LAG.set(
+            time.time() - poll_state.current_date, tenant.name
+        )
+    if breaker.record_success():
+        return API_RECOVERED_MESSAGE
+    return None
+
+
+def poll_failed(error, tenant, breaker, reporter):
+    """Учитывает ошибку опроса; сообщение для тенанта или None.
+
+    Об ошибках API сообщается один раз, когда размыкается автомат,
+    об остальных — по правилам reporter. Ошибка не API во время пробного
+    запроса снова размыкает полуоткрытый автомат.
+    """
+    metrics.API_ERRORS.inc(type(error).__name__)
+    if isinstance(error, ApiError):
+        logger.error(f"Сбой в работе программы: {error}")
+        if breaker.record_failure():
+            return API_DEGRADED_MESSAGE.format(error=error)
+        return None
+    breaker.release_probe()
+    if isinstance(error, VarTypeError):
+        logger.error(f"Ошибка: {error} ")
+        return None
+    logger.error(f"Сбой в работе программы: {error}")
+    return reporter.report(error, tenant.name)
+
+
+def poll_tenant(bot, tenant, poll_state, state_store, breaker):
+    """Цикл опроса одного тенанта; при ошибке возвращает None."""
+    if not poll_allowed(tenant, breaker):
+        return None
+    context_token = current_tenant.set(tenant)
+    activity = None
+    try:
+        try:
+            updates = poll_updates(bot, poll_state)
+            state_store.save(tenant.name, poll_state)
+            message = poll_succeeded(tenant, poll_state, breaker)
+            activity = updates
+        except Exception as error:
+            message = poll_failed(error, tenant, breaker, error_reporter)
+        if message:
+            send_message(bot, message)
+        return activity
+    finally:
+        current_tenant.reset(context_token)
 
 
 def main():
     """Основная логика работы бота."""
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    timestamp = int(time.time())
     if check_tokens():
         sys.exit(1)
+    if outbound is not None:
+        outbound.start(bot)
+    tenants = get_tenants()
+    state_store = open_state_store(STATE_FILE)
+    started = int(time.time())
+    runtimes = {
+        tenant.name: (
+            tenant,
+            state_store.load(tenant.name) or PollState(started),
+            AdaptiveInterval(tenant.poll_interval),
+            CircuitBreaker(tenant.name),
+        )
+        for tenant in tenants
+    }
+    checkpoint = StateCheckpoint(state_store)
+    # При воспроизведении архива расписание идёт в темпе REPLAY_SPEED.
+    scheduler = Scheduler(
+        jitter=SCHEDULE_JITTER, speed=REPLAY_SPEED if REPLAY_FILE else 1
+    )
+    for tenant in tenants:
+        scheduler.add(tenant.name, tenant.poll_interval)
     while True:
         try:
-            response = get_api_answer(timestamp)
-            check_response(response)
-            updates = response.get("homeworks")
-            if updates:
-                status = parse_status(updates[0])
-                send_message(bot, f"{status}")
-            else:
-                logger.debug("Нет новых статусов в ответе API.")
-        except VarTypeError as err:
-            logger.error(f"Ошибка: {err} ")
-        except Exception as error:
-            logger.error(f"Сбой в работе программы: {error}")
-            send_message(bot, f"Сбой в работе программы: {error}")
+            for name in scheduler.pop_due():
+                tenant, poll_state, interval, breaker = runtimes[name]
+                activity = poll_tenant(
+                    bot, tenant, poll_state, checkpoint, breaker
+                )
+                scheduler.set_interval(
+                    name, interval.update(activity, poll_state.reviewing)
+                )
+            if scheduler.lag:
+                logger.debug(
+                    f"Отставание от расписания: {scheduler.lag:.3f} с"
+                )
         finally:
-            time.sleep(RETRY_PERIOD)
+            try:
+                checkpoint.flush()
+            except (OSError, sqlite3.Error) as error:
+                logger.error(f"Не удалось сохранить состояние опроса: {error}")
+            delay = scheduler.delay()
+            time.sleep(delay)
 
 
 if __name__ == "__main__":
     script_path = os.path.abspath(__file__)
-    log_filename = os.path.join(os.path.dirname(script_path), "program.log")
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s: %(levelname)s - %(funcName)s - %(message)s",
-        filename=log_filename,
-        filemode="w",
+    configure_logging(
+        LOG_FILE
+        or os.path.join(os.path.dirname(script_path), "program.log")
     )
+    STATE_FILE = STATE_FILE or DEFAULT_STATE_FILE
+    if METRICS_PORT:
+        metrics.start_server(METRICS_PORT)
+    if TRACE_FILE:
+        tracer = Tracer(TRACE_BUFFER)
+        tracer.install(sys.modules[__name__])
+        tracer.dump_on_signal(TRACE_FILE)
+    session = make_session(pool_size=HTTP_POOL_SIZE)
+    if REPLAY_FILE:
+        session = ReplaySession(REPLAY_FILE, REPLAY_SPEED)
+    elif RECORD_FILE:
+        session = RecordingSession(session, RECORD_FILE)
+    api_client = PracticumClient(ENDPOINT, HEADERS, session=session)
+    outbox = Outbox(OUTBOX_FILE or DEFAULT_OUTBOX_FILE)
+    outbox.purge()
+    outbound = OutboundQueue(outbox=outbox)
     main()
@@ -0,0 +1,139 @@
+# Импорты из стандартных библиотек
+import atexit
+import itertools
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
+
+# Импорты модулей этого проекта
+from tenants import current_tenant
+
+LOG_FORMAT = "%(asctime)s: %(levelname)s - %(funcName)s - %(message)s"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+SAMPLE_EVERY = 10
+# Сообщения, которые пишет каждый пустой опрос.
+SAMPLED_MESSAGES = (
+    "Нет новых статусов в ответе API.",
+    "Ответ API не изменился с прошлого опроса.",
+)
+
+
+class ContextFilter(logging.Filter):
+    """Добавляет в запись тенанта, пока она ещё в потоке опроса."""
+
+    def filter(self, record):
+        """Запись всегда пропускается."""
+        if not hasattr(record, "tenant"):
+            tenant = current_tenant.get()
+            record.tenant = None if tenant is None else tenant.name
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает одну из every записей с шумными сообщениями.
+
+    Первая запись проходит всегда, остальные — каждая every-я; прочие
+    сообщения не прореживаются.
+    """
+
+    def __init__(self, messages=SAMPLED_MESSAGES, every=SAMPLE_EVERY,
+                 level=logging.DEBUG):
+        """Сообщения, частота и уровень, выше которого всё проходит."""
+        super().__init__()
+        self.every = every
+        self.level = level
+        self._counters = {
+            message: itertools.count() for message in messages
+        }
+
+    def filter(self, record):
+        """Решает, попадёт ли запись в лог."""
+        if record.levelno > self.level:
+            return True
+        counter = self._counters.get(record.msg)
+        return counter is None or next(counter) % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON с полями тенанта и работы."""
+
+    def format(self, record):
+        """Строка JSON для записи."""
+        data = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "func": record.funcName,
+            "message": record.getMessage(),
+            "tenant": getattr(record, "tenant", None),
+        }
+        homework = getattr(record, "homework", None)
+        if homework is not None:
+            data["homework"] = homework
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class LogListener(QueueListener):
+    """QueueListener, который можно остановить повторно."""
+
+    def stop(self):
+        """Дописывает очередь и останавливает поток записи."""
+        if self._thread is not None:
+            super().stop()
+
+
+def make_file_handler(path, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+                      when=None):
+    """Файловый обработчик с ротацией по размеру или по времени."""
+    if when:
+        return TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding="utf-8",
+            delay=True,
+        )
+    return RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8",
+        delay=True,
+    )
+
+
+def setup_logging(path=None, level=logging.DEBUG, json_lines=False,
+                  max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT, when=None,
+                  sample_every=SAMPLE_EVERY, stream=sys.stdout):
+    """Настраивает логирование с записью в фоновом потоке.
+
+    Корневой логгер получает QueueHandler: поток опроса только кладёт
+    запись в очередь, а в файл и stdout её пишет QueueListener. Тенант
+    добавляется к записи и шумные сообщения прореживаются ещё до
+    очереди. Возвращает запущенный QueueListener; при выходе из
+    процесса он дописывает очередь.
+    """
+    formatter = JsonFormatter() if json_lines else logging.Formatter(
+        LOG_FORMAT
+    )
+    handlers = [logging.StreamHandler(stream)]
+    if path:
+        handlers.append(make_file_handler(path, max_bytes, backup_count, when))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    if sample_every > 1:
+        queue_handler.addFilter(SamplingFilter(every=sample_every))
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    listener = LogListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
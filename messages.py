@@ -0,0 +1,97 @@
+# Импорты из стандартных библиотек
+from functools import lru_cache
+
+DEFAULT_LOCALE = "ru"
+CACHE_SIZE = 4096
+
+STATUS_TEMPLATES = {
+    "ru": 'Изменился статус проверки работы "{name}". {verdict}',
+    "en": 'The review status of "{name}" has changed. {verdict}',
+}
+UNKNOWN_VERDICTS = {
+    "ru": "Новый статус: {status}.",
+    "en": "New status: {status}.",
+}
+VERDICTS_EN = {
+    "approved": "The reviewer liked everything. Hooray!",
+    "reviewing": "The reviewer has started checking the work.",
+    "rejected": "The reviewer has left some comments.",
+}
+
+# Метка на месте названия работы при компиляции шаблона.
+NAME_MARK = "\0"
+
+
+def compile_template(template, verdict):
+    """Части сообщения до и после названия работы."""
+    prefix, suffix = template.format(
+        name=NAME_MARK, verdict=verdict
+    ).split(NAME_MARK)
+    return prefix, suffix
+
+
+class MessageRenderer:
+    """Тексты уведомлений о статусах работ на нескольких языках.
+
+    Шаблоны компилируются один раз на пару (язык, статус): остаётся
+    склеить две готовые части с названием работы. Готовые сообщения
+    хранятся в LRU на cache_size записей по ключу (название, статус,
+    язык); cache_size=0 отключает кэш. Неизвестный статус вызывает
+    ValueError, если не включён allow_unknown.
+    """
+
+    def __init__(self, verdicts, templates=STATUS_TEMPLATES,
+                 unknown_verdicts=UNKNOWN_VERDICTS, allow_unknown=False,
+                 cache_size=CACHE_SIZE):
+        """Вердикты и шаблоны по языкам, политика статусов и размер LRU."""
+        self.templates = templates
+        self.unknown_verdicts = unknown_verdicts
+        self.allow_unknown = allow_unknown
+        self._parts = {
+            locale: {
+                status: compile_template(templates[locale], verdict)
+                for status, verdict in locale_verdicts.items()
+            }
+            for locale, locale_verdicts in verdicts.items()
+        }
+        self.render = self._compile_render()
+        if cache_size:
+            # lru_cache написан на C и потокобезопасен: попадание в кэш
+            # обходится без байткода.
+            self.render = lru_cache(maxsize=cache_size)(self.render)
+
+    def __len__(self):
+        """Количество сообщений в кэше."""
+        cache_info = getattr(self.render, "cache_info", None)
+        return 0 if cache_info is None else cache_info().currsize
+
+    def _compile_render(self):
+        """Функция сборки сообщения без поиска атрибутов на каждый вызов."""
+        parts = self._parts
+        template = self._template
+
+        def render(name, status, locale=DEFAULT_LOCALE):
+            """Сообщение об изменении статуса работы."""
+            try:
+                prefix, suffix = parts[locale][status]
+            except KeyError:
+                prefix, suffix = template(status, locale)
+            return prefix + name + suffix
+
+        return render
+
+    def _template(self, status, locale):
+        """Шаблон для языка по умолчанию или нового статуса."""
+        if locale not in self.templates:
+            locale = DEFAULT_LOCALE
+            parts = self._parts.get(locale, {}).get(status)
+            if parts is not None:
+                return parts
+        if not self.allow_unknown or not isinstance(status, str):
+            raise ValueError("Проблема со значением переменной 'status'")
+        parts = compile_template(
+            self.templates[locale],
+            self.unknown_verdicts[locale].format(status=status),
+        )
+        self._parts.setdefault(locale, {})[status] = parts
+        return parts
@@ -0,0 +1,247 @@
+# Импорты из стандартных библиотек
+import logging
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Импорты модулей этого проекта
+import breaker
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+# Метрики процесса по именам в порядке объявления.
+metrics = {}
+
+
+def format_labels(names, values, extra=()):
+    """Метки сэмпла в формате Prometheus."""
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"')
+         .replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric:
+    """Метрика с метками; значения хранятся по кортежу значений меток."""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labels=()):
+        """Имя, описание для HELP и имена меток."""
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        metrics[name] = self
+
+    def samples(self):
+        """Сэмплы метрики: (суффикс имени, метки, значение)."""
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield "", format_labels(self.labels, label_values), value
+
+    def clear(self):
+        """Сбрасывает все значения."""
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """Монотонный счётчик."""
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount=1):
+        """Увеличивает счётчик с данными значениями меток."""
+        with self._lock:
+            self._values[label_values] = (
+                self._values.get(label_values, 0) + amount
+            )
+
+
+class Gauge(Metric):
+    """Текущее значение величины."""
+
+    kind = "gauge"
+
+    def set(self, value, *label_values):
+        """Задаёт значение с данными значениями меток."""
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(Metric):
+    """Распределение длительностей по корзинам."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(),
+                 buckets=LATENCY_BUCKETS):
+        """Как у Metric, плюс верхние границы корзин в секундах."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        """Учитывает одно наблюдение."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [
+                    [0] * (len(self.buckets) + 1), 0.0
+                ]
+            state[0][index] += 1
+            state[1] += value
+
+    def time(self, *label_values):
+        """Контекстный менеджер, измеряющий длительность блока."""
+        return Timer(self, label_values)
+
+    def samples(self):
+        """Накопленные корзины, сумма и количество наблюдений."""
+        with self._lock:
+            values = [
+                (label_values, list(counts), total)
+                for label_values, (counts, total) in self._values.items()
+            ]
+        bounds = [*map(repr, self.buckets), "+Inf"]
+        for label_values, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield "_bucket", format_labels(
+                    self.labels, label_values, (("le", bound),)
+                ), cumulative
+            labels = format_labels(self.labels, label_values)
+            yield "_sum", labels, total
+            yield "_count", labels, cumulative
+
+
+class Timer:
+    """Измеряет длительность блока with в гистограмму."""
+
+    __slots__ = ("histogram", "label_values", "started")
+
+    def __init__(self, histogram, label_values):
+        """Гистограмма и значения меток наблюдения."""
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        """Засекает начало блока."""
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Записывает длительность блока, даже если он упал."""
+        self.histogram.observe(
+            time.perf_counter() - self.started, *self.label_values
+        )
+
+
+POLLS = Counter(
+    "homework_polls_total", "Опросы API домашки.", ("tenant",)
+)
+API_ERRORS = Counter(
+    "homework_api_errors_total", "Ошибки цикла опроса по типам.", ("type",)
+)
+HOMEWORKS_PARSED = Counter(
+    "homework_homeworks_parsed_total", "Работы, прошедшие проверку ответа."
+)
+MESSAGES_SENT = Counter(
+    "homework_messages_sent_total", "Сообщения, отправленные в Telegram."
+)
+MESSAGES_FAILED = Counter(
+    "homework_messages_failed_total", "Сообщения, не отправленные в Telegram."
+)
+API_LATENCY = Histogram(
+    "homework_api_request_seconds", "Длительность get_api_answer."
+)
+DECODE_TIME = Histogram(
+    "homework_json_decode_seconds", "Разбор JSON ответа API.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+SEND_LATENCY = Histogram(
+    "homework_telegram_send_seconds", "Отправка сообщения в Telegram."
+)
+CURSOR_LAG = Gauge(
+    "homework_cursor_lag_seconds",
+    "Текущее время минус current_date последнего успешного ответа API.",
+    ("tenant",),
+)
+
+
+def breaker_lines():
+    """Переходы и состояния автоматов защиты из модуля breaker."""
+    yield "# HELP homework_breaker_transitions_total Переходы автоматов."
+    yield "# TYPE homework_breaker_transitions_total counter"
+    for (name, source, target), count in list(breaker.transitions.items()):
+        labels = format_labels(
+            ("name", "from", "to"), (name, source, target)
+        )
+        yield f"homework_breaker_transitions_total{labels} {count}"
+    yield "# HELP homework_breakers Автоматы в каждом состоянии."
+    yield "# TYPE homework_breakers gauge"
+    counts = breaker.state_counts()
+    for state in (breaker.CLOSED, breaker.OPEN, breaker.HALF_OPEN):
+        labels = format_labels(("state",), (state,))
+        yield f"homework_breakers{labels} {counts.get(state, 0)}"
+
+
+def render():
+    """Все метрики процесса в текстовом формате Prometheus."""
+    lines = []
+    for metric in list(metrics.values()):
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(
+            f"{metric.name}{suffix}{labels} {value}"
+            for suffix, labels, value in metric.samples()
+        )
+    lines.extend(breaker_lines())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт /metrics; остальные пути — 404."""
+
+    def do_GET(self):
+        """Ответ на запрос метрик."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Запросы метрик не пишутся в лог."""
+
+
+def start_server(port, host="127.0.0.1"):
+    """Запускает HTTP-сервер метрик в фоновом потоке."""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics", daemon=True
+    )
+    thread.start()
+    host, port = server.server_address[:2]
+    logger.info(f"Метрики доступны на http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,232 @@
+# Импорты из стандартных библиотек
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Импорты сторонних библиотек
+import telegram
+
+# Импорты модулей этого проекта
+import metrics
+
+GLOBAL_RATE = 30
+CHAT_RATE = 1
+NETWORK_RETRY_DELAY = 5
+MAX_RETRY_DELAY = 300
+MESSAGE_LIMIT = 4096
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Ограничитель частоты: rate токенов в секунду, не больше capacity."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """Скорость пополнения и ёмкость корзины."""
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def delay(self):
+        """Сколько секунд ждать до появления токена."""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Забирает токен; заранее проверьте delay()."""
+        self._refill()
+        self.tokens -= 1
+
+
+def merge_texts(texts, limit=MESSAGE_LIMIT):
+    """Склеивает первые сообщения очереди чата в одно в пределах лимита."""
+    merged = [texts.pop(0)]
+    length = len(merged[0])
+    while texts and length + len(texts[0]) + 2 <= limit:
+        length += len(texts[0]) + 2
+        merged.append(texts.pop(0))
+    return "\n\n".join(merged)
+
+
+def merge_entries(entries, limit=MESSAGE_LIMIT):
+    """Как merge_texts, но для пар (id сообщений в outbox, текст)."""
+    texts = [text for _, text in entries]
+    text = merge_texts(texts, limit)
+    count = len(entries) - len(texts)
+    ids = tuple(
+        message_id for batch_ids, _ in entries[:count]
+        for message_id in batch_ids
+    )
+    del entries[:count]
+    return ids, text
+
+
+class OutboundQueue:
+    """Очередь исходящих сообщений с отдельным потоком отправки.
+
+    put() не блокирует цикл опроса. Поток отправки склеивает сообщения
+    одного чата, соблюдает общий и початовый лимиты Telegram, а при
+    RetryAfter и сетевых ошибках откладывает чат с экспоненциальной
+    паузой, не теряя сообщений и не нарушая их порядок.
+
+    С outbox сообщение сначала записывается на диск и помечается
+    доставленным после отправки; недоставленное при перезапуске
+    возвращается в очередь.
+    """
+
+    def __init__(self, global_rate=GLOBAL_RATE, chat_rate=CHAT_RATE,
+                 clock=time.monotonic, outbox=None):
+        """Общий и початовый лимиты в сообщениях в секунду."""
+        self.bot = None
+        self.clock = clock
+        self.chat_interval = 1 / chat_rate
+        self.bucket = TokenBucket(global_rate, clock=clock)
+        self.outbox = outbox
+        self._pending = OrderedDict()
+        self._not_before = {}
+        self._failures = {}
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        if outbox is not None:
+            for message_id, chat_id, text in outbox.pending():
+                self._pending.setdefault(chat_id, []).append(
+                    ((message_id,), text)
+                )
+
+    def put(self, chat_id, text, key=None):
+        """Ставит сообщение в очередь чата.
+
+        key — ключ идемпотентности: повторное сообщение с тем же ключом
+        в outbox не попадёт. Возвращает False для такого повтора.
+        """
+        ids = ()
+        if self.outbox is not None:
+            key = key or uuid.uuid4().hex
+            message_id = self.outbox.add(chat_id, text, key)
+            if message_id is None:
+                return False
+            ids = (message_id,)
+        with self._condition:
+            self._pending.setdefault(str(chat_id), []).append((ids, text))
+            self._condition.notify()
+        return True
+
+    def __len__(self):
+        """Количество сообщений в очереди."""
+        with self._condition:
+            return sum(len(entries) for entries in self._pending.values())
+
+    def start(self, bot):
+        """Запускает поток отправки."""
+        self.bot = bot
+        self._thread = threading.Thread(
+            target=self._run, name="telegram-outbound", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Дожидается отправки очереди и останавливает поток.
+
+        Очередь, которую не запускали, просто помечается остановленной.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _next_chat(self):
+        """Готовый к отправке чат или время ожидания до него."""
+        now = self.clock()
+        wait = None
+        for chat_id in self._pending:
+            remaining = self._not_before.get(chat_id, 0.0) - now
+            if remaining <= 0:
+                return chat_id, None
+            wait = remaining if wait is None else min(wait, remaining)
+        return None, wait
+
+    def _take_batch(self):
+        """Ждёт готовый чат и забирает его склеенное сообщение."""
+        with self._condition:
+            while True:
+                if self._stopping and not self._pending:
+                    return None, None
+                chat_id, wait = self._next_chat()
+                if chat_id is not None:
+                    entries = self._pending[chat_id]
+                    ids, text = merge_entries(entries)
+                    if not entries:
+                        del self._pending[chat_id]
+                    return chat_id, (ids, text)
+                self._condition.wait(wait)
+
+    def _defer(self, chat_id, batch, delay):
+        """Возвращает сообщение в начало очереди чата и откладывает чат."""
+        with self._condition:
+            # Склеенный текст возвращается одной записью; в outbox
+            # остаются исходные сообщения, и после перезапуска
+            # они склеятся заново.
+            self._pending.setdefault(chat_id, []).insert(0, batch)
+            self._pending.move_to_end(chat_id, last=False)
+            self._not_before[chat_id] = self.clock() + delay
+
+    def _retry_delay(self, chat_id):
+        """Экспоненциальная пауза перед повтором для чата."""
+        failures = self._failures.get(chat_id, 0)
+        self._failures[chat_id] = failures + 1
+        return min(NETWORK_RETRY_DELAY * 2 ** failures, MAX_RETRY_DELAY)
+
+    def _delivered(self, chat_id, ids):
+        self._failures.pop(chat_id, None)
+        if ids:
+            self.outbox.mark_delivered(ids)
+
+    def _run(self):
+        while True:
+            chat_id, batch = self._take_batch()
+            if chat_id is None:
+                return
+            delay = self.bucket.delay()
+            if delay:
+                time.sleep(delay)
+            self.bucket.take()
+            self._send(chat_id, batch)
+
+    def _send(self, chat_id, batch):
+        ids, text = batch
+        try:
+            with metrics.SEND_LATENCY.time():
+                self.bot.send_message(chat_id=chat_id, text=text)
+        except telegram.error.RetryAfter as error:
+            logger.warning(f"Telegram просит подождать {error.retry_after} с")
+            self._defer(chat_id, batch, error.retry_after)
+        except telegram.error.NetworkError as error:
+            logger.warning(f"Сетевая ошибка Telegram, повтор позже: {error}")
+            self._defer(chat_id, batch, self._retry_delay(chat_id))
+        except telegram.error.TelegramError as error:
+            logger.error(f"Ошибка при отправке сообщения в Telegram: {error}")
+            metrics.MESSAGES_FAILED.inc()
+            # Повтор не поможет: сообщение снимается с outbox.
+            self._delivered(chat_id, ids)
+        else:
+            logger.debug("Сообщение успешно отправлено в Telegram")
+            metrics.MESSAGES_SENT.inc()
+            self._delivered(chat_id, ids)
+            with self._condition:
+                self._not_before[chat_id] = self.clock() + self.chat_interval
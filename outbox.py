@@ -0,0 +1,75 @@
+# Импорты из стандартных библиотек
+import sqlite3
+import threading
+import time
+
+RETENTION = 7 * 24 * 3600
+
+
+class Outbox:
+    """Персистентная очередь уведомлений в SQLite.
+
+    Сообщение записывается до отправки и помечается доставленным после
+    неё, поэтому после сбоя или перезапуска недоставленное отправится
+    снова (at-least-once). Ключ идемпотентности не даёт записать одно
+    уведомление дважды.
+    """
+
+    def __init__(self, path, clock=time.time):
+        """Путь к базе; соединение доступно из нескольких потоков."""
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "key TEXT NOT NULL UNIQUE, "
+                "chat_id TEXT NOT NULL, "
+                "text TEXT NOT NULL, "
+                "created REAL NOT NULL, "
+                "delivered REAL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS outbox_pending "
+                "ON outbox (delivered, id)"
+            )
+
+    def add(self, chat_id, text, key):
+        """Записывает сообщение; None, если ключ уже встречался."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO outbox (key, chat_id, text, created) "
+                "VALUES (?, ?, ?, ?)",
+                (key, str(chat_id), text, self.clock()),
+            )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def pending(self):
+        """Недоставленные сообщения в порядке записи."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, chat_id, text FROM outbox "
+                "WHERE delivered IS NULL ORDER BY id"
+            ).fetchall()
+
+    def mark_delivered(self, ids):
+        """Помечает сообщения доставленными одной транзакцией."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE outbox SET delivered = ? WHERE id = ?",
+                ((self.clock(), message_id) for message_id in ids),
+            )
+
+    def purge(self, retention=RETENTION):
+        """Удаляет давно доставленные сообщения вместе с их ключами."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM outbox WHERE delivered < ?",
+                (self.clock() - retention,),
+            )
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        self._connection.close()
@@ -0,0 +1,185 @@
+# Импорты из стандартных библиотек
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import timedelta
+
+# Импорты сторонних библиотек
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Импорты модулей этого проекта
+from tenants import current_tenant
+
+# Заголовки ответа, которые не попадают в архив.
+DROPPED_HEADERS = ("set-cookie",)
+
+logger = logging.getLogger(__name__)
+
+Exchange = namedtuple(
+    "Exchange",
+    ("offset", "elapsed", "tenant", "from_date", "status", "headers", "body"),
+)
+Exchange.__doc__ = """Записанный обмен с API домашки.
+
+offset — начало запроса в секундах от начала записи, elapsed — время
+ответа, status — код ответа или None при сетевой ошибке (тогда body —
+её текст).
+"""
+
+
+def tenant_name():
+    """Имя тенанта, который сейчас опрашивается, или None."""
+    tenant = current_tenant.get()
+    return None if tenant is None else tenant.name
+
+
+def load(path):
+    """Обмены из архива в порядке записи.
+
+    Архив процесса, остановленного без close(), обрывается на последней
+    записи; прочитанное до обрыва возвращается.
+    """
+    exchanges = []
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        try:
+            for line in archive:
+                exchanges.append(Exchange(**json.loads(line)))
+        except (EOFError, json.JSONDecodeError):
+            logger.warning(
+                f"Архив {path} оборван, прочитано обменов: {len(exchanges)}"
+            )
+    return exchanges
+
+
+def to_response(exchange, url=None):
+    """Ответ requests из записанного обмена; сетевая ошибка — исключение."""
+    if exchange.status is None:
+        raise requests.ConnectionError(exchange.body)
+    response = requests.Response()
+    response.status_code = exchange.status
+    response.headers = CaseInsensitiveDict(exchange.headers)
+    response._content = exchange.body.encode("utf-8", "surrogateescape")
+    response._content_consumed = True
+    response.elapsed = timedelta(seconds=exchange.elapsed)
+    response.url = url
+    return response
+
+
+class RecordingSession:
+    """Сессия requests, которая записывает ответы API в архив.
+
+    Каждый ответ — строка JSON в gzip-архиве: код, заголовки, тело и
+    время. Тело читается целиком, поэтому при записи потоковый разбор
+    теряет выигрыш по памяти.
+    """
+
+    def __init__(self, session, path, clock=time.monotonic):
+        """Исходная сессия и путь к архиву; старый архив перезаписывается."""
+        self.session = session
+        self.path = path
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self._archive = gzip.open(path, "wt", encoding="utf-8")
+
+    def get(self, url, params=None, **kwargs):
+        """Запрос через исходную сессию с записью ответа."""
+        started = self.clock()
+        exchange = {
+            "offset": round(started - self.started, 6),
+            "tenant": tenant_name(),
+            "from_date": (params or {}).get("from_date"),
+        }
+        try:
+            response = self.session.get(url, params=params, **kwargs)
+            body = response.content
+        except requests.RequestException as error:
+            self.write(Exchange(
+                elapsed=round(self.clock() - started, 6), status=None,
+                headers={}, body=str(error), **exchange,
+            ))
+            raise
+        self.write(Exchange(
+            elapsed=round(self.clock() - started, 6),
+            status=response.status_code,
+            headers={
+                name: value for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            body=body.decode("utf-8", "surrogateescape"),
+            **exchange,
+        ))
+        return response
+
+    def write(self, exchange):
+        """Дописывает обмен в архив."""
+        line = json.dumps(exchange._asdict()) + "\n"
+        with self._lock:
+            self._archive.write(line)
+            # Синхронизирующий сброс не обнуляет словарь сжатия, но
+            # оставляет читаемым архив процесса, убитого без close().
+            self._archive.flush()
+
+    def close(self):
+        """Закрывает архив и исходную сессию."""
+        with self._lock:
+            self._archive.close()
+        self.session.close()
+
+
+class ReplaySession:
+    """Сессия requests, которая отвечает обменами из архива.
+
+    Ответ отдаётся не раньше, чем он пришёл при записи, с поправкой на
+    speed: 1 — исходный темп, 10 — в десять раз быстрее, 0 — без пауз.
+    С by_tenant обмены отдаются тенантам, для которых были записаны,
+    иначе — всем подряд в порядке записи. Когда записи кончаются,
+    запрос падает с ConnectionError.
+    """
+
+    def __init__(self, path, speed=1.0, by_tenant=True, clock=time.monotonic,
+                 sleep=time.sleep):
+        """Путь к архиву, ускорение и разбиение по тенантам."""
+        self.speed = speed
+        self.by_tenant = by_tenant
+        self.clock = clock
+        self.sleep = sleep
+        self.started = None
+        self._lock = threading.Lock()
+        self._queues = {}
+        for exchange in load(path):
+            key = exchange.tenant if by_tenant else None
+            self._queues.setdefault(key, deque()).append(exchange)
+
+    def __len__(self):
+        """Сколько обменов ещё не отдано."""
+        return sum(map(len, self._queues.values()))
+
+    def get(self, url, **kwargs):
+        """Следующий записанный ответ; параметры запроса не учитываются."""
+        key = tenant_name() if self.by_tenant else None
+        with self._lock:
+            if self.started is None:
+                self.started = self.clock()
+            queue = self._queues.get(key)
+            if not queue:
+                raise requests.ConnectionError(
+                    f"Записанные ответы для {key} закончились"
+                )
+            exchange = queue.popleft()
+        if self.speed:
+            delay = (
+                self.started
+                + (exchange.offset + exchange.elapsed) / self.speed
+                - self.clock()
+            )
+            if delay > 0:
+                self.sleep(delay)
+        return to_response(exchange, url)
+
+    def close(self):
+        """Сессии без соединений закрывать нечего."""
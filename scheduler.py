@@ -0,0 +1,156 @@
+# Импорты из стандартных библиотек
+import heapq
+import itertools
+import math
+import random
+import time
+
+
+class Scheduler:
+    """Планировщик опросов по абсолютным дедлайнам на min-куче.
+
+    Следующий дедлайн отсчитывается от предыдущего, а не от момента
+    окончания опроса, поэтому время запросов не накапливается в расписании.
+    Jitter сдвигает фазу каждого ключа на случайную долю периода, чтобы
+    опросы многих тенантов равномерно распределялись по периоду.
+    Паузы округляются вверх до секунды: цикл никогда не просыпается раньше
+    дедлайна. Speed ускоряет расписание при воспроизведении записанных
+    ответов: периоды делятся на speed, при 0 опросы идут без пауз.
+    """
+
+    def __init__(self, clock=time.monotonic, jitter=0.0, rng=random.random,
+                 resolution=1, speed=1):
+        """Часы, доля периода для jitter, точность пауз и ускорение."""
+        self.clock = clock
+        self.jitter = jitter
+        self.rng = rng
+        self.resolution = resolution
+        self.speed = speed
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._heap = []
+        self._intervals = {}
+        self._entries = {}
+        self._last_deadlines = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        """Количество запланированных ключей."""
+        return len(self._intervals)
+
+    def add(self, key, interval):
+        """Планирует ключ; первый опрос — в пределах jitter от текущего."""
+        self._intervals[key] = interval
+        deadline = self.clock() + self.rng() * self.jitter * self._period(key)
+        self._push(deadline, key)
+
+    def set_interval(self, key, interval):
+        """Меняет период ключа; новый дедлайн отсчитывается от прошлого."""
+        if self._intervals.get(key) == interval:
+            return
+        self._intervals[key] = interval
+        last_deadline = self._last_deadlines.get(key)
+        if last_deadline is not None:
+            self._push(last_deadline + self._period(key), key)
+
+    def interval(self, key):
+        """Текущий период ключа."""
+        return self._intervals[key]
+
+    def _period(self, key):
+        """Период ключа в секундах часов планировщика с учётом speed."""
+        if not self.speed:
+            return 0
+        return self._intervals[key] / self.speed
+
+    def _push(self, deadline, key):
+        order = next(self._counter)
+        self._entries[key] = order
+        heapq.heappush(self._heap, (deadline, order, key))
+
+    def _drop_stale(self):
+        """Убирает с вершины кучи записи, заменённые set_interval."""
+        while self._heap:
+            _, order, key = self._heap[0]
+            if self._entries[key] == order:
+                return
+            heapq.heappop(self._heap)
+
+    def pop_due(self):
+        """Ключи с наступившими дедлайнами; сразу планирует их повтор."""
+        now = self.clock()
+        due = []
+        self.lag = 0.0
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            self._last_deadlines[key] = deadline
+            self.lag = max(self.lag, now - deadline)
+            due.append(key)
+            self._drop_stale()
+        # Повторы планируются после выборки: ключ с нулевым периодом
+        # не должен снова попасть в тот же вызов.
+        for key in due:
+            period = self._period(key)
+            next_deadline = self._last_deadlines[key] + period
+            if not period:
+                next_deadline = now
+            elif next_deadline <= now:
+                missed = math.floor((now - next_deadline) / period) + 1
+                next_deadline += missed * period
+            self._push(next_deadline, key)
+        self.max_lag = max(self.max_lag, self.lag)
+        return due
+
+    def delay(self):
+        """Пауза до ближайшего дедлайна, округлённая вверх до точности."""
+        self._drop_stale()
+        if not self._heap:
+            return 0
+        remaining = max(0.0, self._heap[0][0] - self.clock())
+        return math.ceil(remaining / self.resolution) * self.resolution
+
+
+class AdaptiveInterval:
+    """Период опроса, который подстраивается под активность аккаунта.
+
+    Пока у тенанта есть работа на проверке (`reviewing`), он опрашивается
+    с коротким периодом. Если ответы подряд приходят пустыми, период
+    растёт экспоненциально до потолка. Любой ответ с работами сбрасывает
+    период к базовому.
+    """
+
+    def __init__(self, base, fast=None, cap=None, idle_threshold=3,
+                 factor=2):
+        """Базовый, быстрый и предельный периоды в секундах."""
+        self.base = base
+        self.fast = base / 5 if fast is None else fast
+        self.cap = base * 8 if cap is None else cap
+        self.idle_threshold = idle_threshold
+        self.factor = factor
+        self.empty_polls = 0
+        self.current = base
+
+    def update(self, activity, reviewing):
+        """Период до следующего опроса по итогам текущего.
+
+        activity — число работ в ответе API (0 для пустого ответа и 304),
+        None — опрос завершился ошибкой, период не меняется.
+        reviewing — есть ли у тенанта работа на проверке.
+        """
+        if activity is None:
+            return self.current
+        if activity:
+            self.empty_polls = 0
+        else:
+            self.empty_polls += 1
+        if reviewing:
+            self.current = self.fast
+        elif self.empty_polls >= self.idle_threshold:
+            backoff = self.factor ** min(
+                self.empty_polls - self.idle_threshold + 1, 32
+            )
+            self.current = min(self.base * backoff, self.cap)
+        else:
+            self.current = self.base
+        return self.current
@@ -0,0 +1,297 @@
+# Импорты из стандартных библиотек
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+# Импорты модулей этого проекта
+from status_index import StatusIndex
+
+
+class PollState:
+    """Состояние опроса API домашки."""
+
+    __slots__ = ("timestamp", "statuses", "saved_timestamp", "current_date")
+
+    def __init__(self, timestamp, statuses=None):
+        """Курсор from_date и последние отправленные статусы работ.
+
+        statuses — StatusIndex или словарь «ключ работы — статус».
+        """
+        self.timestamp = timestamp
+        if not isinstance(statuses, StatusIndex):
+            statuses = StatusIndex(statuses)
+        self.statuses = statuses
+        self.saved_timestamp = None
+        # current_date последнего успешного ответа API; не сохраняется.
+        self.current_date = None
+
+    def advance(self, response):
+        """Сдвигает курсор на current_date из проверенного ответа API.
+
+        Пустой ответ курсор не сдвигает: повторный запрос с тем же
+        from_date сервер может подтвердить ответом 304.
+        """
+        if response["homeworks"]:
+            self.timestamp = response["current_date"]
+
+    @property
+    def reviewing(self):
+        """Есть ли среди отправленных статусов работа на проверке."""
+        return self.statuses.count("reviewing") > 0
+
+    @property
+    def dirty(self):
+        """Изменилось ли состояние после последнего сохранения."""
+        return self.timestamp != self.saved_timestamp or self.statuses.dirty
+
+    def mark_saved(self):
+        """Отмечает текущее состояние сохранённым."""
+        self.saved_timestamp = self.timestamp
+        self.statuses.mark_saved()
+
+    def to_dict(self):
+        """Представление состояния для сериализации."""
+        return {"timestamp": self.timestamp, **self.statuses.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Восстанавливает состояние из сериализованного вида."""
+        poll_state = cls(data["timestamp"], StatusIndex.from_dict(data))
+        poll_state.mark_saved()
+        return poll_state
+
+
+def unsaved(states, known):
+    """Состояния, которых нет в хранилище или которые изменились."""
+    return {
+        key: poll_state for key, poll_state in states.items()
+        if poll_state.dirty or key not in known
+    }
+
+
+class StateCheckpoint:
+    """Копит сохранения состояний и пишет их в хранилище разом.
+
+    Воркер сохраняет состояния один раз за раунд расписания, а не после
+    каждого опроса: JSON-файл переписывается целиком, и тысяча тенантов
+    в раунде означала бы тысячу перезаписей с fsync.
+    """
+
+    def __init__(self, store):
+        """Хранилище, в которое пишутся накопленные состояния."""
+        self.store = store
+        self.pending = {}
+
+    def save(self, key, poll_state):
+        """Откладывает сохранение состояния тенанта до flush."""
+        self.pending[key] = poll_state
+
+    def flush(self):
+        """Сохраняет накопленные состояния; при ошибке они остаются."""
+        if self.pending:
+            self.store.save_many(self.pending)
+            self.pending = {}
+
+
+class MemoryStateStore:
+    """Хранилище состояния в памяти процесса."""
+
+    def __init__(self):
+        """Состояния живут, пока работает процесс."""
+        self._data = {}
+
+    def load(self, key):
+        """Загружает состояние тенанта или возвращает None."""
+        if key not in self._data:
+            return None
+        return PollState.from_dict(self._data[key])
+
+    def save(self, key, poll_state):
+        """Сохраняет состояние тенанта."""
+        self.save_many({key: poll_state})
+
+    def save_many(self, states):
+        """Сохраняет изменившиеся состояния тенантов."""
+        for key, poll_state in unsaved(states, self._data).items():
+            self._data[key] = json.loads(json.dumps(poll_state.to_dict()))
+            poll_state.mark_saved()
+
+
+class JsonStateStore:
+    """Хранилище состояния в JSON-файле с атомарной записью."""
+
+    def __init__(self, path):
+        """Путь к файлу состояния."""
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _read(self):
+        """Содержимое файла состояния, прочитанное один раз."""
+        if self._data is None:
+            try:
+                with open(self.path, encoding="utf-8") as state_file:
+                    self._data = json.load(state_file)
+            except FileNotFoundError:
+                self._data = {}
+        return self._data
+
+    def load(self, key):
+        """Загружает состояние тенанта или возвращает None."""
+        data = self._read().get(key)
+        return None if data is None else PollState.from_dict(data)
+
+    def save(self, key, poll_state):
+        """Сохраняет состояние тенанта."""
+        self.save_many({key: poll_state})
+
+    def save_many(self, states):
+        """Записывает файл один раз, если хоть одно состояние изменилось.
+
+        Файл пишется во временный и подменяет старый.
+        """
+        with self._lock:
+            data = self._read()
+            changed = unsaved(states, data)
+            if not changed:
+                return
+            for key, poll_state in changed.items():
+                data[key] = poll_state.to_dict()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".state-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                    json.dump(data, tmp_file, ensure_ascii=False)
+                    tmp_file.flush()
+                    os.fsync(tmp_file.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        for poll_state in changed.values():
+            poll_state.mark_saved()
+
+
+class SqliteStateStore:
+    """Хранилище состояния в базе SQLite."""
+
+    def __init__(self, path):
+        """Путь к файлу базы данных."""
+        self.path = path
+        self._lock = threading.Lock()
+        # Тенанты, чьи строки в базе совпадают с индексом в памяти.
+        self._known = set()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cursors "
+                "(tenant TEXT PRIMARY KEY, timestamp INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS statuses "
+                "(tenant TEXT NOT NULL, homework TEXT NOT NULL, "
+                "status TEXT NOT NULL, updated INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (tenant, homework))"
+            )
+            columns = {
+                row[1] for row in self._connection.execute(
+                    "PRAGMA table_info(statuses)"
+                )
+            }
+            if "updated" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE statuses "
+                    "ADD COLUMN updated INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def load(self, key):
+        """Загружает состояние тенанта или возвращает None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT timestamp FROM cursors WHERE tenant = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._known.add(key)
+            rows = self._connection.execute(
+                "SELECT homework, status, updated FROM statuses "
+                "WHERE tenant = ?",
+                (key,),
+            ).fetchall()
+        statuses = StatusIndex()
+        for homework, status, updated in rows:
+            statuses.record(homework, status, updated)
+        poll_state = PollState(row[0], statuses)
+        poll_state.mark_saved()
+        return poll_state
+
+    def save(self, key, poll_state):
+        """Сохраняет состояние тенанта."""
+        self.save_many({key: poll_state})
+
+    def save_many(self, states):
+        """Сохраняет изменения состояний тенантов одной транзакцией.
+
+        Пишутся только сдвинутые курсоры и изменившиеся статусы;
+        вытесненные из индекса работы удаляются из базы.
+        """
+        with self._lock:
+            changed = unsaved(states, self._known)
+            if not changed:
+                return
+            with self._connection:
+                for key, poll_state in changed.items():
+                    self._save_changes(key, poll_state)
+            self._known.update(changed)
+        for poll_state in changed.values():
+            poll_state.mark_saved()
+
+    def _save_changes(self, key, poll_state):
+        """Изменения одного тенанта внутри открытой транзакции."""
+        known = key in self._known
+        if not known or poll_state.timestamp != poll_state.saved_timestamp:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cursors (tenant, timestamp) "
+                "VALUES (?, ?)",
+                (key, poll_state.timestamp),
+            )
+        statuses = poll_state.statuses
+        changes = statuses.changes() if known else None
+        if changes is None:
+            # Состояние не загружено из этой базы или индекс сменился
+            # почти целиком: строки тенанта переписываются.
+            self._connection.execute(
+                "DELETE FROM statuses WHERE tenant = ?", (key,)
+            )
+            changes = set(statuses), ()
+        changed, removed = changes
+        self._connection.executemany(
+            "DELETE FROM statuses WHERE tenant = ? AND homework = ?",
+            ((key, homework) for homework in removed),
+        )
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO statuses "
+            "(tenant, homework, status, updated) VALUES (?, ?, ?, ?)",
+            (
+                (key, homework, statuses[homework],
+                 statuses.updated(homework))
+                for homework in changed
+            ),
+        )
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        self._connection.close()
+
+
+def open_state_store(path):
+    """Выбирает хранилище состояния по пути к файлу."""
+    if not path:
+        return MemoryStateStore()
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SqliteStateStore(path)
+    return JsonStateStore(path)
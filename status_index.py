@@ -0,0 +1,219 @@
+# Импорты из стандартных библиотек
+from collections.abc import MutableMapping
+from datetime import datetime
+from itertools import islice, repeat
+from operator import and_, ne
+
+MAX_SIZE = 100000
+# Доля записей, вытесняемых разом при переполнении индекса.
+EVICT_FRACTION = 8
+CODE_BITS = 16
+CODE_MASK = (1 << CODE_BITS) - 1
+# Код отсутствующей работы в changed; статусу он не выдаётся.
+ABSENT = CODE_MASK
+# Сколько невычищенных изменений diff копит до проверки, какие записаны.
+PENDING_LIMIT = 1024
+
+
+def epoch(value):
+    """Unix-время из date_updated ответа API; 0, если времени нет."""
+    if type(value) is int:
+        return value
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00"))
+                   .timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+class StatusIndex(MutableMapping):
+    """Последний отправленный статус и date_updated каждой работы.
+
+    Как словарь отображает ключ работы в статус. Статус и время
+    изменения упакованы в одно целое: код статуса в младших битах,
+    unix-время в старших, — кортежи и строки времени не хранятся.
+    Порядок ключей в словаре — порядок изменений, поэтому при
+    переполнении max_size вытесняются давно не менявшиеся работы.
+    """
+
+    def __init__(self, statuses=None, updated=None, max_size=MAX_SIZE):
+        """Начальные статусы и время их изменения по ключам работ."""
+        self.max_size = max_size
+        self._entries = {}
+        self._codes = {}
+        self._names = []
+        self._counts = []
+        # Ключи, записанные и удалённые после последнего сохранения;
+        # когда удалённых больше max_size, индекс сохраняется целиком.
+        self._changed = set()
+        self._removed = set()
+        self._rewrite = False
+        updated = updated or {}
+        for key, status in (statuses or {}).items():
+            self.record(key, status, updated.get(key))
+
+    def __getitem__(self, key):
+        """Последний статус работы."""
+        return self._names[self._entries[key] & CODE_MASK]
+
+    def __setitem__(self, key, status):
+        """Запоминает статус работы без времени изменения."""
+        self.record(key, status)
+
+    def __delitem__(self, key):
+        """Забывает работу."""
+        self._counts[self._entries.pop(key) & CODE_MASK] -= 1
+        if not self._rewrite:
+            self._changed.discard(key)
+            self._removed.add(key)
+            if len(self._removed) > self.max_size:
+                self._rewrite = True
+                self._changed.clear()
+                self._removed.clear()
+
+    def __iter__(self):
+        """Ключи работ от давно изменённых к недавним."""
+        return iter(self._entries)
+
+    def __len__(self):
+        """Количество работ в индексе."""
+        return len(self._entries)
+
+    def __repr__(self):
+        """Представление для логов."""
+        return f"StatusIndex({len(self)} работ)"
+
+    def count(self, status):
+        """Количество работ с данным статусом, без обхода индекса."""
+        code = self._codes.get(status)
+        return 0 if code is None else self._counts[code]
+
+    def updated(self, key):
+        """Время изменения статуса работы в unix-времени или 0."""
+        return self._entries[key] >> CODE_BITS
+
+    def record(self, key, status, updated=None):
+        """Запоминает статус работы и время его изменения."""
+        code = self._code(status)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._counts[entry & CODE_MASK] -= 1
+        elif len(self._entries) >= self.max_size:
+            self._evict(max(1, self.max_size // EVICT_FRACTION))
+        self._counts[code] += 1
+        self._entries[key] = epoch(updated) << CODE_BITS | code
+        if not self._rewrite:
+            self._changed.add(key)
+            self._removed.discard(key)
+
+    @property
+    def dirty(self):
+        """Есть ли изменения после последнего сохранения."""
+        return self._rewrite or bool(self._changed or self._removed)
+
+    def changes(self):
+        """Ключи, записанные и удалённые после последнего сохранения.
+
+        None — изменений слишком много, индекс нужно сохранить целиком.
+        """
+        if self._rewrite:
+            return None
+        return set(self._changed), set(self._removed)
+
+    def mark_saved(self):
+        """Отмечает текущее содержимое индекса сохранённым."""
+        self._rewrite = False
+        self._changed.clear()
+        self._removed.clear()
+
+    def changed(self, keys, statuses):
+        """Флаги работ, статус которых отличается от записанного.
+
+        Столбцы ключей и статусов сравниваются с индексом через map, без
+        байткода на каждую работу. Флаг не учитывает date_updated и
+        повторы ключа: их разбирает diff.
+        """
+        stored = map(
+            and_, map(self._entries.get, keys, repeat(ABSENT)),
+            repeat(CODE_MASK),
+        )
+        return list(map(ne, stored, map(self._codes.get, statuses,
+                                        repeat(-1))))
+
+    def diff(self, homeworks):
+        """Работы, статус которых изменился относительно индекса.
+
+        Индекс не меняется: изменение записывается через record после
+        успешной отправки. На работу с прежним статусом уходит два
+        поиска в словарях; разбор date_updated нужен только изменившимся
+        работам. Запись старше запомненной, например из окна загрузки
+        истории, изменением не считается.
+
+        Выданные, но ещё не записанные изменения помнятся, чтобы повтор
+        работы в том же ответе не стал вторым уведомлением. Записанные
+        изменения из этой памяти вычищаются, поэтому на потоковом ответе
+        она не растёт вместе с ответом.
+        """
+        entries, codes = self._entries, self._codes
+        pending = {}
+        limit = PENDING_LIMIT
+        for homework in homeworks:
+            key, _, status, updated = homework
+            if key in pending:
+                if pending[key] == status:
+                    continue
+            else:
+                entry = entries.get(key)
+                if entry is not None:
+                    if codes.get(status) == entry & CODE_MASK:
+                        continue
+                    moment = epoch(updated)
+                    if moment and moment < entry >> CODE_BITS:
+                        continue
+            pending[key] = status
+            if len(pending) > limit:
+                pending = {
+                    key: status for key, status in pending.items()
+                    if not self._holds(key, status)
+                }
+                limit = max(PENDING_LIMIT, 2 * len(pending))
+            yield homework
+
+    def to_dict(self):
+        """Снимок индекса для сериализации."""
+        return {
+            "statuses": dict(self.items()),
+            "updated": {
+                key: entry >> CODE_BITS
+                for key, entry in self._entries.items()
+                if entry >> CODE_BITS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data, max_size=MAX_SIZE):
+        """Восстанавливает индекс из снимка."""
+        return cls(data.get("statuses"), data.get("updated"), max_size)
+
+    def _code(self, status):
+        """Код статуса; новый статус получает следующий код."""
+        code = self._codes.get(status)
+        if code is None:
+            if len(self._names) >= ABSENT:
+                raise ValueError("Слишком много разных статусов")
+            code = self._codes[status] = len(self._names)
+            self._names.append(status)
+            self._counts.append(0)
+        return code
+
+    def _holds(self, key, status):
+        """Записан ли у работы именно этот статус."""
+        entry = self._entries.get(key)
+        return entry is not None and (
+            self._codes.get(status) == entry & CODE_MASK
+        )
+
+    def _evict(self, quantity):
+        """Вытесняет работы, статус которых дольше всего не менялся."""
+        for key in list(islice(self._entries, quantity)):
+            del self[key]
@@ -0,0 +1,156 @@
+# Импорты из стандартных библиотек
+import codecs
+import json
+import re
+
+# Импорты модулей этого проекта
+from exceptions import VarTypeError
+
+CHUNK_SIZE = 64 * 1024
+MAX_VALUE_SIZE = 16 * 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class HomeworkStream:
+    """Потоковый разбор ответа API домашки.
+
+    Итерация выдаёт работы из массива homeworks по мере чтения чанков,
+    в памяти держится только текущий фрагмент ответа. Структура ответа
+    проверяется как в check_response: TypeError, KeyError, а current_date
+    проверяется, когда ответ дочитан, и при ошибке вызывает VarTypeError.
+    Ошибки JSON превращаются в ValueError, как в get_api_answer.
+    """
+
+    def __init__(self, chunks, on_complete=None, on_close=None):
+        """Итератор байтовых чанков и колбэки завершения и закрытия."""
+        self._chunks = iter(chunks)
+        self._on_complete = on_complete
+        self._on_close = on_close
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._scan = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.fields = {}
+        self.count = 0
+        self.completed = False
+
+    @property
+    def current_date(self):
+        """current_date дочитанного ответа."""
+        if not self.completed:
+            raise RuntimeError("Ответ ещё не дочитан")
+        return self.fields["current_date"]
+
+    def __iter__(self):
+        """Работы ответа по одной."""
+        try:
+            yield from self._parse()
+        except json.JSONDecodeError as value_error:
+            raise ValueError(f"Ошибка парсинга JSON: {value_error}")
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+
+    def _fill(self):
+        """Дочитывает следующий непустой чанк; False в конце ответа."""
+        while not self._eof:
+            chunk = next(self._chunks, None)
+            try:
+                text = self._text.decode(chunk or b"", final=chunk is None)
+            except UnicodeDecodeError as error:
+                raise json.JSONDecodeError(str(error), self._buffer, 0)
+            self._eof = chunk is None
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        return False
+
+    def _peek(self):
+        """Первый значащий символ после пробелов или '' в конце ответа."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars):
+        """Пропускает один из ожидаемых символов-разделителей."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Ожидался один из символов {chars!r}",
+                self._buffer, self._pos,
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Очередное JSON-значение целиком."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._scan(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Неполное значение дочитывается, но не бесконечно:
+                # битый ответ не должен целиком оседать в буфере.
+                too_long = len(self._buffer) - self._pos > MAX_VALUE_SIZE
+                if too_long or not self._fill():
+                    raise
+                continue
+            # Число в конце буфера может продолжиться в следующем чанке.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _items(self):
+        """Элементы массива homeworks."""
+        self._pos += 1
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            self.count += 1
+            if self._expect(",]") == "]":
+                return
+
+    def _parse(self):
+        """Ключи объекта ответа; работы выдаются по мере чтения."""
+        if self._peek() != "{":
+            raise TypeError("response должен быть типа dict")
+        self._pos += 1
+        has_homeworks = False
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                self._expect(":")
+                if key == "homeworks":
+                    if self._peek() != "[":
+                        raise TypeError(
+                            "Данные homeworks должны быть типа list"
+                        )
+                    has_homeworks = True
+                    yield from self._items()
+                else:
+                    self.fields[key] = self._value()
+                if self._expect(",}") == "}":
+                    break
+        if not has_homeworks:
+            raise KeyError("Нет такого ключа как homeworks")
+        self._check_current_date()
+        self.completed = True
+        if self._on_complete is not None:
+            self._on_complete()
+
+    def _check_current_date(self):
+        if "current_date" not in self.fields:
+            raise VarTypeError("Отсутствует ключ 'current_date'")
+        if not isinstance(self.fields["current_date"], int):
+            raise VarTypeError("Данные current_date должны быть типа int")
@@ -0,0 +1,117 @@
+# Импорты из стандартных библиотек
+import asyncio
+import threading
+
+# Импорты сторонних библиотек
+import aiohttp
+import telegram
+
+# Импорты модулей этого проекта
+from api_client import make_async_session
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+
+def api_error(status, payload):
+    """Исключение python-telegram-bot по ответу Bot API с ok=false."""
+    description = payload.get("description") or f"HTTP {status}"
+    retry_after = (payload.get("parameters") or {}).get("retry_after")
+    if retry_after is not None:
+        return telegram.error.RetryAfter(retry_after)
+    if status in (401, 403):
+        return telegram.error.Unauthorized(description)
+    if status == 400:
+        return telegram.error.BadRequest(description)
+    if status >= 500:
+        return telegram.error.NetworkError(description)
+    return telegram.error.TelegramError(description)
+
+
+class AsyncBot:
+    """Отправка сообщений через Bot API по пулу keep-alive соединений.
+
+    Корутина send() выполняется в цикле событий и использует сессию
+    aiohttp; в AsyncRunner это общая с клиентом Практикума сессия, то есть
+    общий пул соединений и таймауты. send_message() повторяет интерфейс
+    telegram.Bot, поэтому бот подходит для homework.send_message и
+    OutboundQueue: вызов из другого потока выполняется в цикле бота,
+    а без подключённого цикла бот запускает собственный в фоновом потоке.
+    Ошибки Bot API превращаются в исключения telegram.error.
+    """
+
+    def __init__(self, token, session=None, api_url=TELEGRAM_API_URL):
+        """Токен бота, сессия aiohttp и адрес Bot API."""
+        self.token = token
+        self.session = session
+        self.api_url = api_url.rstrip("/")
+        self._own_session = False
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Адрес метода sendMessage."""
+        return f"{self.api_url}/bot{self.token}/sendMessage"
+
+    def attach(self, session):
+        """Подключает бота к сессии и циклу событий вызывающей корутины."""
+        self.session = session
+        self._loop = asyncio.get_running_loop()
+
+    def get_session(self):
+        """Общая сессия или собственная, созданная в текущем цикле."""
+        if self.session is None:
+            self.session = make_async_session()
+            self._own_session = True
+        return self.session
+
+    async def send(self, chat_id, text):
+        """Отправляет сообщение и возвращает объект Message из ответа."""
+        try:
+            async with self.get_session().post(
+                self.url, json={"chat_id": chat_id, "text": text}
+            ) as response:
+                status = response.status
+                payload = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError,
+                ValueError) as error:
+            raise telegram.error.NetworkError(f"Ошибка запроса: {error}")
+        if not isinstance(payload, dict):
+            payload = {}
+        if not payload.get("ok"):
+            raise api_error(status, payload)
+        return payload["result"]
+
+    def send_message(self, chat_id=None, text=None):
+        """Синхронная отправка с интерфейсом telegram.Bot.send_message."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.send(chat_id, text), self._get_loop()
+        )
+        return future.result()
+
+    def _get_loop(self):
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=loop.run_forever, name="telegram-async", daemon=True
+            )
+            self._thread.start()
+            self._loop = loop
+        return self._loop
+
+    async def close(self):
+        """Закрывает собственную сессию; общую закрывает её владелец."""
+        if self._own_session:
+            await self.session.close()
+            self.session = None
+            self._own_session = False
+
+    def stop(self):
+        """Закрывает сессию и останавливает фоновый цикл, если он был."""
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
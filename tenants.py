@@ -0,0 +1,77 @@
+# Импорты из стандартных библиотек
+import json
+import sqlite3
+from collections import Counter, namedtuple
+from contextvars import ContextVar
+
+DEFAULT_TENANT = "default"
+
+# Тенант, для которого сейчас выполняется цикл опроса.
+current_tenant = ContextVar("current_tenant", default=None)
+
+
+class Tenant(
+    namedtuple(
+        "Tenant",
+        ("name", "practicum_token", "chat_id", "poll_interval", "locale"),
+        defaults=(None,),
+    )
+):
+    """Аккаунт Практикума и чат, в который уходят его статусы.
+
+    locale — язык уведомлений; None — язык по умолчанию.
+    """
+
+    __slots__ = ()
+
+    @property
+    def headers(self):
+        """Заголовки запроса к API домашки от имени тенанта."""
+        return {"Authorization": f"OAuth {self.practicum_token}"}
+
+
+def make_tenant(data, poll_interval):
+    """Тенант из записи реестра."""
+    chat_id = data.get("chat_id")
+    return Tenant(
+        name=str(data.get("name") or chat_id),
+        practicum_token=data.get("practicum_token"),
+        chat_id=chat_id,
+        poll_interval=int(data.get("poll_interval") or poll_interval),
+        locale=data.get("locale"),
+    )
+
+
+def load_tenants(path, poll_interval):
+    """Загружает реестр тенантов из JSON-файла или базы SQLite."""
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        connection = sqlite3.connect(path)
+        connection.row_factory = sqlite3.Row
+        try:
+            rows = connection.execute("SELECT * FROM tenants").fetchall()
+        finally:
+            connection.close()
+        records = [dict(row) for row in rows]
+    else:
+        with open(path, encoding="utf-8") as registry_file:
+            records = json.load(registry_file)
+    tenants = [make_tenant(record, poll_interval) for record in records]
+    names = Counter(tenant.name for tenant in tenants)
+    duplicates = sorted(name for name, count in names.items() if count > 1)
+    if duplicates:
+        # Имя — ключ состояния и расписания: тенанты с одним именем
+        # затирали бы друг друга. По умолчанию имя — chat_id, поэтому
+        # аккаунтам с общим чатом нужны явные имена.
+        raise ValueError(
+            f"Повторяются имена тенантов: {', '.join(duplicates)}"
+        )
+    return tenants
+
+
+def missing_fields(tenant):
+    """Незаполненные обязательные поля тенанта."""
+    return [
+        f"{tenant.name}.{field}"
+        for field in ("practicum_token", "chat_id")
+        if not getattr(tenant, field)
+    ]
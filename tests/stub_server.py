@@ -0,0 +1,210 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.handle_stub_request(self)
+
+    def do_POST(self):
+        self.server.handle_stub_request(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Локальный HTTP-сервер с настраиваемой задержкой ответа."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, latency=0.0):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.latency = latency
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'http://{host}:{port}/'
+
+    def handle_stub_request(self, handler):
+        url = urlparse(handler.path)
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+        with self._lock:
+            self.requests.append({
+                'method': handler.command,
+                'path': url.path,
+                'params': {
+                    key: values[0]
+                    for key, values in parse_qs(url.query).items()
+                },
+                'headers': dict(handler.headers),
+                'body': body,
+                'connection': handler.client_address,
+            })
+        if self.latency:
+            time.sleep(self.latency)
+        status, headers, payload = self.respond(handler, url, body)
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def respond(self, handler, url, body):
+        raise NotImplementedError
+
+    def handle_error(self, request, client_address):
+        pass
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(0.01,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+class PracticumStub(StubServer):
+    """Эмулирует API домашки Практикума."""
+
+    def __init__(self, latency=0.0, homeworks=None, statuses=(),
+                 etag=None):
+        super().__init__(latency=latency)
+        self.homeworks = [] if homeworks is None else homeworks
+        self.statuses = list(statuses)
+        self.etag = etag
+
+    def respond(self, handler, url, body):
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return status, {'Content-Type': 'application/json'}, b'{}'
+        headers = {'Content-Type': 'application/json'}
+        if self.etag is not None:
+            headers['ETag'] = self.etag
+            if handler.headers.get('If-None-Match') == self.etag:
+                return 304, headers, b''
+        payload = json.dumps({
+            'homeworks': self.homeworks,
+            'current_date': int(time.time()),
+        }).encode()
+        return 200, headers, payload
+
+
+class LoadPracticumStub(StubServer):
+    """API домашки под нагрузкой: статусы тенантов меняются по таймеру.
+
+    Тенант определяется по заголовку Authorization. Каждые
+    change_interval секунд у тенанта появляется новая работа на проверке,
+    время её появления хранится в changed_at по названию работы. В каждый
+    ответ добавляется history неизменных работ с комментарием размером
+    comment_size байт, а error_rate — доля ответов с кодом 500.
+    """
+
+    def __init__(self, latency=0.0, change_interval=2.0, history=0,
+                 comment_size=0, error_rate=0.0, seed=0):
+        super().__init__(latency=latency)
+        self.change_interval = change_interval
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.changed_at = {}
+        self._changes = {}
+        self._next_change = {}
+        self._history = [
+            {
+                'id': -i,
+                'homework_name': f'history-{i}',
+                'status': 'approved',
+                'reviewer_comment': 'x' * comment_size,
+                'date_updated': '2020-02-13T14:40:57Z',
+            }
+            for i in range(1, history + 1)
+        ]
+
+    def respond(self, handler, url, body):
+        headers = {'Content-Type': 'application/json'}
+        with self._lock:
+            if self.random.random() < self.error_rate:
+                return 500, headers, b'{}'
+            tenant = handler.headers.get('Authorization', '')[len('OAuth '):]
+            now = time.time()
+            changes = self._changes.setdefault(tenant, [])
+            moment = self._next_change.setdefault(
+                tenant, now + self.random.random() * self.change_interval
+            )
+            while moment <= now:
+                name = f'{tenant}-{len(changes)}'
+                changes.append((moment, {
+                    'id': len(changes),
+                    'homework_name': name,
+                    'status': 'reviewing',
+                    'date_updated': time.strftime(
+                        '%Y-%m-%dT%H:%M:%SZ', time.gmtime(moment)
+                    ),
+                }))
+                self.changed_at[name] = moment
+                moment += self.change_interval
+            self._next_change[tenant] = moment
+        from_date = int(parse_qs(url.query).get('from_date', ['0'])[0])
+        homeworks = [
+            homework for moment, homework in changes if moment >= from_date
+        ]
+        payload = json.dumps({
+            'homeworks': self._history + homeworks,
+            'current_date': int(now),
+        }, ensure_ascii=False).encode()
+        return 200, headers, payload
+
+
+class BotApiStub(StubServer):
+    """Эмулирует метод sendMessage Telegram Bot API."""
+
+    def __init__(self, latency=0.0, errors=(), error_rate=0.0, seed=0):
+        super().__init__(latency=latency)
+        self.errors = list(errors)
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.messages = []
+        self.received = []
+
+    def respond(self, handler, url, body):
+        headers = {'Content-Type': 'application/json'}
+        with self._lock:
+            if self.errors:
+                status, payload = self.errors.pop(0)
+                return status, headers, json.dumps(payload).encode()
+            if self.random.random() < self.error_rate:
+                return 500, headers, json.dumps({
+                    'ok': False, 'error_code': 500,
+                    'description': 'Internal Server Error',
+                }).encode()
+        data = json.loads(body) if body else {}
+        with self._lock:
+            self.messages.append((str(data.get('chat_id')), data.get('text')))
+            self.received.append(time.time())
+            message_id = len(self.messages)
+        payload = json.dumps({'ok': True, 'result': {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': int(data.get('chat_id', 0)), 'type': 'private'},
+            'text': data.get('text'),
+        }})
+        return 200, headers, payload.encode()
@@ -0,0 +1,88 @@
+import pytest
+
+from api_client import PracticumClient, make_session
+from exceptions import ApiError
+from state import PollState
+from stub_server import PracticumStub
+
+HEADERS = {'Authorization': 'OAuth sometoken'}
+
+
+def make_client(stub, **kwargs):
+    session = make_session(backoff_factor=0)
+    return PracticumClient(stub.url, HEADERS, session=session, **kwargs)
+
+
+class TestPracticumClient:
+
+    def test_returns_api_answer(self):
+        with PracticumStub() as stub:
+            answer = make_client(stub).get_api_answer(1000198000)
+        assert answer['homeworks'] == []
+        assert stub.requests[0]['params'] == {'from_date': '1000198000'}
+        assert stub.requests[0]['headers']['Authorization'] == (
+            'OAuth sometoken'
+        )
+
+    def test_connection_is_reused(self):
+        with PracticumStub() as stub:
+            client = make_client(stub)
+            for _ in range(5):
+                client.get_api_answer(0)
+        connections = {request['connection'] for request in stub.requests}
+        assert len(connections) == 1, (
+            'Запросы клиента должны идти через одно keep-alive соединение.'
+        )
+
+    def test_retries_server_errors(self):
+        with PracticumStub(statuses=[503, 502]) as stub:
+            answer = make_client(stub).get_api_answer(0)
+        assert answer['homeworks'] == []
+        assert len(stub.requests) == 3
+
+    def test_not_ok_status_raises_api_error(self):
+        with PracticumStub(statuses=[401]) as stub:
+            with pytest.raises(ApiError):
+                make_client(stub).get_api_answer(0)
+
+    def test_read_timeout_raises_api_error(self):
+        with PracticumStub(latency=0.5) as stub:
+            client = make_client(stub, timeout=(1, 0.05))
+            client.session = make_session(retries=0)
+            with pytest.raises(ApiError):
+                client.get_api_answer(0)
+
+
+class TestConditionalRequests:
+
+    def test_unchanged_answer_returns_none(self):
+        with PracticumStub(etag='"v1"') as stub:
+            client = make_client(stub)
+            assert client.get_api_answer(0) is not None
+            assert client.get_api_answer(0) is None, (
+                'Ответ 304 должен означать, что изменений нет.'
+            )
+        assert 'If-None-Match' not in stub.requests[0]['headers']
+        assert stub.requests[1]['headers']['If-None-Match'] == '"v1"'
+
+    def test_validators_are_not_sent_for_new_cursor(self):
+        with PracticumStub(etag='"v1"') as stub:
+            client = make_client(stub)
+            client.get_api_answer(0)
+            assert client.get_api_answer(600) is not None
+        assert 'If-None-Match' not in stub.requests[1]['headers']
+
+    def test_not_modified_skips_check_response(self, monkeypatch,
+                                               homework_module):
+        def fail_check_response(response):
+            raise AssertionError(
+                'При ответе 304 `check_response` не должен вызываться.'
+            )
+
+        monkeypatch.setattr(homework_module, 'get_api_answer', lambda ts: None)
+        monkeypatch.setattr(
+            homework_module, 'check_response', fail_check_response
+        )
+        poll_state = PollState(0)
+        homework_module.poll_updates(None, poll_state)
+        assert poll_state.timestamp == 0
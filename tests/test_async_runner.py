@@ -0,0 +1,166 @@
+import asyncio
+import os
+import signal
+import time
+
+import async_runner
+import homework
+from async_runner import AsyncRunner, serve
+from outbound import OutboundQueue
+from outbox import Outbox
+from state import MemoryStateStore
+from stub_server import PracticumStub
+from tenants import Tenant
+
+
+class RecordingBot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None):
+        self.sent.append((chat_id, text))
+
+
+def make_tenants(qty):
+    return [
+        Tenant(f't{i}', f'token-{i}', str(i), 600) for i in range(qty)
+    ]
+
+
+async def poll_once(runner):
+    try:
+        await runner.poll_all()
+    finally:
+        await runner.close()
+
+
+async def serve_and_terminate(runner, delay=0.05):
+    loop = asyncio.get_running_loop()
+    loop.call_later(delay, os.kill, os.getpid(), signal.SIGTERM)
+    await serve(runner)
+
+
+def make_runner(stub, tenants, bot=None, concurrency=10):
+    return AsyncRunner(
+        bot or RecordingBot(), tenants, MemoryStateStore(),
+        endpoint=stub.url, concurrency=concurrency,
+    )
+
+
+class TestAsyncRunner:
+    LATENCY = 0.1
+
+    def test_tenants_are_polled_concurrently(self):
+        tenants = make_tenants(20)
+        with PracticumStub(latency=self.LATENCY) as stub:
+            runner = make_runner(stub, tenants, concurrency=10)
+            started = time.perf_counter()
+            asyncio.run(poll_once(runner))
+            elapsed = time.perf_counter() - started
+        assert len(stub.requests) == 20
+        assert elapsed < len(tenants) * self.LATENCY / 2, (
+            'Тенанты должны опрашиваться конкурентно.'
+        )
+        tokens = {request['headers']['Authorization']
+                  for request in stub.requests}
+        assert tokens == {f'OAuth token-{i}' for i in range(20)}
+
+    def test_new_statuses_are_sent_to_tenant_chat(self):
+        bot = RecordingBot()
+        homeworks = [{'homework_name': 'hw123', 'status': 'approved'}]
+        with PracticumStub(homeworks=homeworks) as stub:
+            runner = make_runner(stub, make_tenants(2), bot=bot)
+            asyncio.run(poll_once(runner))
+        assert sorted(chat_id for chat_id, _ in bot.sent) == ['0', '1']
+        assert all('hw123' in text for _, text in bot.sent)
+
+    def test_api_outage_is_reported_once(self):
+        async def poll_five_times(runner):
+            try:
+                for _ in range(5):
+                    await runner.poll_all()
+            finally:
+                await runner.close()
+
+        bot = RecordingBot()
+        with PracticumStub(statuses=[401] * 5) as stub:
+            runner = make_runner(stub, make_tenants(1), bot=bot)
+            asyncio.run(poll_five_times(runner))
+        assert bot.sent == [(
+            '0',
+            'API домашки недоступно, опрос приостановлен: '
+            'Неуспешный код состояния: 401',
+        )]
+        assert len(stub.requests) == 3
+
+    def test_state_is_saved_once_per_round(self):
+        class CountingStore(MemoryStateStore):
+            def __init__(self):
+                super().__init__()
+                self.writes = []
+
+            def save_many(self, states):
+                self.writes.append(sorted(states))
+                super().save_many(states)
+
+        tenants = make_tenants(10)
+        store = CountingStore()
+        with PracticumStub() as stub:
+            runner = AsyncRunner(
+                RecordingBot(), tenants, store, endpoint=stub.url,
+            )
+            asyncio.run(poll_once(runner))
+        assert store.writes == [sorted(tenant.name for tenant in tenants)]
+        assert all(store.load(tenant.name) for tenant in tenants)
+
+    def test_default_state_file_is_used(self, monkeypatch, tmp_path):
+        opened = []
+        monkeypatch.setattr(homework, 'STATE_FILE', None)
+        monkeypatch.setattr(
+            homework, 'DEFAULT_STATE_FILE', str(tmp_path / 'state.json')
+        )
+        monkeypatch.setattr(
+            homework, 'OUTBOX_FILE', str(tmp_path / 'outbox.sqlite')
+        )
+        monkeypatch.setattr(homework, 'outbound', None)
+        monkeypatch.setattr(homework, 'check_tokens', lambda: [])
+        monkeypatch.setattr(homework, 'get_tenants', lambda: [])
+        monkeypatch.setattr(async_runner, 'open_state_store', opened.append)
+        monkeypatch.setattr(
+            async_runner.asyncio, 'run', lambda coro: coro.close()
+        )
+        async_runner.main()
+        assert opened == [str(tmp_path / 'state.json')]
+        assert isinstance(homework.outbound, OutboundQueue)
+
+    def test_sigterm_stops_serve_cleanly(self):
+        with PracticumStub() as stub:
+            runner = make_runner(stub, make_tenants(3))
+            asyncio.run(serve_and_terminate(runner))
+        assert len(stub.requests) == 3
+        assert runner.session.closed
+
+    def test_statuses_are_queued_in_outbox(self, monkeypatch, tmp_path):
+        queue = OutboundQueue(outbox=Outbox(str(tmp_path / 'outbox.sqlite')))
+        monkeypatch.setattr(homework, 'outbound', queue)
+        homeworks = [{'homework_name': 'hw123', 'status': 'approved'}]
+        with PracticumStub(homeworks=homeworks) as stub:
+            runner = make_runner(stub, make_tenants(1))
+            asyncio.run(poll_once(runner))
+        # Поток отправки не запущен, как при сбое Bot API: уведомление
+        # ждёт в outbox, а не теряется вместе со сдвинутым курсором.
+        assert runner.poll_states['t0'].statuses == {'hw123': 'approved'}
+        [(_, chat_id, text)] = queue.outbox.pending()
+        assert chat_id == '0' and 'hw123' in text
+
+    def test_serve_runs_and_stops_outbound_queue(self, monkeypatch, tmp_path):
+        queue = OutboundQueue(outbox=Outbox(str(tmp_path / 'outbox.sqlite')))
+        monkeypatch.setattr(homework, 'outbound', queue)
+        bot = RecordingBot()
+        homeworks = [{'homework_name': 'hw123', 'status': 'approved'}]
+        with PracticumStub(homeworks=homeworks) as stub:
+            runner = make_runner(stub, make_tenants(2), bot=bot)
+            asyncio.run(serve_and_terminate(runner, delay=0.3))
+        assert sorted(chat_id for chat_id, _ in bot.sent) == ['0', '1']
+        assert queue.outbox.pending() == []
+        assert not queue._thread.is_alive()
@@ -0,0 +1,117 @@
+import time
+
+import backfill
+import utils
+from api_client import PracticumClient
+from state import MemoryStateStore, PollState
+from status_index import StatusIndex
+from stub_server import PracticumStub
+from tenants import Tenant
+
+DAY = backfill.DAY
+START = backfill.parse_time('2023-01-01')
+
+
+def iso(timestamp):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def make_history():
+    return [
+        {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing',
+         'date_updated': iso(START + DAY)},
+        {'id': 2, 'homework_name': 'hw2', 'status': 'approved',
+         'date_updated': iso(START + 3 * DAY)},
+        {'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+         'date_updated': iso(START + 5 * DAY)},
+    ]
+
+
+def make_backfill(stub):
+    client = PracticumClient(stub.url, {})
+    return backfill.Backfill(client, {}, window=DAY)
+
+
+class TestBackfill:
+
+    def test_range_is_split_into_windows(self):
+        assert backfill.split_range(0, 25, 10) == [(0, 10), (10, 20), (20, 25)]
+
+    def test_period_is_fetched_with_one_request(self):
+        history = make_history() + [
+            {'id': 3, 'homework_name': 'hw3', 'status': 'approved',
+             'date_updated': iso(START + 9 * DAY)},
+        ]
+        with PracticumStub(homeworks=history) as stub:
+            records = make_backfill(stub).fetch(START, START + 7 * DAY)
+        assert len(stub.requests) == 1
+        assert stub.requests[0]['params'] == {'from_date': str(START)}
+        assert [(r.key, r.status) for r in records] == [
+            ('1', 'reviewing'), ('2', 'approved'), ('1', 'approved'),
+        ]
+
+    def test_history_is_split_into_windows_locally(self):
+        with PracticumStub(homeworks=make_history()) as stub:
+            records = make_backfill(stub).fetch(START, START + 7 * DAY)
+        counts = backfill.window_counts(records, START, START + 7 * DAY, DAY)
+        assert [count for _, count in counts] == [0, 1, 0, 1, 0, 1, 0]
+
+    def test_tenants_are_fetched_concurrently(self):
+        tenants = [Tenant(f't{i}', f't{i}', i, 600) for i in range(8)]
+        with PracticumStub(latency=0.1) as stub:
+            client = PracticumClient(stub.url, {})
+            started = time.perf_counter()
+            fetched = list(backfill.fetch_tenants(
+                client, tenants, START, START + 7 * DAY,
+                workers=8, rate_limit=1000,
+            ))
+            elapsed = time.perf_counter() - started
+        assert sorted(tenant.name for tenant, _ in fetched) == sorted(
+            tenant.name for tenant in tenants
+        )
+        assert len(stub.requests) == 8
+        assert elapsed < 0.4, 'Тенанты должны загружаться параллельно.'
+
+    def test_rate_limit_caps_throughput(self):
+        tenants = [Tenant(f't{i}', f't{i}', i, 600) for i in range(6)]
+        with PracticumStub() as stub:
+            client = PracticumClient(stub.url, {})
+            started = time.perf_counter()
+            list(backfill.fetch_tenants(
+                client, tenants, START, START + 7 * DAY,
+                workers=8, rate_limit=10,
+            ))
+            elapsed = time.perf_counter() - started
+        assert elapsed >= 0.45, 'Лимит запросов в секунду не соблюдается.'
+
+    def test_state_is_written_without_notifications(self):
+        with PracticumStub(homeworks=make_history()) as stub:
+            records = make_backfill(stub).fetch(START, START + 7 * DAY)
+        bot = utils.MockTelegramBot()
+        store = MemoryStateStore()
+        tenant = Tenant('t', 'token', '1', 600)
+        end = START + 7 * DAY
+        saved = backfill.backfill_tenant(
+            bot, tenant, store, records, end, notify=False
+        )
+        poll_state = store.load('t')
+        assert saved == 2
+        assert poll_state.statuses == {'1': 'approved', '2': 'approved'}
+        assert poll_state.timestamp == end
+        assert not hasattr(bot, 'text')
+
+    def test_history_does_not_overwrite_newer_state(self):
+        with PracticumStub(homeworks=make_history()[:2]) as stub:
+            records = make_backfill(stub).fetch(START, START + 7 * DAY)
+        store = MemoryStateStore()
+        newer = iso(backfill.parse_time('2023-06-01'))
+        store.save('t', PollState(0, StatusIndex(
+            {'1': 'approved', '2': 'rejected'}, {'1': newer, '2': newer}
+        )))
+        tenant = Tenant('t', 'token', '1', 600)
+        backfill.backfill_tenant(
+            None, tenant, store, records, START + 7 * DAY, notify=False
+        )
+        poll_state = store.load('t')
+        assert poll_state.statuses == {'1': 'approved', '2': 'rejected'}
+        assert not poll_state.reviewing
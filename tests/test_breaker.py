@@ -0,0 +1,172 @@
+from collections import Counter
+
+import pytest
+
+import breaker as breaker_module
+import utils
+from breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from exceptions import ApiError
+from state import MemoryStateStore, PollState
+from tenants import Tenant
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        'test', failure_threshold=3, reset_timeout=60,
+        max_reset_timeout=200, clock=clock,
+    )
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold(self, breaker):
+        assert [breaker.record_failure() for _ in range(3)] == [
+            False, False, True
+        ]
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_half_open_probe_closes_on_success(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 60
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert breaker.record_success() is True
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_doubles_timeout_up_to_cap(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure()
+        timeouts = []
+        for _ in range(3):
+            clock.now += breaker.reset_timeout
+            assert breaker.allow()
+            assert breaker.record_failure() is False, (
+                'Повторное размыкание не должно снова уведомлять о сбое.'
+            )
+            timeouts.append(breaker.reset_timeout)
+        assert timeouts == [120, 200, 200]
+
+    def test_released_probe_reopens(self, breaker, clock):
+        breaker.release_probe()
+        assert breaker.state == CLOSED
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 60
+        assert breaker.allow()
+        breaker.release_probe()
+        assert breaker.state == OPEN
+        assert breaker.reset_timeout == 120
+        assert not breaker.allow()
+
+    def test_transitions_are_counted(self, breaker, clock, monkeypatch):
+        monkeypatch.setattr(breaker_module, 'transitions', Counter())
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 60
+        breaker.allow()
+        breaker.record_success()
+        assert breaker_module.transitions == {
+            ('test', CLOSED, OPEN): 1,
+            ('test', OPEN, HALF_OPEN): 1,
+            ('test', HALF_OPEN, CLOSED): 1,
+        }
+
+
+class TestPollTenantWithBreaker:
+
+    def test_outage_sends_one_degraded_and_one_recovered(
+            self, monkeypatch, breaker, clock, homework_module):
+        answers = [ApiError('Неуспешный код состояния: 503')] * 4 + [
+            {'homeworks': [], 'current_date': 1000198000}
+        ]
+        calls = []
+
+        def mock_get_api_answer(timestamp):
+            answer = answers[len(calls)]
+            calls.append(timestamp)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        bot = utils.MockTelegramBot()
+        sent = []
+        monkeypatch.setattr(
+            bot, 'send_message', lambda chat_id, text: sent.append(text)
+        )
+        tenant = Tenant('t', 'token', '1', 600)
+        poll_state, store = PollState(0), MemoryStateStore()
+        for _ in range(9):
+            homework_module.poll_tenant(
+                bot, tenant, poll_state, store, breaker
+            )
+            clock.now += 30
+        assert sent == [
+            'API домашки недоступно, опрос приостановлен: '
+            'Неуспешный код состояния: 503',
+            'API домашки снова доступно, опрос возобновлён.',
+        ]
+        assert len(calls) == 5, (
+            'Пока автомат разомкнут, запросы к API не должны отправляться.'
+        )
+
+    def test_probe_failing_validation_keeps_messages_paired(
+            self, monkeypatch, breaker, clock, homework_module):
+        answers = [ApiError('Неуспешный код состояния: 503')] * 3 + [
+            {'current_date': 1000198000},
+            {'homeworks': [], 'current_date': 1000198000},
+        ]
+        calls = []
+
+        def mock_get_api_answer(timestamp):
+            answer = answers[len(calls)]
+            calls.append(timestamp)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        bot = utils.MockTelegramBot()
+        sent = []
+        monkeypatch.setattr(
+            bot, 'send_message', lambda chat_id, text: sent.append(text)
+        )
+        tenant = Tenant('t', 'token', '1', 600)
+        poll_state, store = PollState(0), MemoryStateStore()
+        states = []
+        for _ in range(10):
+            homework_module.poll_tenant(
+                bot, tenant, poll_state, store, breaker
+            )
+            states.append(breaker.state)
+            clock.now += 30
+        assert states[4] == OPEN, (
+            'После сорванной пробы автомат должен снова разомкнуться.'
+        )
+        assert [text for text in sent if 'API домашки' in text] == [
+            'API домашки недоступно, опрос приостановлен: '
+            'Неуспешный код состояния: 503',
+            'API домашки снова доступно, опрос возобновлён.',
+        ]
+        assert len(calls) == 5
+        assert breaker.state == CLOSED
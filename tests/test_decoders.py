@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from api_client import PracticumClient
+from decoders import DECODERS, make_decoder
+from stub_server import StubServer
+
+
+def available_decoders():
+    names = []
+    for name in DECODERS:
+        try:
+            make_decoder(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+class BrokenJsonStub(StubServer):
+    def respond(self, handler, url, body):
+        return 200, {'Content-Type': 'application/json'}, b'{"homeworks": ['
+
+
+@pytest.mark.parametrize('name', available_decoders())
+class TestDecoders:
+
+    def test_bytes_are_decoded(self, name):
+        payload = {'homeworks': [{'homework_name': 'ДЗ'}], 'current_date': 1}
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        assert make_decoder(name)(data) == payload
+
+    def test_errors_are_json_decode_errors(self, name):
+        with pytest.raises(json.JSONDecodeError):
+            make_decoder(name)(b'{"homeworks": [')
+
+    def test_client_maps_decode_error_to_value_error(self, name):
+        with BrokenJsonStub() as stub:
+            client = PracticumClient(
+                stub.url, {}, decoder=make_decoder(name)
+            )
+            with pytest.raises(ValueError, match='Ошибка парсинга JSON'):
+                client.get_api_answer(0)
+            client.close()
+
+
+def test_unknown_decoder_is_reported():
+    with pytest.raises(ImportError):
+        make_decoder('nosuchjson')
@@ -0,0 +1,65 @@
+import pytest
+
+from error_reporter import ErrorReporter, fingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestErrorReporter:
+
+    def test_fingerprint_ignores_variable_numbers(self):
+        assert fingerprint(ValueError('hw 123 at 0x7f00')) == (
+            fingerprint(ValueError('hw 456 at 0x7f99'))
+        )
+        assert fingerprint(ValueError('x')) != fingerprint(TypeError('x'))
+
+    def test_repeats_within_window_are_suppressed(self, clock):
+        reporter = ErrorReporter(window=3600, clock=clock)
+        assert reporter.report(ValueError('boom 1')) == (
+            'Сбой в работе программы: boom 1'
+        )
+        messages = []
+        for _ in range(5):
+            clock.now += 600
+            messages.append(reporter.report(ValueError('boom 2')))
+        assert messages == [None] * 5, (
+            'Повторы одной ошибки в пределах окна не должны отправляться.'
+        )
+
+    def test_summary_is_sent_once_per_window(self, clock):
+        reporter = ErrorReporter(window=3600, clock=clock)
+        messages = []
+        for _ in range(13):
+            messages.append(reporter.report(KeyError('homeworks')))
+            clock.now += 600
+        sent = [message for message in messages if message]
+        assert sent == [
+            "Сбой в работе программы: 'homeworks'",
+            "Сбой всё ещё повторяется (7 раз): 'homeworks'",
+            "Сбой всё ещё повторяется (13 раз): 'homeworks'",
+        ]
+
+    def test_scopes_are_reported_separately(self, clock):
+        reporter = ErrorReporter(clock=clock)
+        assert reporter.report(ValueError('boom'), 'alice')
+        assert reporter.report(ValueError('boom'), 'bob')
+
+    def test_fingerprints_are_bounded(self, clock):
+        reporter = ErrorReporter(max_fingerprints=10, clock=clock)
+        for i in range(100):
+            reporter.report(ValueError('boom'), scope=i)
+        assert len(reporter) == 10
+        assert reporter.report(ValueError('boom'), scope=0), (
+            'Вытесненный из LRU отпечаток снова считается новым.'
+        )
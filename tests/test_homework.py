@@ -0,0 +1,76 @@
+import logging
+
+import telegram
+
+import utils
+from state import PollState
+
+
+def make_homeworks(qty, status='approved'):
+    return [
+        {'id': i, 'homework_name': f'hw{i}', 'status': status}
+        for i in range(qty)
+    ]
+
+
+class TestParseStatuses:
+
+    def test_every_homework_is_parsed(self, homework_module):
+        changes = list(homework_module.parse_statuses(make_homeworks(3)))
+        assert [change.key for change in changes] == ['0', '1', '2'], (
+            'Убедитесь, что `parse_statuses` обрабатывает все работы ответа.'
+        )
+
+    def test_known_statuses_are_skipped(self, homework_module):
+        known = {'0': 'approved', '1': 'reviewing'}
+        changes = list(
+            homework_module.parse_statuses(make_homeworks(2), known)
+        )
+        assert [change.key for change in changes] == ['1'], (
+            'Уже отправленный статус не должен попадать в сообщения.'
+        )
+
+    def test_invalid_homework_does_not_block_others(self, homework_module):
+        homeworks = make_homeworks(2)
+        homeworks[0]['status'] = 'unknown'
+        changes = list(homework_module.parse_statuses(homeworks))
+        assert [change.key for change in changes] == ['1']
+
+
+class TestNotifyStatuses:
+
+    def test_changes_are_sent_in_one_message(self, homework_module):
+        bot = utils.MockTelegramBot()
+        poll_state = PollState(0)
+        homework_module.notify_statuses(bot, poll_state, make_homeworks(5))
+        assert bot.text.count('Изменился статус') == 5, (
+            'Изменения одного цикла должны уходить одним сообщением.'
+        )
+        assert poll_state.statuses == {str(i): 'approved' for i in range(5)}
+
+    def test_dropped_batch_is_logged_not_counted(self, homework_module,
+                                                 caplog):
+        class FailingBot:
+            def send_message(self, chat_id=None, text=None):
+                raise telegram.error.NetworkError('Bot API недоступен')
+
+        poll_state = PollState(0)
+        with caplog.at_level(logging.DEBUG):
+            homework_module.notify_statuses(
+                FailingBot(), poll_state, make_homeworks(2)
+            )
+        assert poll_state.statuses == {}
+        messages = [record.getMessage() for record in caplog.records]
+        assert 'Не отправлены статусы работ (2): 0, 1' in messages
+        assert not any('уже были отправлены' in text for text in messages), (
+            'Недоставленные статусы не должны считаться отправленными.'
+        )
+
+    def test_batches_respect_message_limit(self, homework_module):
+        changes = list(homework_module.parse_statuses(make_homeworks(200)))
+        batches = list(homework_module.batch_changes(changes))
+        assert len(batches) > 1
+        assert sum(len(batch) for batch in batches) == 200
+        for batch in batches:
+            text = '\n\n'.join(message for _, message in batch)
+            assert len(text) <= homework_module.MESSAGE_LIMIT
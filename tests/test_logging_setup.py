@@ -0,0 +1,91 @@
+import atexit
+import io
+import json
+import logging
+import time
+
+import pytest
+
+from logging_setup import setup_logging
+from tenants import Tenant, current_tenant
+
+
+class SlowStream(io.StringIO):
+    def write(self, text):
+        time.sleep(0.05)
+        return super().write(text)
+
+
+@pytest.fixture
+def configure():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    listeners = []
+
+    def configure(*args, **kwargs):
+        kwargs.setdefault('stream', io.StringIO())
+        listener = setup_logging(*args, **kwargs)
+        listeners.append(listener)
+        return listener
+
+    yield configure
+    for listener in listeners:
+        listener.stop()
+        atexit.unregister(listener.stop)
+    root.handlers[:], root.level = handlers, level
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as log_file:
+        return log_file.read().splitlines()
+
+
+class TestLoggingSetup:
+
+    def test_json_lines_carry_tenant_and_homework(self, tmp_path, configure):
+        path = str(tmp_path / 'program.log')
+        listener = configure(path, json_lines=True)
+        logger = logging.getLogger('homework-test')
+        token = current_tenant.set(Tenant('alice', 'token', '1', 600))
+        try:
+            logger.debug('Статус отправлен', extra={'homework': '42'})
+        finally:
+            current_tenant.reset(token)
+        logger.warning('Без тенанта')
+        listener.stop()
+        first, second = map(json.loads, read_lines(path))
+        assert first['message'] == 'Статус отправлен'
+        assert (first['tenant'], first['homework']) == ('alice', '42')
+        assert (second['level'], second['tenant']) == ('WARNING', None)
+
+    def test_noisy_debug_line_is_sampled(self, tmp_path, configure):
+        path = str(tmp_path / 'program.log')
+        listener = configure(path, sample_every=10)
+        logger = logging.getLogger('homework-test')
+        for _ in range(25):
+            logger.debug('Нет новых статусов в ответе API.')
+            logger.debug('Другое сообщение')
+        listener.stop()
+        lines = read_lines(path)
+        assert sum('Нет новых статусов' in line for line in lines) == 3
+        assert sum('Другое сообщение' in line for line in lines) == 25
+
+    def test_file_is_rotated_by_size(self, tmp_path, configure):
+        path = tmp_path / 'program.log'
+        listener = configure(str(path), max_bytes=1000, backup_count=2)
+        logger = logging.getLogger('homework-test')
+        for i in range(100):
+            logger.info(f'Запись {i}')
+        listener.stop()
+        assert (tmp_path / 'program.log.1').exists()
+        assert not (tmp_path / 'program.log.3').exists()
+
+    def test_writes_do_not_block_caller(self, configure):
+        listener = configure(stream=SlowStream())
+        logger = logging.getLogger('homework-test')
+        started = time.perf_counter()
+        for i in range(20):
+            logger.info(f'Запись {i}')
+        elapsed = time.perf_counter() - started
+        assert elapsed < 0.05, 'Запись в лог не должна ждать вывода.'
+        listener.stop()
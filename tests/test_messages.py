@@ -0,0 +1,82 @@
+import pytest
+
+from messages import VERDICTS_EN, MessageRenderer
+from tenants import Tenant, current_tenant
+
+VERDICTS_RU = {
+    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+    'reviewing': 'Работа взята на проверку ревьюером.',
+}
+
+
+def make_renderer(**kwargs):
+    return MessageRenderer({'ru': VERDICTS_RU, 'en': VERDICTS_EN}, **kwargs)
+
+
+class TestMessageRenderer:
+
+    def test_messages_match_format(self):
+        renderer = make_renderer()
+        assert renderer.render('hw', 'approved') == (
+            f'Изменился статус проверки работы "hw". {VERDICTS_RU["approved"]}'
+        )
+        assert renderer.render('hw', 'approved', 'en') == (
+            f'The review status of "hw" has changed. {VERDICTS_EN["approved"]}'
+        )
+
+    def test_unknown_locale_falls_back_to_default(self):
+        renderer = make_renderer()
+        assert renderer.render('hw', 'reviewing', 'de') == (
+            renderer.render('hw', 'reviewing')
+        )
+
+    def test_cache_is_bounded(self):
+        renderer = make_renderer(cache_size=10)
+        for i in range(100):
+            renderer.render(f'hw{i}', 'approved')
+        assert len(renderer) == 10
+        first = renderer.render('hw99', 'approved')
+        assert renderer.render('hw99', 'approved') is first
+
+    def test_cache_can_be_disabled(self):
+        renderer = make_renderer(cache_size=0)
+        assert renderer.render('hw', 'approved') == (
+            make_renderer().render('hw', 'approved')
+        )
+        assert len(renderer) == 0
+
+    def test_templates_do_not_grow_with_names(self):
+        renderer = make_renderer()
+        compiled = {
+            locale: dict(parts) for locale, parts in renderer._parts.items()
+        }
+        for i in range(100):
+            renderer.render(f'hw{i}', 'approved')
+        assert renderer._parts == compiled
+
+    def test_unknown_status_raises_by_default(self):
+        with pytest.raises(ValueError):
+            make_renderer().render('hw', 'on_hold')
+
+    def test_unknown_status_is_rendered_when_allowed(self):
+        renderer = make_renderer(allow_unknown=True)
+        assert renderer.render('hw', 'on_hold').endswith(
+            'Новый статус: on_hold.'
+        )
+        assert renderer.render('hw', 'on_hold', 'en').endswith(
+            'New status: on_hold.'
+        )
+
+
+class TestTenantLocale:
+
+    def test_parse_status_uses_tenant_locale(self, homework_module):
+        homework = {'homework_name': 'hw', 'status': 'rejected'}
+        token = current_tenant.set(Tenant('t', 'token', '1', 600, 'en'))
+        try:
+            message = homework_module.parse_status(homework)
+        finally:
+            current_tenant.reset(token)
+        assert message == (
+            f'The review status of "hw" has changed. {VERDICTS_EN["rejected"]}'
+        )
@@ -0,0 +1,123 @@
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import metrics
+import utils
+from breaker import CircuitBreaker
+from exceptions import ApiError
+from state import MemoryStateStore, PollState
+from tenants import Tenant
+
+
+@pytest.fixture
+def registry():
+    created = []
+
+    def register(metric):
+        created.append(metric.name)
+        return metric
+
+    yield register
+    for name in created:
+        metrics.metrics.pop(name, None)
+
+
+class TestMetrics:
+
+    def test_counter_and_gauge_exposition(self, registry):
+        counter = registry(metrics.Counter('test_total', 'Тест.', ('kind',)))
+        counter.inc('a')
+        counter.inc('a', amount=2)
+        counter.inc('b"c')
+        registry(metrics.Gauge('test_gauge', 'Тест.')).set(1.5)
+        text = metrics.render()
+        assert '# TYPE test_total counter' in text
+        assert 'test_total{kind="a"} 3' in text
+        assert 'test_total{kind="b\\"c"} 1' in text
+        assert 'test_gauge 1.5' in text
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry(metrics.Histogram(
+            'test_seconds', 'Тест.', buckets=(0.1, 1.0)
+        ))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+        with histogram.time():
+            pass
+        text = metrics.render()
+        assert 'test_seconds_bucket{le="0.1"} 2' in text
+        assert 'test_seconds_bucket{le="1.0"} 3' in text
+        assert 'test_seconds_bucket{le="+Inf"} 4' in text
+        assert 'test_seconds_count 4' in text
+
+    def test_endpoint_serves_metrics(self):
+        server = metrics.start_server(0)
+        host, port = server.server_address[:2]
+        try:
+            url = f'http://{host}:{port}'
+            with urllib.request.urlopen(f'{url}/metrics') as response:
+                assert response.headers['Content-Type'].startswith(
+                    'text/plain'
+                )
+                body = response.read().decode()
+            assert '# TYPE homework_polls_total counter' in body
+            assert '# TYPE homework_breakers gauge' in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'{url}/other')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestPollMetrics:
+
+    def test_poll_tenant_is_counted(self, monkeypatch, homework_module):
+        answers = [
+            {'homeworks': [{'homework_name': 'hw', 'status': 'approved'}],
+             'current_date': 1000},
+            ApiError('Неуспешный код состояния: 503'),
+        ]
+
+        def mock_get_api_answer(timestamp):
+            answer = answers.pop(0)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        tenant = Tenant('metrics-tenant', 'token', '1', 600)
+        breaker = CircuitBreaker('metrics-tenant')
+        poll_state = PollState(0)
+        for _ in range(2):
+            homework_module.poll_tenant(
+                utils.MockTelegramBot(), tenant, poll_state,
+                MemoryStateStore(), breaker,
+            )
+        text = metrics.render()
+        assert 'homework_polls_total{tenant="metrics-tenant"} 2' in text
+        assert 'homework_api_errors_total{type="ApiError"}' in text
+        assert 'homework_cursor_lag_seconds{tenant="metrics-tenant"}' in text
+
+    def test_cursor_lag_follows_current_date(self, monkeypatch,
+                                             homework_module):
+        now = int(time.time())
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer',
+            lambda timestamp: {'homeworks': [], 'current_date': now - 5},
+        )
+        tenant = Tenant('idle-tenant', 'token', '1', 600)
+        poll_state = PollState(now - 3600)
+        homework_module.poll_tenant(
+            utils.MockTelegramBot(), tenant, poll_state, MemoryStateStore(),
+            CircuitBreaker('idle-tenant'),
+        )
+        lag = metrics.CURSOR_LAG._values[('idle-tenant',)]
+        assert poll_state.timestamp == now - 3600
+        assert 5 <= lag < 10, (
+            'Отставание считается от current_date ответа, а не от курсора.'
+        )
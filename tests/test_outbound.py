@@ -0,0 +1,109 @@
+import threading
+import time
+
+import telegram
+
+from outbound import OutboundQueue, TokenBucket, merge_texts
+
+
+class SlowBot:
+    def __init__(self, latency=0.0, failures=()):
+        self.latency = latency
+        self.failures = list(failures)
+        self.sent = []
+        self.delivered = threading.Event()
+
+    def send_message(self, chat_id=None, text=None):
+        time.sleep(self.latency)
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((chat_id, text))
+        self.delivered.set()
+
+
+class BlockedBot(SlowBot):
+    """Бот, который не отправляет сообщения до release."""
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def send_message(self, chat_id=None, text=None):
+        self.released.wait()
+        super().send_message(chat_id, text)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+
+    def test_rate_is_limited_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+        for _ in range(2):
+            assert bucket.delay() == 0
+            bucket.take()
+        assert bucket.delay() == 0.5
+        clock.now += 0.5
+        assert bucket.delay() == 0
+
+
+class TestOutboundQueue:
+
+    def test_put_does_not_wait_for_slow_bot(self):
+        bot = BlockedBot()
+        queue = OutboundQueue(chat_rate=1000).start(bot)
+        started = time.perf_counter()
+        for chat_id in range(10):
+            queue.put(chat_id, 'Изменился статус')
+        elapsed = time.perf_counter() - started
+        bot.released.set()
+        queue.stop(timeout=1)
+        assert elapsed < 0.05, (
+            'Постановка в очередь не должна зависеть от задержки Telegram.'
+        )
+        assert not queue._thread.is_alive()
+        assert len(bot.sent) == 10
+
+    def test_stop_without_start_is_safe(self):
+        queue = OutboundQueue()
+        queue.put(1, 'привет')
+        queue.stop(timeout=0)
+        assert len(queue) == 1
+
+    def test_messages_for_one_chat_are_merged(self):
+        bot = SlowBot()
+        queue = OutboundQueue()
+        for i in range(3):
+            queue.put('1', f'line {i}')
+        queue.start(bot).stop(timeout=1)
+        assert bot.sent == [('1', 'line 0\n\nline 1\n\nline 2')]
+
+    def test_merge_respects_message_limit(self):
+        texts = ['a' * 3000, 'b' * 3000]
+        assert merge_texts(texts) == 'a' * 3000
+        assert texts == ['b' * 3000]
+
+    def test_retry_after_defers_instead_of_dropping(self):
+        bot = SlowBot(failures=[telegram.error.RetryAfter(0.05)])
+        queue = OutboundQueue()
+        queue.put('1', 'hello')
+        started = time.perf_counter()
+        queue.start(bot)
+        assert bot.delivered.wait(1), 'Сообщение не должно теряться.'
+        assert time.perf_counter() - started >= 0.05
+        queue.stop(timeout=1)
+        assert bot.sent == [('1', 'hello')]
+
+    def test_send_message_enqueues_when_queue_is_configured(
+            self, monkeypatch, homework_module):
+        queue = OutboundQueue()
+        monkeypatch.setattr(homework_module, 'outbound', queue)
+        assert homework_module.send_message(SlowBot(), 'hello') is True
+        assert len(queue) == 1
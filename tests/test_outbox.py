@@ -0,0 +1,69 @@
+import telegram
+
+from outbound import OutboundQueue
+from outbox import Outbox
+from state import PollState
+from test_outbound import SlowBot
+
+
+class TestOutbox:
+
+    def test_duplicate_key_is_ignored(self, tmp_path):
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite'))
+        assert outbox.add('1', 'hello', 'key') is not None
+        assert outbox.add('1', 'hello again', 'key') is None
+        assert [text for _, _, text in outbox.pending()] == ['hello']
+
+    def test_undelivered_messages_survive_restart(self, tmp_path):
+        path = str(tmp_path / 'outbox.sqlite')
+        queue = OutboundQueue(outbox=Outbox(path))
+        for i in range(3):
+            queue.put('1', f'line {i}')
+        queue.put('2', 'other chat')
+        # Процесс «упал» до запуска потока отправки.
+        bot = SlowBot()
+        OutboundQueue(outbox=Outbox(path)).start(bot).stop(timeout=1)
+        assert bot.sent == [
+            ('1', 'line 0\n\nline 1\n\nline 2'),
+            ('2', 'other chat'),
+        ]
+        assert Outbox(path).pending() == []
+
+    def test_network_error_keeps_message_pending(self, tmp_path):
+        outbox = Outbox(str(tmp_path / 'outbox.sqlite'))
+        bot = SlowBot(failures=[telegram.error.NetworkError('timeout')])
+        queue = OutboundQueue(outbox=outbox)
+        queue.put('1', 'hello')
+        queue.start(bot)
+        queue.stop(timeout=0.1)
+        assert bot.sent == []
+        assert len(outbox.pending()) == 1
+
+    def test_repeated_poll_does_not_duplicate_notification(
+            self, tmp_path, monkeypatch, homework_module):
+        queue = OutboundQueue(outbox=Outbox(str(tmp_path / 'outbox.sqlite')))
+        monkeypatch.setattr(homework_module, 'outbound', queue)
+        homeworks = [{
+            'id': 1,
+            'homework_name': 'hw',
+            'status': 'approved',
+            'date_updated': '2020-02-13T14:40:57Z',
+        }]
+        # Сбой до сохранения состояния: второй опрос начинается с нуля.
+        for _ in range(2):
+            homework_module.notify_statuses(None, PollState(0), homeworks)
+        assert len(queue) == 1
+
+    def test_undated_status_is_not_deduplicated(
+            self, tmp_path, monkeypatch, homework_module):
+        queue = OutboundQueue(outbox=Outbox(str(tmp_path / 'outbox.sqlite')))
+        monkeypatch.setattr(homework_module, 'outbound', queue)
+        poll_state = PollState(0)
+        for status in ('approved', 'rejected', 'approved'):
+            homework_module.notify_statuses(None, poll_state, [
+                {'id': 1, 'homework_name': 'hw', 'status': status}
+            ])
+        assert len(queue) == 3, (
+            'Возврат к прежнему статусу без date_updated не должен '
+            'отсеиваться как повтор.'
+        )
@@ -0,0 +1,172 @@
+import gzip
+
+import pytest
+import requests
+
+import homework
+from api_client import PracticumClient, make_session
+from exceptions import ApiError
+from recording import RecordingSession, ReplaySession, load
+from tenants import Tenant, current_tenant
+from stub_server import PracticumStub
+
+HEADERS = {'Authorization': 'OAuth sometoken'}
+HOMEWORK = {
+    'id': 1,
+    'homework_name': 'Итоговый проект',
+    'status': 'approved',
+    'date_updated': '2020-02-13T14:40:57Z',
+}
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def record(path, stub, timestamps):
+    session = RecordingSession(make_session(retries=0), path)
+    client = PracticumClient(stub.url, HEADERS, session=session)
+    answers = []
+    for timestamp in timestamps:
+        try:
+            answers.append(client.get_api_answer(timestamp))
+        except ApiError as error:
+            answers.append(type(error))
+    client.close()
+    return answers
+
+
+def replay_client(path, **kwargs):
+    return PracticumClient(
+        'http://practicum.invalid/', HEADERS,
+        session=ReplaySession(path, **kwargs),
+    )
+
+
+class TestRecordReplay:
+
+    def test_replayed_answers_match_recorded(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub(homeworks=[HOMEWORK], statuses=[200, 401]) as stub:
+            recorded = record(path, stub, [0, 100, 200])
+        client = replay_client(path, speed=0)
+        replayed = []
+        for timestamp in [0, 100, 200]:
+            try:
+                replayed.append(client.get_api_answer(timestamp))
+            except ApiError as error:
+                replayed.append(type(error))
+        assert replayed == recorded
+        assert recorded[1] is ApiError
+        checked = homework.check_response(replayed[0])
+        assert homework.parse_status(replayed[0]['homeworks'][0]) == (
+            'Изменился статус проверки работы "Итоговый проект". '
+            + homework.HOMEWORK_VERDICTS['approved']
+        )
+        assert len(checked.homeworks) == 1
+
+    def test_archive_keeps_status_headers_and_timing(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub(latency=0.05, etag='"v1"') as stub:
+            record(path, stub, [0, 0])
+        first, second = load(path)
+        assert (first.status, second.status) == (200, 304)
+        assert first.headers['ETag'] == '"v1"'
+        assert first.from_date == 0
+        assert first.elapsed >= 0.05
+        assert second.offset >= first.offset + first.elapsed
+        assert 'sometoken' not in gzip.open(path, 'rt').read()
+
+    def test_unchanged_answer_is_replayed_as_none(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub(etag='"v1"') as stub:
+            record(path, stub, [0, 0])
+        client = replay_client(path, speed=0)
+        assert client.get_api_answer(0)['homeworks'] == []
+        assert client.get_api_answer(0) is None
+
+    def test_connection_error_is_recorded(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        session = RecordingSession(make_session(retries=0), path)
+        client = PracticumClient(
+            'http://127.0.0.1:9/', HEADERS, session=session, timeout=0.5
+        )
+        with pytest.raises(ApiError):
+            client.get_api_answer(0)
+        client.close()
+        with pytest.raises(ApiError):
+            replay_client(path, speed=0).get_api_answer(0)
+
+    def test_exhausted_archive_raises_api_error(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub() as stub:
+            record(path, stub, [0])
+        client = replay_client(path, speed=0)
+        client.get_api_answer(0)
+        assert len(client.session) == 0
+        with pytest.raises(ApiError):
+            client.get_api_answer(0)
+
+    def test_unclosed_archive_is_readable(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub() as stub:
+            session = RecordingSession(make_session(retries=0), path)
+            client = PracticumClient(stub.url, HEADERS, session=session)
+            client.get_api_answer(0)
+            client.get_api_answer(1)
+        assert [exchange.from_date for exchange in load(path)] == [0, 1]
+
+
+class TestReplayPacing:
+
+    def write_archive(self, path, offsets):
+        clock = FakeClock()
+        with PracticumStub() as stub:
+            session = RecordingSession(make_session(), path, clock=clock)
+            for offset in offsets:
+                clock.now = offset
+                session.get(stub.url, params={'from_date': 0})
+            session.close()
+
+    @pytest.mark.parametrize('speed, expected', [
+        (1, [5.0, 5.0]), (10, [0.5, 0.5]), (0, []),
+    ])
+    def test_responses_follow_recorded_pace(self, tmp_path, speed, expected):
+        path = tmp_path / 'api.jsonl.gz'
+        self.write_archive(path, [0, 5, 10])
+        clock = FakeClock()
+        session = ReplaySession(path, speed, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            session.get('http://practicum.invalid/')
+        assert clock.sleeps == pytest.approx(expected)
+
+    def test_exchanges_are_replayed_per_tenant(self, tmp_path):
+        path = tmp_path / 'api.jsonl.gz'
+        with PracticumStub() as stub:
+            session = RecordingSession(make_session(), path)
+            for name in ('first', 'second', 'first'):
+                token = current_tenant.set(Tenant(name, 'token', 1, 600))
+                session.get(stub.url, params={'from_date': name})
+                current_tenant.reset(token)
+            session.close()
+        replay = ReplaySession(path, speed=0)
+        token = current_tenant.set(Tenant('second', 'token', 1, 600))
+        try:
+            assert replay.get('http://practicum.invalid/').status_code == 200
+            assert len(replay) == 2
+            with pytest.raises(requests.ConnectionError):
+                replay.get('http://practicum.invalid/')
+        finally:
+            current_tenant.reset(token)
+        merged = ReplaySession(path, speed=0, by_tenant=False)
+        assert len(merged) == 3
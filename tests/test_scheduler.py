@@ -0,0 +1,149 @@
+import itertools
+
+import pytest
+
+from scheduler import AdaptiveInterval, Scheduler
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestScheduler:
+
+    def test_new_key_is_due_immediately(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        assert scheduler.pop_due() == ['a']
+        assert scheduler.delay() == 600
+
+    def test_deadlines_do_not_drift(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        for _ in range(10):
+            assert scheduler.pop_due() == ['a']
+            clock.advance(7)  # время опроса
+            delay = scheduler.delay()
+            assert delay == 593, (
+                'Пауза должна отсчитываться до абсолютного дедлайна.'
+            )
+            clock.advance(delay)
+        assert clock.now == 1000 + 10 * 600
+
+    def test_delay_never_wakes_early(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        scheduler.pop_due()
+        clock.advance(0.25)
+        assert scheduler.delay() == 600
+        clock.advance(600)
+        assert scheduler.pop_due() == ['a']
+
+    def test_jitter_spreads_keys_across_period(self, clock):
+        offsets = itertools.cycle(i / 10 for i in range(10))
+        scheduler = Scheduler(
+            clock=clock, jitter=1.0, rng=lambda: next(offsets)
+        )
+        for key in range(10):
+            scheduler.add(key, 600)
+        polled_per_minute = []
+        for _ in range(10):
+            polled_per_minute.append(len(scheduler.pop_due()))
+            clock.advance(60)
+        assert polled_per_minute == [1] * 10, (
+            'Опросы тенантов должны равномерно распределяться по периоду.'
+        )
+
+    def test_lag_is_reported_and_missed_runs_are_skipped(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        scheduler.pop_due()
+        clock.advance(600 * 3 + 30)
+        assert scheduler.pop_due() == ['a']
+        assert scheduler.lag == 600 * 2 + 30
+        assert scheduler.max_lag == scheduler.lag
+        assert scheduler.delay() == 570, (
+            'Пропущенные дедлайны не должны выполняться пачкой.'
+        )
+
+    def test_speed_divides_periods(self, clock):
+        scheduler = Scheduler(clock=clock, speed=10)
+        scheduler.add('a', 600)
+        assert scheduler.pop_due() == ['a']
+        assert scheduler.delay() == 60
+        scheduler.set_interval('a', 1200)
+        assert scheduler.delay() == 120
+        assert scheduler.interval('a') == 1200
+
+    def test_zero_speed_polls_without_pauses(self, clock):
+        scheduler = Scheduler(clock=clock, speed=0)
+        scheduler.add('a', 600)
+        scheduler.add('b', 600)
+        for _ in range(3):
+            assert scheduler.pop_due() == ['a', 'b']
+            assert scheduler.delay() == 0
+        assert scheduler.max_lag == 0
+
+
+class TestSetInterval:
+
+    def test_new_interval_counts_from_last_deadline(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        scheduler.pop_due()
+        clock.advance(5)
+        scheduler.set_interval('a', 120)
+        assert scheduler.delay() == 115
+        clock.advance(115)
+        assert scheduler.pop_due() == ['a']
+        assert scheduler.delay() == 120
+
+    def test_replaced_deadline_does_not_fire(self, clock):
+        scheduler = Scheduler(clock=clock)
+        scheduler.add('a', 600)
+        scheduler.pop_due()
+        scheduler.set_interval('a', 1200)
+        clock.advance(600)
+        assert scheduler.pop_due() == [], (
+            'Дедлайн, заменённый через `set_interval`, не должен срабатывать.'
+        )
+        assert scheduler.delay() == 600
+
+
+class TestAdaptiveInterval:
+
+    def test_reviewing_is_polled_faster(self):
+        interval = AdaptiveInterval(600)
+        assert interval.update(1, reviewing=True) == 120
+
+    def test_empty_responses_back_off_up_to_cap(self):
+        interval = AdaptiveInterval(600)
+        periods = [interval.update(0, reviewing=False) for _ in range(7)]
+        assert periods == [600, 600, 1200, 2400, 4800, 4800, 4800], (
+            'Период должен расти экспоненциально после нескольких '
+            'пустых ответов подряд и упираться в потолок.'
+        )
+
+    def test_activity_resets_backoff(self):
+        interval = AdaptiveInterval(600)
+        for _ in range(5):
+            interval.update(0, reviewing=False)
+        assert interval.update(2, reviewing=False) == 600
+        assert interval.update(0, reviewing=False) == 600
+
+    def test_error_keeps_current_period(self):
+        interval = AdaptiveInterval(600)
+        interval.update(1, reviewing=True)
+        assert interval.update(None, reviewing=False) == 120
@@ -0,0 +1,186 @@
+import json
+import os
+
+import pytest
+import requests
+
+import utils
+from state import (
+    JsonStateStore, PollState, SqliteStateStore, StateCheckpoint
+)
+
+
+class FakePracticumApi:
+    """Эмулирует API домашки: каждый цикл появляется одно обновление."""
+
+    def __init__(self, start, period):
+        self.now = start
+        self.period = period
+        self.history = []
+        self.payload_sizes = []
+
+    def tick(self):
+        self.now += self.period
+        self.history.append({
+            'id': 1000 + len(self.history),
+            'homework_name': f'hw{len(self.history):03d}',
+            'status': 'reviewing',
+            'date_updated': self.now,
+        })
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        from_date = int(params['from_date'])
+        data = {
+            'homeworks': [
+                hw for hw in self.history if hw['date_updated'] >= from_date
+            ],
+            'current_date': self.now + 1,
+        }
+        self.payload_sizes.append(len(json.dumps(data)))
+        return utils.MockResponseGET(data=data)
+
+
+class TestPollState:
+    CYCLES = 50
+
+    def test_advance_moves_cursor_to_current_date(self):
+        poll_state = PollState(100)
+        poll_state.advance({
+            'homeworks': [{'homework_name': 'hw123', 'status': 'approved'}],
+            'current_date': 700,
+        })
+        assert poll_state.timestamp == 700, (
+            'Курсор должен сдвигаться на `current_date` из ответа API.'
+        )
+
+    def test_empty_response_keeps_cursor(self):
+        poll_state = PollState(100)
+        poll_state.advance({'homeworks': [], 'current_date': 700})
+        assert poll_state.timestamp == 100, (
+            'Пустой ответ не должен сдвигать курсор, иначе условный '
+            'запрос никогда не получит 304.'
+        )
+
+    def test_payload_size_stays_flat(self, monkeypatch, homework_module):
+        api = FakePracticumApi(start=1000198000, period=600)
+        monkeypatch.setattr(requests, 'get', api.get)
+        poll_state = PollState(api.now)
+        for _ in range(self.CYCLES):
+            api.tick()
+            response = homework_module.get_api_answer(poll_state.timestamp)
+            homework_module.check_response(response)
+            poll_state.advance(response)
+            assert len(response['homeworks']) == 1, (
+                'За цикл должны приходить только новые обновления.'
+            )
+        assert len(set(api.payload_sizes)) == 1, (
+            'Размер ответа API не должен расти со временем работы бота.'
+        )
+
+
+class TestStateStore:
+
+    @pytest.fixture(params=['poll_state.json', 'poll_state.sqlite'])
+    def store(self, request, tmp_path):
+        path = str(tmp_path / request.param)
+        if path.endswith('.json'):
+            yield JsonStateStore(path)
+        else:
+            store = SqliteStateStore(path)
+            yield store
+            store.close()
+
+    def test_empty_store_loads_none(self, store):
+        assert store.load('default') is None, (
+            'Пустое хранилище должно возвращать `None`.'
+        )
+
+    def test_roundtrip(self, store):
+        store.save('default', PollState(1000198000, {'123': 'reviewing'}))
+        store.save(
+            'default',
+            PollState(1000198600, {'123': 'approved', 'hw2': 'rejected'})
+        )
+        poll_state = store.load('default')
+        assert poll_state.timestamp == 1000198600
+        assert poll_state.statuses == {'123': 'approved', 'hw2': 'rejected'}
+
+    def test_tenants_are_stored_separately(self, store):
+        store.save('first', PollState(100, {'1': 'approved'}))
+        store.save('second', PollState(200, {'1': 'rejected'}))
+        assert store.load('first').statuses == {'1': 'approved'}
+        assert store.load('second').timestamp == 200
+
+    def test_json_store_leaves_no_temp_files(self, tmp_path):
+        store = JsonStateStore(str(tmp_path / 'poll_state.json'))
+        store.save('default', PollState(1000198000))
+        assert os.listdir(tmp_path) == ['poll_state.json'], (
+            'Временный файл должен подменять файл состояния целиком.'
+        )
+
+    def test_restored_status_is_not_sent_again(self, tmp_path,
+                                               homework_module):
+        store = JsonStateStore(str(tmp_path / 'poll_state.json'))
+        homework = {'id': 123, 'homework_name': 'hw123', 'status': 'approved'}
+        bot = utils.MockTelegramBot()
+        poll_state = PollState(1000198000)
+        homework_module.notify_statuses(bot, poll_state, [homework])
+        store.save('default', poll_state)
+
+        restarted_bot = utils.MockTelegramBot()
+        homework_module.notify_statuses(
+            restarted_bot, store.load('default'), [homework]
+        )
+        assert not hasattr(restarted_bot, 'text'), (
+            'После перезапуска уже отправленный статус не должен '
+            'отправляться повторно.'
+        )
+
+    def test_changes_are_persisted_incrementally(self, store):
+        poll_state = PollState(100, {'1': 'reviewing', '2': 'reviewing'})
+        store.save('default', poll_state)
+        poll_state.statuses.record('1', 'approved')
+        del poll_state.statuses['2']
+        poll_state.timestamp = 200
+        store.save('default', poll_state)
+        restored = store.load('default')
+        assert restored.timestamp == 200
+        assert restored.statuses == {'1': 'approved'}
+        assert not restored.dirty
+
+
+class TestStateCheckpoint:
+
+    def test_unchanged_state_is_not_written(self, tmp_path):
+        path = tmp_path / 'poll_state.json'
+        store = JsonStateStore(str(path))
+        poll_state = PollState(100, {'1': 'approved'})
+        store.save('default', poll_state)
+        path.unlink()
+        store.save('default', poll_state)
+        assert not path.exists(), (
+            'Неизменившееся состояние не должно переписывать файл.'
+        )
+
+    def test_round_is_written_once(self, tmp_path, monkeypatch):
+        store = JsonStateStore(str(tmp_path / 'poll_state.json'))
+        checkpoint = StateCheckpoint(store)
+        writes = []
+        monkeypatch.setattr(os, 'replace', lambda *args: writes.append(args))
+        for i in range(100):
+            checkpoint.save(f't{i}', PollState(i, {'1': 'approved'}))
+        assert not writes
+        checkpoint.flush()
+        assert len(writes) == 1
+        assert not checkpoint.pending
+
+    def test_sqlite_rewrites_only_changed_rows(self, tmp_path):
+        store = SqliteStateStore(str(tmp_path / 'poll_state.sqlite'))
+        statuses = {str(i): 'approved' for i in range(1000)}
+        poll_state = PollState(100, statuses)
+        store.save('default', poll_state)
+        poll_state.statuses.record('5', 'rejected')
+        before = store._connection.total_changes
+        store.save('default', poll_state)
+        assert store._connection.total_changes - before == 1
+        store.close()
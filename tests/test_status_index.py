@@ -0,0 +1,114 @@
+import sqlite3
+
+import status_index
+
+from state import JsonStateStore, PollState, SqliteStateStore
+from status_index import StatusIndex, epoch
+from validation import Homework
+
+
+def record(key, status, updated=None):
+    return Homework(key, f'hw{key}', status, updated)
+
+
+class TestStatusIndex:
+
+    def test_only_transitions_are_emitted(self):
+        index = StatusIndex({'1': 'reviewing', '2': 'approved'})
+        changes = list(index.diff([
+            record('1', 'approved'),
+            record('2', 'approved'),
+            record('3', 'reviewing'),
+            record('3', 'reviewing'),
+        ]))
+        assert [(c.key, c.status) for c in changes] == [
+            ('1', 'approved'), ('3', 'reviewing'),
+        ]
+        assert index['1'] == 'reviewing', 'diff не должен менять индекс.'
+
+    def test_older_record_is_not_a_transition(self):
+        index = StatusIndex()
+        index.record('1', 'approved', '2023-01-05T00:00:00Z')
+        assert not list(index.diff([
+            record('1', 'reviewing', '2023-01-01T00:00:00Z'),
+        ]))
+        assert list(index.diff([record('1', 'rejected')]))
+
+    def test_changed_flags_compare_columns(self):
+        index = StatusIndex({'1': 'approved', '2': 'reviewing'})
+        assert index.changed(
+            ['1', '2', '3', '4'], ['approved', 'approved', 'approved', 'new']
+        ) == [False, True, True, True]
+
+    def test_unrecorded_changes_survive_pruning(self, monkeypatch):
+        monkeypatch.setattr(status_index, 'PENDING_LIMIT', 2)
+        index = StatusIndex()
+        homeworks = [record(str(i), 'reviewing') for i in range(6)]
+        emitted = []
+        for change in index.diff(homeworks + [record('1', 'reviewing')]):
+            emitted.append(change.key)
+            if change.key != '1':
+                index.record(change.key, change.status)
+        assert emitted == ['0', '1', '2', '3', '4', '5'], (
+            'Незаписанное изменение не должно повторяться в том же ответе.'
+        )
+
+    def test_eviction_tracking_is_bounded(self):
+        index = StatusIndex(max_size=100)
+        index.mark_saved()
+        for i in range(1000):
+            index.record(str(i), 'reviewing')
+        assert index.dirty
+        assert index.changes() is None, (
+            'После массового вытеснения индекс сохраняется целиком.'
+        )
+        index.mark_saved()
+        assert index.changes() == (set(), set())
+
+    def test_size_is_bounded(self):
+        index = StatusIndex(max_size=100)
+        for i in range(1000):
+            index.record(str(i), 'reviewing')
+        assert len(index) <= 100
+        assert '999' in index and '0' not in index
+        assert index.count('reviewing') == len(index)
+
+    def test_counts_follow_transitions(self):
+        index = StatusIndex({'1': 'reviewing', '2': 'reviewing'})
+        index.record('1', 'approved')
+        del index['2']
+        assert index.count('reviewing') == 0
+        assert index.count('approved') == 1
+        assert not PollState(0, index).reviewing
+
+    def test_snapshot_round_trip(self, tmp_path):
+        poll_state = PollState(10)
+        poll_state.statuses.record('1', 'approved', '2020-02-13T14:40:57Z')
+        poll_state.statuses.record('2', 'reviewing')
+        sqlite_store = SqliteStateStore(str(tmp_path / 'state.sqlite'))
+        for store in (JsonStateStore(str(tmp_path / 'state.json')),
+                      sqlite_store):
+            store.save('t', poll_state)
+            loaded = store.load('t').statuses
+            assert loaded == {'1': 'approved', '2': 'reviewing'}
+            assert loaded.updated('1') == epoch('2020-02-13T14:40:57Z')
+            assert loaded.updated('2') == 0
+        sqlite_store.close()
+
+    def test_old_sqlite_schema_is_migrated(self, tmp_path):
+        path = str(tmp_path / 'state.sqlite')
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(
+                'CREATE TABLE statuses (tenant TEXT NOT NULL, '
+                'homework TEXT NOT NULL, status TEXT NOT NULL, '
+                'PRIMARY KEY (tenant, homework))'
+            )
+            connection.execute(
+                "INSERT INTO statuses VALUES ('t', '1', 'approved')"
+            )
+        connection.close()
+        store = SqliteStateStore(path)
+        store.save('t', PollState(5, {'1': 'approved'}))
+        assert store.load('t').statuses == {'1': 'approved'}
+        store.close()
@@ -0,0 +1,126 @@
+import json
+import tracemalloc
+
+import pytest
+
+import utils
+from api_client import PracticumClient
+from exceptions import VarTypeError
+from messages import MessageRenderer
+from state import PollState
+from status_index import StatusIndex
+from streaming import HomeworkStream
+from stub_server import PracticumStub
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def synthetic_chunks(total_size, chunk_size=64 * 1024):
+    """Ответ API размером total_size байт, сгенерированный по частям."""
+    comment = 'ревью ' * 150
+    yield b'{"homeworks": ['
+    written, i = 0, 0
+    while written < total_size:
+        item = json.dumps({
+            'id': i,
+            'homework_name': f'hw{i}',
+            'status': 'approved',
+            'reviewer_comment': comment,
+        }, ensure_ascii=False).encode()
+        chunk = item if i == 0 else b',' + item
+        written += len(chunk)
+        i += 1
+        yield chunk
+    yield b'], "current_date": 1581604970}'
+
+
+class TestHomeworkStream:
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+    def test_stream_matches_json_loads(self, chunk_size):
+        payload = {
+            'homeworks': [
+                {'id': i, 'homework_name': f'ДЗ №{i}', 'status': 'approved'}
+                for i in range(20)
+            ],
+            'current_date': 1234567,
+        }
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        stream = HomeworkStream(split(data, chunk_size))
+        assert list(stream) == payload['homeworks']
+        assert stream.current_date == 1234567
+
+    @pytest.mark.parametrize('data, error', [
+        (b'[]', TypeError),
+        (b'{"current_date": 1}', KeyError),
+        (b'{"homeworks": {}, "current_date": 1}', TypeError),
+        (b'{"homeworks": []}', VarTypeError),
+        (b'{"homeworks": [], "current_date": "1"}', VarTypeError),
+        (b'{"homeworks": [{"id": 1},', ValueError),
+    ])
+    def test_errors_match_check_response(self, data, error):
+        with pytest.raises(error):
+            list(HomeworkStream([data]))
+
+    @pytest.mark.timeout(120)
+    def test_memory_is_bounded_on_100_mb_response(
+            self, monkeypatch, homework_module):
+        class StreamingClient:
+            def stream_api_answer(self, timestamp, headers=None):
+                return HomeworkStream(synthetic_chunks(size))
+
+        size = 100 * 1024 * 1024
+        # Кэш сообщений и индекс статусов ограничены своими размерами,
+        # которые к разбору ответа не относятся.
+        monkeypatch.setattr(homework_module, 'renderer', MessageRenderer(
+            {'ru': homework_module.HOMEWORK_VERDICTS}, cache_size=16
+        ))
+        monkeypatch.setattr(homework_module, 'api_client', StreamingClient())
+        bot = utils.MockTelegramBot()
+        poll_state = PollState(0, StatusIndex(max_size=1000))
+        tracemalloc.start()
+        try:
+            parsed = homework_module.poll_stream(bot, poll_state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert parsed > 50000
+        assert poll_state.timestamp == 1581604970
+        assert 'Изменился статус' in bot.text
+        assert peak < 2 * 1024 * 1024, (
+            f'Пик памяти {peak} байт растёт вместе с ответом.'
+        )
+
+
+class TestStreamingPoll:
+
+    def test_validators_are_kept_only_after_full_read(self):
+        homeworks = [{'id': 1, 'homework_name': 'hw', 'status': 'approved'}]
+        with PracticumStub(homeworks=homeworks, etag='"v1"') as stub:
+            client = PracticumClient(stub.url, {'Authorization': 'OAuth x'})
+            stream = client.stream_api_answer(0)
+            next(iter(stream))
+            assert client._validators == {}
+            stream = client.stream_api_answer(0)
+            assert list(stream) == homeworks
+            assert client.stream_api_answer(0) is None
+            client.close()
+
+    def test_poll_updates_streams_into_notifications(
+            self, monkeypatch, homework_module):
+        homeworks = [
+            {'id': i, 'homework_name': f'hw{i}', 'status': 'approved'}
+            for i in range(3)
+        ]
+        with PracticumStub(homeworks=homeworks) as stub:
+            client = PracticumClient(stub.url, {})
+            monkeypatch.setattr(homework_module, 'api_client', client)
+            monkeypatch.setattr(homework_module, 'STREAM_RESPONSES', True)
+            bot = utils.MockTelegramBot()
+            poll_state = PollState(0)
+            assert homework_module.poll_updates(bot, poll_state) == 3
+            client.close()
+        assert bot.text.count('Изменился статус') == 3
+        assert poll_state.timestamp > 0
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+import telegram
+
+from stub_server import BotApiStub, PracticumStub
+from telegram_client import AsyncBot
+from test_async_runner import make_runner, make_tenants, poll_once
+
+TOKEN = '123:abc'
+
+
+async def send_all(bot, messages):
+    try:
+        for chat_id, text in messages:
+            await bot.send(chat_id, text)
+    finally:
+        await bot.close()
+
+
+class TestAsyncBot:
+
+    def test_messages_reuse_one_connection(self):
+        with BotApiStub() as stub:
+            bot = AsyncBot(TOKEN, api_url=stub.url)
+            asyncio.run(send_all(bot, [('1', 'first'), ('2', 'second')]))
+        assert stub.messages == [('1', 'first'), ('2', 'second')]
+        assert {r['path'] for r in stub.requests} == {
+            f'/bot{TOKEN}/sendMessage'
+        }
+        assert len({r['connection'] for r in stub.requests}) == 1
+
+    def test_retry_after_is_raised_as_telegram_error(self):
+        errors = [(429, {
+            'ok': False,
+            'error_code': 429,
+            'description': 'Too Many Requests: retry after 5',
+            'parameters': {'retry_after': 5},
+        })]
+        with BotApiStub(errors=errors) as stub:
+            bot = AsyncBot(TOKEN, api_url=stub.url)
+            with pytest.raises(telegram.error.RetryAfter):
+                asyncio.run(send_all(bot, [('1', 'hello')]))
+
+    def test_sync_send_message_is_drop_in_for_homework(
+            self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '42')
+        with BotApiStub() as stub:
+            bot = AsyncBot(TOKEN, api_url=stub.url)
+            try:
+                assert homework_module.send_message(bot, 'hello') is True
+            finally:
+                bot.stop()
+        assert stub.messages == [('42', 'hello')]
+
+    def test_runner_shares_session_with_bot(self):
+        homeworks = [{'homework_name': 'hw123', 'status': 'approved'}]
+        with PracticumStub(homeworks=homeworks) as practicum, \
+                BotApiStub() as bot_api:
+            bot = AsyncBot(TOKEN, api_url=bot_api.url)
+            runner = make_runner(practicum, make_tenants(2), bot=bot)
+            asyncio.run(poll_once(runner))
+        assert bot.session is runner.session
+        assert sorted(chat for chat, _ in bot_api.messages) == ['0', '1']
+
@@ -0,0 +1,112 @@
+import json
+import sqlite3
+
+import pytest
+import requests
+
+import utils
+from breaker import CircuitBreaker
+from state import JsonStateStore, MemoryStateStore, PollState
+from tenants import Tenant, load_tenants
+
+REGISTRY = [
+    {'name': 'alice', 'practicum_token': 'token-a', 'chat_id': '1'},
+    {'practicum_token': 'token-b', 'chat_id': '2', 'poll_interval': 1200},
+]
+
+
+@pytest.fixture
+def json_registry(tmp_path):
+    path = tmp_path / 'tenants.json'
+    path.write_text(json.dumps(REGISTRY))
+    return str(path)
+
+
+class TestTenantRegistry:
+
+    def test_load_json_registry(self, json_registry):
+        tenants = load_tenants(json_registry, 600)
+        assert tenants == [
+            Tenant('alice', 'token-a', '1', 600),
+            Tenant('2', 'token-b', '2', 1200),
+        ]
+
+    def test_load_sqlite_registry(self, tmp_path):
+        path = str(tmp_path / 'tenants.sqlite')
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(
+                'CREATE TABLE tenants (name TEXT, practicum_token TEXT, '
+                'chat_id TEXT, poll_interval INTEGER)'
+            )
+            connection.execute(
+                "INSERT INTO tenants VALUES ('alice', 'token-a', '1', NULL)"
+            )
+        connection.close()
+        assert load_tenants(path, 600) == [
+            Tenant('alice', 'token-a', '1', 600)
+        ]
+
+    def test_check_tokens_validates_every_tenant(self, tmp_path, monkeypatch,
+                                                 homework_module):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps(REGISTRY + [{'name': 'broken'}]))
+        monkeypatch.setattr(homework_module, 'TENANTS_FILE', str(path))
+        missing = homework_module.check_tokens()
+        assert missing == ['broken.practicum_token', 'broken.chat_id'], (
+            'Убедитесь, что `check_tokens` проверяет каждого тенанта.'
+        )
+
+    def test_duplicate_names_are_rejected(self, tmp_path, monkeypatch,
+                                          homework_module):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'chat_id': '-100'},
+            {'practicum_token': 'b', 'chat_id': '-100'},
+        ]))
+        with pytest.raises(ValueError, match='-100'):
+            load_tenants(str(path), 600)
+        monkeypatch.setattr(homework_module, 'TENANTS_FILE', str(path))
+        assert homework_module.check_tokens() == ['TENANTS_FILE'], (
+            'Тенанты с одинаковыми именами не должны проходить проверку.'
+        )
+
+    def test_json_state_is_reloaded_per_tenant(self, tmp_path):
+        path = str(tmp_path / 'poll_state.json')
+        JsonStateStore(path).save('alice', PollState(100, {'1': 'approved'}))
+        assert JsonStateStore(path).load('alice').timestamp == 100
+
+
+class TestTenantPolling:
+
+    def test_each_tenant_uses_own_token_and_chat(self, monkeypatch,
+                                                 homework_module):
+        answers = {
+            'OAuth token-a': {'homework_name': 'hw-a', 'status': 'approved'},
+            'OAuth token-b': {'homework_name': 'hw-b', 'status': 'rejected'},
+        }
+
+        def mock_get(url, headers=None, **kwargs):
+            homework = answers[headers['Authorization']]
+            return utils.MockResponseGET(
+                data={'homeworks': [homework], 'current_date': 1000198600}
+            )
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        sent = []
+
+        class RecordingBot:
+            def send_message(self, chat_id=None, text=None):
+                sent.append((chat_id, text))
+
+        store = MemoryStateStore()
+        for tenant in (Tenant('a', 'token-a', '1', 600),
+                       Tenant('b', 'token-b', '2', 600)):
+            homework_module.poll_tenant(
+                RecordingBot(), tenant, PollState(0), store,
+                CircuitBreaker(tenant.name),
+            )
+        assert [chat_id for chat_id, _ in sent] == ['1', '2']
+        assert 'hw-a' in sent[0][1] and 'hw-b' in sent[1][1]
+        assert store.load('a').statuses == {'hw-a': 'approved'}
+        assert store.load('b').timestamp == 1000198600
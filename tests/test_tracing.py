@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import signal
+import time
+
+import pytest
+
+import utils
+from state import PollState
+from tenants import Tenant, current_tenant
+from tracing import Tracer
+
+RESPONSE = {
+    'homeworks': [{'id': 1, 'homework_name': 'hw', 'status': 'approved'}],
+    'current_date': 1000,
+}
+
+
+@pytest.fixture
+def tracer(monkeypatch, homework_module):
+    monkeypatch.setattr(
+        homework_module, 'get_api_answer', lambda timestamp: RESPONSE
+    )
+    tracer = Tracer()
+    tracer.install(homework_module)
+    yield tracer
+    tracer.uninstall()
+
+
+class TestTracer:
+
+    def test_pipeline_stages_are_recorded(self, tracer, homework_module):
+        token = current_tenant.set(Tenant('t', 'token', '1', 600))
+        try:
+            homework_module.poll_updates(
+                utils.MockTelegramBot(), PollState(0)
+            )
+        finally:
+            current_tenant.reset(token)
+        stages = [span[0] for span in tracer.spans]
+        assert stages == [
+            'get_api_answer', 'check_response', 'send_message',
+            'notify_statuses',
+        ]
+        assert {span[3] for span in tracer.spans} == {'ok'}
+        assert {span[4] for span in tracer.spans} == {'t'}
+
+    def test_uninstall_restores_functions(self, homework_module):
+        original = homework_module.check_response
+        tracer = Tracer()
+        tracer.install(homework_module)
+        assert homework_module.check_response is not original
+        tracer.uninstall()
+        assert homework_module.check_response is original
+
+    def test_failed_stage_keeps_exception(self, tracer, homework_module):
+        with pytest.raises(TypeError):
+            homework_module.check_response([])
+        stage, _, _, outcome, _, _ = tracer.spans[-1]
+        assert (stage, outcome) == ('check_response', 'TypeError')
+
+    def test_buffer_is_bounded(self):
+        tracer = Tracer(size=10)
+        for _ in range(100):
+            with tracer.span('stage'):
+                pass
+        assert len(tracer.spans) == 10
+
+    def test_coroutines_are_traced(self):
+        tracer = Tracer()
+
+        @tracer.traced('sleep')
+        async def sleep():
+            await asyncio.sleep(0)
+
+        async def run():
+            await asyncio.gather(sleep(), sleep())
+
+        asyncio.run(run())
+        assert len({span[5] for span in tracer.spans}) == 2, (
+            'Пересекающиеся задачи должны попадать на разные дорожки.'
+        )
+
+    def test_dump_on_signal_writes_chrome_trace(self, tmp_path):
+        path = str(tmp_path / 'trace.json')
+        tracer = Tracer()
+        with tracer.span('stage'):
+            pass
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            tracer.dump_on_signal(path)
+            signal.raise_signal(signal.SIGUSR1)
+            deadline = time.monotonic() + 1
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        with open(path, encoding='utf-8') as trace_file:
+            [event] = json.load(trace_file)['traceEvents']
+        assert event['name'] == 'stage' and event['ph'] == 'X'
+        assert event['args'] == {'tenant': None, 'outcome': 'ok'}
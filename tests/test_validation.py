@@ -0,0 +1,90 @@
+import pytest
+
+from exceptions import VarTypeError
+from status_index import StatusIndex
+from validation import Homework
+
+
+def make_response(homeworks):
+    return {'homeworks': homeworks, 'current_date': 1000}
+
+
+class TestCheckResponse:
+
+    def test_homeworks_are_returned_as_records(self, homework_module):
+        checked = homework_module.check_response(make_response([
+            {'id': 7, 'homework_name': 'hw', 'status': 'approved',
+             'date_updated': '2020-02-13T14:40:57Z'},
+        ]))
+        assert checked.current_date == 1000
+        [record] = checked.homeworks
+        assert isinstance(record, Homework)
+        assert (record.key, record.status, record.updated) == (
+            '7', 'approved', '2020-02-13T14:40:57Z'
+        )
+        assert homework_module.render_message(
+            record
+        ) == homework_module.parse_status(
+            {'homework_name': 'hw', 'status': 'approved'}
+        )
+
+    def test_invalid_homeworks_are_rejected_not_raised(self, homework_module):
+        checked = homework_module.check_response(make_response([
+            {'homework_name': 'hw', 'status': 'unknown'},
+            'not a homework',
+            {'homework_name': 'ok', 'status': 'reviewing'},
+        ]))
+        assert [record.key for record in checked.homeworks] == ['ok']
+        assert len(checked.rejected) == 2
+
+    def test_non_string_name_is_rendered(self, homework_module):
+        assert 'работы "42"' in homework_module.parse_status(
+            {'homework_name': 42, 'status': 'approved'}
+        )
+        checked = homework_module.check_response(make_response([
+            {'id': 1, 'homework_name': 42, 'status': 'approved'},
+        ]))
+        [record] = checked.homeworks
+        assert 'работы "42"' in homework_module.render_message(record)
+
+    @pytest.mark.parametrize('response, error', [
+        ([], TypeError),
+        ({'current_date': 1}, KeyError),
+        ({'homeworks': {}, 'current_date': 1}, TypeError),
+        ({'homeworks': []}, VarTypeError),
+        ({'homeworks': [], 'current_date': '1'}, VarTypeError),
+    ])
+    def test_error_contract_is_kept(self, homework_module, response, error):
+        with pytest.raises(error):
+            homework_module.check_response(response)
+
+    def test_records_are_accepted_by_parse_statuses(self, homework_module):
+        checked = homework_module.check_response(make_response([
+            {'id': 1, 'homework_name': 'hw', 'status': 'approved'},
+        ]))
+        changes = list(homework_module.parse_statuses(checked.homeworks))
+        assert [(change.key, change.status) for change in changes] == [
+            ('1', 'approved')
+        ]
+
+    def test_known_statuses_are_skipped_before_records(self, homework_module):
+        checked = homework_module.check_response(make_response([
+            {'id': 1, 'homework_name': 'hw1', 'status': 'approved'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'approved'},
+        ]))
+        index = StatusIndex({'1': 'approved', '2': 'reviewing'})
+        changes = homework_module.parse_statuses(checked.homeworks, index)
+        assert [(change.key, change.status) for change in changes] == [
+            ('2', 'approved')
+        ]
+
+    def test_repeated_homework_is_compared_in_order(self, homework_module):
+        checked = homework_module.check_response(make_response([
+            {'id': 1, 'homework_name': 'hw', 'status': 'reviewing'},
+            {'id': 1, 'homework_name': 'hw', 'status': 'approved'},
+        ]))
+        index = StatusIndex({'1': 'approved'})
+        changes = homework_module.parse_statuses(checked.homeworks, index)
+        assert [change.status for change in changes] == [
+            'reviewing', 'approved'
+        ]
@@ -0,0 +1,169 @@
+# Импорты из стандартных библиотек
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+
+# Импорты модулей этого проекта
+from tenants import current_tenant
+
+BUFFER_SIZE = 65536
+# Стадии цикла опроса, которые оборачиваются при включённой трассировке.
+STAGES = (
+    "get_api_answer", "check_response", "parse_status", "notify_statuses",
+    "send_message",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def outcome_of(error):
+    """Исход стадии: ok или имя класса исключения."""
+    return "ok" if error is None else type(error).__name__
+
+
+class Span:
+    """Контекстный менеджер, записывающий одну стадию в трассировщик."""
+
+    __slots__ = ("tracer", "stage", "lane", "started")
+
+    def __init__(self, tracer, stage, lane=None):
+        """Трассировщик, имя стадии и дорожка; по умолчанию — поток."""
+        self.tracer = tracer
+        self.stage = stage
+        self.lane = lane
+
+    def __enter__(self):
+        """Засекает начало стадии."""
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, error, traceback):
+        """Записывает стадию с исходом, исключение не подавляется."""
+        self.tracer.record(
+            self.stage, self.started, outcome_of(error), self.lane
+        )
+
+
+class Tracer:
+    """Кольцевой буфер стадий цикла опроса.
+
+    Стадия — (имя, начало и длительность в нс, исход, тенант, дорожка:
+    поток или задача asyncio). Старые стадии вытесняются новыми,
+    поэтому память ограничена размером буфера. Дамп — JSON в формате
+    Chrome trace events, который открывается в chrome://tracing и Perfetto.
+    """
+
+    def __init__(self, size=BUFFER_SIZE):
+        """Размер буфера в стадиях."""
+        self.spans = deque(maxlen=size)
+        self.installed = []
+
+    def record(self, stage, started, outcome, lane=None):
+        """Добавляет завершившуюся стадию в буфер."""
+        tenant = current_tenant.get()
+        self.spans.append((
+            stage, started, time.perf_counter_ns() - started, outcome,
+            None if tenant is None else tenant.name,
+            lane or threading.get_ident(),
+        ))
+
+    def span(self, stage):
+        """Контекстный менеджер для произвольного блока кода."""
+        return Span(self, stage)
+
+    def traced(self, stage):
+        """Декоратор, записывающий каждый вызов функции как стадию."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    # Задачи одного цикла событий пересекаются во времени,
+                    # поэтому каждая получает свою дорожку.
+                    lane = id(asyncio.current_task())
+                    with Span(self, stage, lane):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with Span(self, stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def install(self, target, names=STAGES):
+        """Оборачивает функции модуля или методы класса.
+
+        Без вызова install функции остаются исходными, и выключенная
+        трассировка ничего не стоит.
+        """
+        for name in names:
+            func = getattr(target, name, None)
+            if func is None or hasattr(func, "__wrapped__"):
+                continue
+            stage = name
+            if inspect.isclass(target):
+                stage = f"{target.__name__}.{name}"
+            setattr(target, name, self.traced(stage)(func))
+            self.installed.append((target, name, func))
+
+    def uninstall(self):
+        """Возвращает исходные функции."""
+        while self.installed:
+            target, name, func = self.installed.pop()
+            setattr(target, name, func)
+
+    def events(self):
+        """Стадии буфера в формате Chrome trace events."""
+        pid = os.getpid()
+        return [
+            {
+                "name": stage,
+                "cat": "homework",
+                "ph": "X",
+                "ts": started / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": lane,
+                "args": {"tenant": tenant, "outcome": outcome},
+            }
+            for stage, started, duration, outcome, tenant, lane
+            in list(self.spans)
+        ]
+
+    def dump(self, path):
+        """Атомарно записывает трассировку в JSON-файл."""
+        trace = {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".trace-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(trace, tmp_file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(
+            f"Трассировка записана в {path}: {len(self.spans)} стадий"
+        )
+
+    def dump_on_signal(self, path, signum=signal.SIGUSR1):
+        """Записывает трассировку в path по сигналу, по умолчанию SIGUSR1."""
+        def handler(signum, frame):
+            # Запись идёт в отдельном потоке: обработчик сигнала
+            # прерывает цикл опроса в произвольном месте.
+            threading.Thread(
+                target=self.dump, args=(path,), name="trace-dump"
+            ).start()
+
+        signal.signal(signum, handler)
@@ -0,0 +1,193 @@
+# Импорты из стандартных библиотек
+from collections import namedtuple
+from itertools import compress, repeat
+from operator import itemgetter
+
+# Импорты модулей этого проекта
+from exceptions import VarTypeError
+
+CheckedResponse = namedtuple(
+    "CheckedResponse", ("current_date", "homeworks", "rejected")
+)
+
+
+class Homework(tuple):
+    """Проверенная работа из ответа API домашки.
+
+    Запись — кортеж без __dict__: создаётся одним вызовом tuple.__new__,
+    без Python-конструктора, что заметно на ответах в тысячи работ.
+    """
+
+    __slots__ = ()
+
+    key = property(itemgetter(0), doc="Ключ работы для состояния.")
+    name = property(itemgetter(1), doc="Название работы.")
+    status = property(itemgetter(2), doc="Статус проверки.")
+    updated = property(itemgetter(3), doc="Дата изменения статуса.")
+
+    def __new__(cls, key, name, status, updated):
+        """Ключ для состояния, название, статус и дата изменения."""
+        return tuple.__new__(cls, (key, name, status, updated))
+
+    def __repr__(self):
+        """Представление для логов."""
+        return f"Homework({self[0]!r}, {self[1]!r}, {self[2]!r})"
+
+
+class HomeworkColumns:
+    """Проверенные работы ответа API, разобранные по столбцам.
+
+    Записи Homework создаются при обходе. Поэтому работы с прежним
+    статусом можно отсеять по столбцам ключей и статусов, не создавая
+    для них записей.
+    """
+
+    __slots__ = ("keys", "names", "statuses", "updated")
+
+    def __init__(self, keys, names, statuses, updated):
+        """Столбцы ключей, названий, статусов и дат изменения."""
+        self.keys = keys
+        self.names = names
+        self.statuses = statuses
+        self.updated = updated
+
+    def __len__(self):
+        """Количество работ."""
+        return len(self.keys)
+
+    def __iter__(self):
+        """Записи Homework в порядке ответа."""
+        return map(tuple.__new__, repeat(Homework), self._rows())
+
+    def __getitem__(self, index):
+        """Запись Homework по номеру."""
+        return tuple.__new__(Homework, (
+            self.keys[index], self.names[index],
+            self.statuses[index], self.updated[index],
+        ))
+
+    def __repr__(self):
+        """Представление для логов."""
+        return f"HomeworkColumns({len(self)} работ)"
+
+    def distinct(self):
+        """Каждая ли работа встречается в ответе один раз."""
+        return len(set(self.keys)) == len(self.keys)
+
+    def select(self, flags):
+        """Записи Homework работ с истинным флагом."""
+        return map(
+            tuple.__new__, repeat(Homework), compress(self._rows(), flags)
+        )
+
+    def _rows(self):
+        return zip(self.keys, self.names, self.statuses, self.updated)
+
+
+def check_structure(response):
+    """Проверяет верхний уровень ответа API; возвращает работы и дату."""
+    if not isinstance(response, dict):
+        raise TypeError("response должен быть типа dict")
+    if "homeworks" not in response:
+        raise KeyError("Нет такого ключа как homeworks")
+    homeworks = response["homeworks"]
+    if not isinstance(homeworks, list):
+        raise TypeError("Данные homeworks должны быть типа list")
+    if "current_date" not in response:
+        raise VarTypeError("Отсутствует ключ 'current_date'")
+    current_date = response["current_date"]
+    if not isinstance(current_date, int):
+        raise VarTypeError("Данные current_date должны быть типа int")
+    return homeworks, current_date
+
+
+def compile_homework_parser(statuses=None):
+    """Функция, превращающая словарь работы в Homework.
+
+    statuses — допустимые статусы, None — любой строковый статус.
+    Набор статусов связывается один раз, при компиляции. Работа
+    с недопустимым статусом или без названия вызывает ValueError,
+    как parse_status. Название приводится к строке, как в f-строке.
+    """
+    known = None if statuses is None else frozenset(statuses)
+    new_record = tuple.__new__
+
+    def parse_homework(homework):
+        if not isinstance(homework, dict):
+            raise ValueError("Работа должна быть типа dict")
+        name = homework.get("homework_name")
+        status = homework.get("status")
+        valid = isinstance(status, str) and (known is None or status in known)
+        if not valid or not name:
+            raise ValueError("Проблема со значением переменной 'status'")
+        return new_record(Homework, (
+            str(homework.get("id", name)), str(name), status,
+            homework.get("date_updated"),
+        ))
+
+    return parse_homework
+
+
+def compile_column_parser(statuses=None):
+    """Функция, разбирающая список корректных работ по столбцам.
+
+    map и set обходят список на уровне C, без байткода на каждую
+    работу, и возвращают HomeworkColumns. Если хоть одна работа
+    некорректна, функция возвращает None.
+    """
+    known = None if statuses is None else frozenset(statuses)
+    get = dict.get
+
+    def parse_columns(homeworks):
+        if not all(map(isinstance, homeworks, repeat(dict))):
+            return None
+        names = list(map(get, homeworks, repeat("homework_name")))
+        statuses = list(map(get, homeworks, repeat("status")))
+        if not all(names) or not all(map(isinstance, statuses, repeat(str))):
+            return None
+        if known is not None and not known.issuperset(statuses):
+            return None
+        if not all(map(isinstance, names, repeat(str))):
+            names = list(map(str, names))
+        return HomeworkColumns(
+            list(map(str, map(get, homeworks, repeat("id"), names))),
+            names,
+            statuses,
+            list(map(get, homeworks, repeat("date_updated"))),
+        )
+
+    return parse_columns
+
+
+def parse_items(homeworks, parse_homework):
+    """Поштучный разбор: корректные работы и отвергнутые с ошибками."""
+    records, rejected = [], []
+    for homework in homeworks:
+        try:
+            records.append(parse_homework(homework))
+        except ValueError as error:
+            rejected.append((homework, error))
+    return records, rejected
+
+
+def compile_response_validator(statuses=None):
+    """Функция, проверяющая ответ API и все его работы за один проход.
+
+    Ошибки структуры ответа — TypeError, KeyError и VarTypeError, как
+    у check_response. Некорректные работы не прерывают проверку, а
+    попадают в rejected вместе с ошибкой. Обычный ответ, где все работы
+    корректны, разбирается по столбцам, остальные — поштучно.
+    """
+    parse_homework = compile_homework_parser(statuses)
+    parse_columns = compile_column_parser(statuses)
+
+    def validate(response):
+        homeworks, current_date = check_structure(response)
+        records = parse_columns(homeworks)
+        if records is not None:
+            return CheckedResponse(current_date, records, [])
+        return CheckedResponse(
+            current_date, *parse_items(homeworks, parse_homework)
+        )
+
+    return validate